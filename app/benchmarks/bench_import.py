@@ -0,0 +1,87 @@
+"""
+Energy Consumption Monitor - Import Time Benchmark
+--------------------------------------------------
+Measures cold import time of the entry points in fresh interpreters and
+lists which heavy GUI/IO packages each one pulls in. The headless path must
+not load Qt, Matplotlib or pyserial.
+
+    python -m benchmarks.bench_import -o imports.json
+    python -m benchmarks.bench_import --compare imports.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+MODULES = ["src.core.app_controller", "src.headless", "src.main", "src.ui.main_window"]
+HEAVY = ("PyQt5", "matplotlib", "serial", "pandas")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{m.split('.')[0] for m in sys.modules}} & set({heavy!r}))
+print(elapsed * 1000, ','.join(heavy))
+"""
+
+
+def measure(module, repeat=5):
+    """Menor tempo de import (ms) em `repeat` interpretadores novos e os pacotes pesados carregados."""
+    best, heavy = float("inf"), []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+                             capture_output=True, text=True, check=True,
+                             env={**os.environ, "QT_QPA_PLATFORM": "offscreen"})
+        elapsed, _, loaded = out.stdout.strip().rpartition("\n")[2].partition(" ")
+        best = min(best, float(elapsed))
+        heavy = loaded.split(",") if loaded else []
+    return {"import_ms": best, "heavy": heavy}
+
+
+def run_all(repeat=5):
+    return {
+        "python": platform.python_version(),
+        "modules": {module: measure(module, repeat) for module in MODULES},
+    }
+
+
+def compare(current, baseline, tolerance=0.25):
+    """Retorna as regressões de tempo de import além da tolerância."""
+    regressions = []
+    for module, result in current["modules"].items():
+        ref = baseline.get("modules", {}).get(module, {}).get("import_ms")
+        if ref and (result["import_ms"] - ref) / ref > tolerance:
+            regressions.append((module, ref, result["import_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold import time.")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--repeat", type=int, default=5, help="interpreters per module")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.repeat)
+    for module, result in results["modules"].items():
+        heavy = ", ".join(result["heavy"]) or "-"
+        print(f"[BENCH] {module:<26} {result['import_ms']:8.1f} ms  heavy: {heavy}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for module, ref, value in regressions:
+            print(f"[BENCH] REGRESSION {module}: {ref:.1f} -> {value:.1f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
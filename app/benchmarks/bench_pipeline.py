@@ -0,0 +1,140 @@
+"""
+Energy Consumption Monitor - Pipeline Benchmark
+-----------------------------------------------
+Measures the reader -> AppController -> DataLogger -> analysis path using a
+virtual device, so no hardware is needed.
+
+Reports samples/s, per-block latency (paced scenarios) and peak RSS. Results
+are written as JSON and can be compared against a previous run:
+
+    python -m benchmarks.bench_pipeline -o baseline.json
+    python -m benchmarks.bench_pipeline --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas  # noqa: F401  (carregado antes para não medir o import na análise)
+from src.core.app_controller import AppController
+from src.core.offline_analysis import analyze_file
+from src.drivers.virtual_device import VirtualSerialReader
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCENARIOS = {
+    "throughput_csv": {"samples": 200_000, "rate_hz": 1000, "speed": None, "protocol": "csv"},
+    "throughput_binary": {"samples": 200_000, "rate_hz": 1000, "speed": None, "protocol": "binary"},
+    "latency_paced": {"samples": 3_000, "rate_hz": 1000, "speed": 1.0, "protocol": "csv"},
+}
+
+# Métricas em que valores maiores são melhores (as demais: menores são melhores)
+HIGHER_IS_BETTER = {"pipeline_samples_per_s", "analysis_samples_per_s"}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024.0 if sys.platform != "darwin" else peak / (1024.0 * 1024.0)
+
+
+def run_pipeline(samples=100_000, rate_hz=1000, speed=None, protocol="csv", timeout_s=120):
+    """Executa um cenário completo e retorna as métricas medidas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = VirtualSerialReader.synthetic(rate_hz=rate_hz, duration_s=samples / rate_hz,
+                                               profile="noise", speed=speed, protocol=protocol)
+        controller = AppController(reader=reader, sample_rate_hz=rate_hz, output_dir=tmp)
+        latencies_ms = []
+        process_block = controller._process_block
+
+        def timed_process_block(timestamps, currents):
+            process_block(timestamps, currents)
+            due = reader.device.due_time(int(timestamps[0]))
+            if speed is not None and due is not None:
+                latencies_ms.append((time.monotonic() - due) * 1000.0)
+
+        controller._process_block = timed_process_block
+        start = time.perf_counter()
+        controller.start()
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            if reader.exhausted and controller.metrics()["processed"] >= reader.device.samples_sent:
+                break
+            time.sleep(0.005)
+        controller.stop()
+        elapsed = time.perf_counter() - start
+        processed = controller.metrics()["processed"]
+
+        start = time.perf_counter()
+        analyze_file(controller.logger.path)
+        analysis_s = time.perf_counter() - start
+
+    result = {
+        "samples": processed,
+        "pipeline_samples_per_s": processed / elapsed,
+        "analysis_samples_per_s": processed / analysis_s if analysis_s else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if latencies_ms:
+        result["latency_p50_ms"] = float(np.percentile(latencies_ms, 50))
+        result["latency_p99_ms"] = float(np.percentile(latencies_ms, 99))
+        result["latency_max_ms"] = float(np.max(latencies_ms))
+    return result
+
+
+def run_all(scenarios=None, scale=1.0):
+    results = {}
+    for name, params in (scenarios or SCENARIOS).items():
+        params = dict(params, samples=max(int(params["samples"] * scale), 1))
+        results[name] = run_pipeline(**params)
+        print(f"[BENCH] {name}: " + ", ".join(
+            f"{k}={v:.4g}" for k, v in results[name].items() if isinstance(v, (int, float))))
+    return {"python": platform.python_version(), "timestamp": time.time(), "scenarios": results}
+
+
+def compare(current, baseline, tolerance=0.15):
+    """Retorna a lista de regressões (métricas piores que a base além da tolerância)."""
+    regressions = []
+    for name, metrics in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name, {})
+        for key, value in metrics.items():
+            ref = base.get(key)
+            if key in ("samples", "peak_rss_mb") or not isinstance(value, (int, float)) or not ref:
+                continue
+            change = (value - ref) / ref
+            worse = -change if key in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append((name, key, ref, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the acquisition pipeline.")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale the number of samples")
+    args = parser.parse_args(argv)
+
+    results = run_all(scale=args.scale)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, key, ref, value in regressions:
+            print(f"[BENCH] REGRESSION {name}.{key}: {ref:.4g} -> {value:.4g}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
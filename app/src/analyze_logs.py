@@ -0,0 +1,68 @@
+"""
+Energy Consumption Monitor - Offline Log Analysis
+-------------------------------------------------
+Headless command that summarizes DataLogger CSV files.
+
+Usage:
+    python -m src.analyze_logs logs/*.csv --window 60 --workers 4 -o summary.csv
+    python -m src.analyze_logs logs/*.csv --events -o events.csv
+"""
+
+import argparse
+import csv
+import sys
+from pathlib import Path
+from src.core.offline_analysis import SUMMARY_FIELDS, analyze_files
+from src.core.events import EVENT_FIELDS, detect_events_file
+from src.core.segments import unique_sessions
+
+
+def main(argv=None):
+    """Entry point for the offline analysis command."""
+    parser = argparse.ArgumentParser(description="Summarize energy monitor CSV logs.")
+    parser.add_argument("files", nargs="+", help="DataLogger CSV files")
+    parser.add_argument("--window", type=float, default=None,
+                        help="window size in seconds (e.g. 60 or 3600)")
+    parser.add_argument("--offset", type=float, default=0.0, help="calibration offset (mA)")
+    parser.add_argument("--scale", type=float, default=1.0, help="calibration scale")
+    parser.add_argument("--voltage", type=float, default=5.0, help="supply voltage (V)")
+    parser.add_argument("--rate", type=float, default=62.5, help="sample rate (Hz)")
+    parser.add_argument("--chunksize", type=int, default=200_000, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--start", type=int, default=None,
+                        help="first timestamp to analyze (ms, uses the time index)")
+    parser.add_argument("--end", type=int, default=None, help="end timestamp, exclusive (ms)")
+    parser.add_argument("--events", action="store_true",
+                        help="list load events (steps/spikes) instead of summaries")
+    parser.add_argument("--step", type=float, default=100.0, help="minimum step for events (mA)")
+    parser.add_argument("--spike", type=float, default=1000.0, help="spike threshold for events (mA)")
+    parser.add_argument("-o", "--output", default=None, help="output CSV (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.events:
+        fields = EVENT_FIELDS
+        rows = [{"file": Path(path).name, **event._asdict()}
+                for path in unique_sessions(args.files)
+                for event in detect_events_file(path, offset_mA=args.offset, scale=args.scale,
+                                                chunksize=args.chunksize, step_mA=args.step,
+                                                spike_mA=args.spike)]
+    else:
+        fields = SUMMARY_FIELDS
+        rows = analyze_files(args.files, workers=args.workers, window_s=args.window,
+                             offset_mA=args.offset, scale=args.scale, voltage_v=args.voltage,
+                             sample_rate_hz=args.rate, chunksize=args.chunksize,
+                             start_ms=args.start, end_ms=args.end)
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: f"{v:.6g}" if isinstance(v, float) else v for k, v in row.items()})
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
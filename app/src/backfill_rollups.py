@@ -0,0 +1,46 @@
+"""
+Energy Consumption Monitor - Rollup Backfill
+--------------------------------------------
+Builds the 1 s / 1 min / 1 h rollup database from existing DataLogger files.
+Files already imported are skipped.
+
+Usage:
+    python -m src.backfill_rollups logs/*.csv --db logs/rollups.sqlite --rate 62.5
+    python -m src.backfill_rollups --db logs/rollups.sqlite --report 3600
+"""
+
+import argparse
+import csv
+import sys
+from src.core.rollup import RESOLUTIONS_S, ROLLUP_FIELDS, RollupStore, backfill_file
+
+
+def main(argv=None):
+    """Entry point for the rollup backfill command."""
+    parser = argparse.ArgumentParser(description="Build rollups from energy monitor logs.")
+    parser.add_argument("files", nargs="*", help="DataLogger .csv/.ecm files")
+    parser.add_argument("--db", default="logs/rollups.sqlite", help="rollup database")
+    parser.add_argument("--rate", type=float, default=62.5, help="sample rate of CSV files (Hz)")
+    parser.add_argument("--voltage", type=float, default=5.0, help="supply voltage (V)")
+    parser.add_argument("--chunksize", type=int, default=200_000, help="rows per chunk")
+    parser.add_argument("--report", type=int, choices=RESOLUTIONS_S, default=None,
+                        help="print all buckets at this resolution (s) as CSV")
+    args = parser.parse_args(argv)
+
+    store = RollupStore(args.db, voltage_v=args.voltage)
+    try:
+        for path in args.files:
+            n = backfill_file(store, path, sample_rate_hz=args.rate, chunksize=args.chunksize)
+            print(f"[ROLLUP] {path}: {n} samples" if n else f"[ROLLUP] {path}: already imported",
+                  file=sys.stderr)
+        if args.report:
+            writer = csv.DictWriter(sys.stdout, fieldnames=ROLLUP_FIELDS)
+            writer.writeheader()
+            for row in store.query(0, 2 ** 62, resolution_s=args.report):
+                writer.writerow({k: f"{v:.6g}" if isinstance(v, float) else v for k, v in row.items()})
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,175 @@
+import copy
 import numpy as np
+from src.core import timebase
+
+# Tamanho dos blocos usados para não materializar cópias de arrays grandes
+# (ex.: numpy.memmap de sessões longas).
+_CHUNK = 1 << 20
+
+def format_summary(summary):
+    """Resumo de uma linha (console e barra de status); "0 samples" antes da primeira amostra."""
+    if not summary:
+        return "0 samples"
+    return (f"{summary['count']} samples | avg {summary['avg_mA']:.2f} mA | "
+            f"rms {summary['rms_mA']:.2f} mA | {summary['energy_Wh']:.6f} Wh")
+
 
 class DataAnalyzer:
     """Funções para análise de corrente e energia."""
 
     @staticmethod
     def average_current(currents_mA):
-        return float(np.mean(currents_mA)) if len(currents_mA) else 0.0
+        return float(np.mean(currents_mA, dtype=np.float64)) if len(currents_mA) else 0.0
 
     @staticmethod
     def rms_current(currents_mA):
-        arr = np.array(currents_mA)
-        return float(np.sqrt(np.mean(np.square(arr)))) if len(arr) else 0.0
+        arr = np.asarray(currents_mA)
+        if not len(arr):
+            return 0.0
+        sum_sq = 0.0
+        for start in range(0, len(arr), _CHUNK):
+            chunk = arr[start:start + _CHUNK].astype(np.float64)
+            sum_sq += float(np.dot(chunk, chunk))
+        return float(np.sqrt(sum_sq / len(arr)))
 
     @staticmethod
-    def estimate_energy_wh(currents_mA, voltage_v=5.0, sample_rate_hz=50):
+    def estimate_energy_wh(currents_mA, voltage_v=5.0, sample_rate_hz=62.5, timestamps_ms=None,
+                           max_gap_ms=None):
         """
         Estima energia consumida (Wh) a partir da corrente e tensão.
-        E = (I_avg * V * t) / 3600
+        Com timestamps_ms integra pelos trapézios sobre o tempo real (ver timebase),
+        sem contar lacunas; sem eles, E = (I_avg * V * t) / 3600 com t = n / sample_rate_hz.
         """
-        if not currents_mA:
+        if len(currents_mA) == 0:
             return 0.0
-        i_avg_a = np.mean(currents_mA) / 1000.0
+        if timestamps_ms is not None:
+            return timebase.integrate_energy_wh(timestamps_ms, currents_mA, voltage_v,
+                                                max_gap_ms or timebase.default_max_gap_ms(sample_rate_hz))
+        i_avg_a = np.mean(currents_mA, dtype=np.float64) / 1000.0
         duration_s = len(currents_mA) / sample_rate_hz
         return float((i_avg_a * voltage_v * duration_s) / 3600.0)
+
+
+class StreamingStats:
+    """
+    Acumulador incremental de estatísticas de corrente.
+
+    Atualiza contagem, média (Welford/Chan), soma dos quadrados, mín/máx e
+    carga integrada a cada amostra ou bloco; o resumo sai em O(1). Dois
+    acumuladores podem ser combinados com merge() (ex.: por bloco ou arquivo).
+
+    Quando os blocos trazem timestamps do dispositivo, a carga é integrada
+    pelos trapézios sobre o tempo real (com virada do millis desfeita e
+    continuidade entre blocos); intervalos maiores que max_gap_ms são contados
+    como lacunas e não entram na integração. Sem timestamps vale n / sample_rate_hz.
+    """
+
+    def __init__(self, voltage_v=5.0, sample_rate_hz=62.5, max_gap_ms=None):
+        self.voltage_v = voltage_v
+        self.sample_rate_hz = sample_rate_hz
+        self.max_gap_ms = max_gap_ms or timebase.default_max_gap_ms(sample_rate_hz)
+        self._unwrapper = timebase.MillisUnwrapper()
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.sum_sq = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.charge_mAh = 0.0
+        self.duration_s = 0.0
+        self.gaps = 0
+        self.gap_s = 0.0
+        self._last = None   # (t, corrente) da última amostra com timestamp
+        self._unwrapper.reset()
+
+    def update(self, current_mA, timestamp_ms=None):
+        """Adiciona uma amostra."""
+        self.update_batch((current_mA,), None if timestamp_ms is None else (timestamp_ms,))
+
+    def update_batch(self, currents_mA, timestamps_ms=None):
+        """Adiciona um bloco de amostras (uma passada vetorizada)."""
+        arr = np.asarray(currents_mA, dtype=np.float64)
+        n = len(arr)
+        if not n:
+            return
+        mean = float(arr.mean())
+        dev = arr - mean
+        self._combine(n, mean, float(np.dot(dev, dev)), float(np.dot(arr, arr)),
+                      float(arr.min()), float(arr.max()))
+        if timestamps_ms is None:
+            duration_s = n / self.sample_rate_hz
+            self.charge_mAh += mean * duration_s / 3600.0
+            self.duration_s += duration_s
+            return
+        t = self._unwrapper.unwrap(timestamps_ms)
+        if self._last is not None:
+            t = np.r_[self._last[0], t]
+            arr = np.r_[self._last[1], arr]
+        self._last = (int(t[-1]), float(arr[-1]))
+        if len(t) < 2:
+            return
+        charge, dt_s = timebase.interval_charge_mAs(t, arr, self.max_gap_ms)
+        gaps = dt_s == 0.0
+        self.charge_mAh += float(charge.sum()) / 3600.0
+        self.duration_s += float(dt_s.sum())
+        self.gaps += int(gaps.sum())
+        self.gap_s += float(np.clip(np.diff(t)[gaps], 0, None).sum()) / 1000.0
+
+    def continue_from(self, other):
+        """Continua a integração a partir da última amostra de outro acumulador."""
+        self._last = other._last
+        self._unwrapper = copy.copy(other._unwrapper)
+        return self
+
+    def merge(self, other):
+        """Combina outro acumulador (parcial de outro bloco/arquivo) neste."""
+        if other.count:
+            self._combine(other.count, other.mean, other._m2, other.sum_sq, other.min, other.max)
+            self.charge_mAh += other.charge_mAh
+            self.duration_s += other.duration_s
+            self.gaps += other.gaps
+            self.gap_s += other.gap_s
+        return self
+
+    def _combine(self, n, mean, m2, sum_sq, min_, max_):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.sum_sq += sum_sq
+        self.min = min(self.min, min_)
+        self.max = max(self.max, max_)
+
+    @property
+    def rms(self):
+        return float(np.sqrt(self.sum_sq / self.count)) if self.count else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / self.count)) if self.count else 0.0
+
+    @property
+    def energy_wh(self):
+        return self.charge_mAh * self.voltage_v / 1000.0
+
+    def summary(self):
+        """Resumo atual em tempo constante."""
+        if not self.count:
+            return {}
+        return {
+            "count": self.count,
+            "avg_mA": self.mean,
+            "rms_mA": self.rms,
+            "std_mA": self.std,
+            "min_mA": self.min,
+            "max_mA": self.max,
+            "charge_mAh": self.charge_mAh,
+            "energy_Wh": self.energy_wh,
+            "duration_s": self.duration_s,
+            "gaps": self.gaps,
+            "gap_s": self.gap_s,
+        }
@@ -1,32 +1,99 @@
 import time
+import numpy as np
+from collections import deque
 from threading import Thread, Event
 from src.drivers.serial_reader import SerialReader
 from src.drivers.calibration import ACS712Calibrator
 from src.core.data_logger import DataLogger
-from src.core.analysis import DataAnalyzer
+from src.core.analysis import DataAnalyzer, StreamingStats
+from src.core.sample_buffer import SampleBuffer
+from src.core.events import LoadEventDetector, EventLog, events_path
+from src.core.window_stats import SlidingWindowStats
+from src.core.metrics import METRICS, MetricsDumper
 
 class AppController:
     """Coordena captura de dados, calibração, logging e análise."""
 
-    def __init__(self, port="COM6", baudrate=9600, sample_rate_hz=50):
+    def __init__(self, port="COM6", baudrate=9600, sample_rate_hz=62.5,
+                 buffer_capacity=2 ** 18, reader=None, output_dir="logs",
+                 metrics_dump_path=None, metrics_dump_interval_s=5.0, rollup_db=None,
+                 samples=None, stream_port=None, stream_host="127.0.0.1",
+                 spectral=False):
         self.port = port
         self.baudrate = baudrate
         self.sample_rate_hz = sample_rate_hz
-        self.reader = SerialReader(port, baudrate)
+        # reader permite injetar outra fonte compatível (ex.: VirtualSerialReader)
+        self.reader = reader if reader is not None else SerialReader(port, baudrate, bulk=True, protocol="auto")
         self.calibrator = ACS712Calibrator()
-        self.logger = DataLogger()
+        self.logger = DataLogger(output_dir=output_dir, async_write=True)
         self.analyzer = DataAnalyzer()
+        self.stats = StreamingStats(sample_rate_hz=sample_rate_hz)
+        self.consumers = []
+        # Média/RMS/pico dos últimos 1 s, 10 s, 1 min e 15 min (consulta O(1) pela UI)
+        self.window_stats = self.add_consumer(SlidingWindowStats(sample_rate_hz=sample_rate_hz))
+        # Eventos de carga: callback opcional em on_event e log em <sessão>.events.log
+        self.events = self.add_consumer(LoadEventDetector(callback=self._on_event))
+        self.recent_events = deque(maxlen=100)
+        self.on_event = None
+        self._event_log = None
+        # Espectro, fator de crista e THD em janelas deslizantes (opcional)
+        self.spectral = None
+        if spectral:
+            from src.core.spectral import SpectralAnalyzer
+
+            self.spectral = self.add_consumer(SpectralAnalyzer(sample_rate_hz=sample_rate_hz))
+        # Agregados 1 s / 1 min / 1 h em SQLite (opcional)
+        self.rollups = None
+        if rollup_db:
+            from src.core.rollup import RollupStore
+
+            self.rollups = self.add_consumer(RollupStore(rollup_db))
+        # Servidor de streaming local (opcional; stream_port=0 escolhe uma porta livre)
+        self.stream = None
+        if stream_port is not None:
+            from src.core.stream_server import StreamServer
+
+            self.stream = self.add_consumer(
+                StreamServer(stream_host, stream_port, stats_source=self.summarize))
         self._thread = None
         self._stop_event = Event()
-        self.samples = []
+        self._dumper = None
+        if metrics_dump_path:
+            self._dumper = MetricsDumper(METRICS, metrics_dump_path, metrics_dump_interval_s)
+        # samples permite publicar em outro buffer compatível (ex.: SharedSampleBuffer)
+        self.samples = samples if samples is not None else SampleBuffer(buffer_capacity)
+        self._reset_metrics()
 
     def start(self):
         """Inicia captura e gravação."""
         self.reader.connect()
-        self.logger.start(device_name="energy_monitor")
+        self.logger.start(device_name="energy_monitor", metadata={
+            "sample_rate_hz": self.sample_rate_hz,
+            "offset_mA": self.calibrator.offset_mA,
+            "scale": self.calibrator.scale,
+        }, calibration=self.calibrator.to_dict())
+        if self.rollups:
+            self.rollups.open_session("energy_monitor", sample_rate_hz=self.sample_rate_hz,
+                                      source=self.logger.path)
+        if self.logger.path:
+            self._event_log = EventLog(events_path(self.logger.path))
         self._stop_event.clear()
+        self.stats.reset()
+        self.window_stats.reset()
+        if self.spectral:
+            self.spectral.reset()
+        self.events.reset()
+        self.recent_events.clear()
+        self._reset_metrics()
         self._thread = Thread(target=self._loop, daemon=True)
         self._thread.start()
+        METRICS.register_source("controller", self.metrics)
+        METRICS.register_source("logger", self.logger.metrics)
+        if self.stream:
+            self.stream.start()
+            METRICS.register_source("stream", self.stream.metrics)
+        if self._dumper:
+            self._dumper.start()
         print("[CORE] Acquisition started.")
 
     def stop(self):
@@ -36,40 +103,112 @@ class AppController:
             self._thread.join(timeout=2)
         self.reader.disconnect()
         self.logger.stop()
+        if self.stream:
+            self.stream.stop()
+        if self.rollups:
+            self.rollups.flush()
+        if self._event_log:
+            self._event_log.close()
+            self._event_log = None
+        if self._dumper:
+            self._dumper.stop()
         print("[CORE] Acquisition stopped.")
 
+    def add_consumer(self, consumer):
+        """
+        Registra um consumidor do fluxo calibrado (objeto com
+        update_block(timestamps_ms, currents_mA)), chamado a cada bloco.
+        """
+        self.consumers.append(consumer)
+        return consumer
+
+    def _on_event(self, event):
+        self.recent_events.append(event)
+        if self._event_log:
+            self._event_log.log(event)
+        print(f"[CORE] Load event: {event.kind} {event.magnitude_mA:+.1f} mA at {event.timestamp_ms} ms")
+        if self.on_event:
+            self.on_event(event)
+
     def calibrate_zero(self, samples_n=100):
         """Coleta amostras em 0 A para calibrar offset."""
         print("[CORE] Calibrating zero-current offset...")
         samples = []
         self.reader.connect()
-        for _ in range(samples_n):
-            data = self.reader.read(block=True, timeout=1)
-            if data:
-                _, current_mA = data
-                samples.append(current_mA)
+        while len(samples) < samples_n:
+            block = self.reader.read_block(block=True, timeout=1)
+            if block is None:
+                break
+            samples.extend(block[1][:samples_n - len(samples)].tolist())
         self.reader.disconnect()
         self.calibrator.calibrate_zero(samples)
         print(f"[CORE] Offset calibrated: {self.calibrator.offset_mA:.3f} mA")
 
     def _loop(self):
-        """Loop de leitura e registro contínuo."""
+        """
+        Loop de leitura e registro contínuo.
+        Bloqueia até haver dados e processa de uma vez tudo o que estiver na fila.
+        """
         while not self._stop_event.is_set():
-            data = self.reader.read()
-            if not data:
+            block = self.reader.read_block(block=True, timeout=0.1)
+            if block is None:
                 continue
+            self._process_block(*block)
+
+    def _process_block(self, timestamps, currents_mA):
+        """Calibra, grava e armazena um bloco de amostras."""
+        if METRICS.enabled:
+            start = time.perf_counter()
+            self._store_block(timestamps, currents_mA)
+            METRICS.observe("core.process_block", time.perf_counter() - start)
+            METRICS.incr("core.samples", len(timestamps))
+        else:
+            self._store_block(timestamps, currents_mA)
+
+    def _store_block(self, timestamps, currents_mA):
+        currents_corr = np.array(currents_mA, dtype=np.float64)
+        self.calibrator.apply(currents_corr, out=currents_corr)
+        self.logger.log_many(timestamps, currents_corr)
+        self.samples.extend(timestamps, currents_corr)
+        self.stats.update_batch(currents_corr, timestamps)
+        for consumer in self.consumers:
+            try:
+                consumer.update_block(timestamps, currents_corr)
+            except Exception as e:  # um consumidor com erro não pode parar a aquisição
+                print(f"[CORE] Consumer {type(consumer).__name__} failed: {e}")
+
+        n = len(timestamps)
+        backlog_ms = int(timestamps[-1] - timestamps[0]) if n else 0
+        self._metrics["batches"] += 1
+        self._metrics["processed"] += n
+        self._metrics["last_batch"] = n
+        self._metrics["max_batch"] = max(self._metrics["max_batch"], n)
+        self._metrics["backlog_age_ms"] = backlog_ms
+        self._metrics["max_backlog_age_ms"] = max(self._metrics["max_backlog_age_ms"], backlog_ms)
+
+    def _reset_metrics(self):
+        self._metrics = {
+            "batches": 0,
+            "processed": 0,
+            "last_batch": 0,
+            "max_batch": 0,
+            "backlog_age_ms": 0,
+            "max_backlog_age_ms": 0,
+        }
 
-            timestamp, current_mA = data
-            current_corr = self.calibrator.apply(current_mA)
-            self.logger.log(timestamp, current_corr)
-            self.samples.append(current_corr)
-            time.sleep(1 / self.sample_rate_hz)
+    def metrics(self):
+        """
+        Métricas de contrapressão do consumidor.
+        backlog_age_ms é a idade (no relógio do dispositivo) da amostra mais
+        antiga do último lote drenado em relação à mais recente.
+        """
+        return {
+            **self._metrics,
+            "queue_depth": self.reader.queue.qsize(),
+            "dropped": self.reader.dropped,
+            "invalid_lines": self.reader.invalid_lines,
+        }
 
     def summarize(self):
-        """Retorna métricas básicas do registro atual."""
-        if not self.samples:
-            return {}
-        avg = self.analyzer.average_current(self.samples)
-        rms = self.analyzer.rms_current(self.samples)
-        energy = self.analyzer.estimate_energy_wh(self.samples)
-        return {"avg_mA": avg, "rms_mA": rms, "energy_Wh": energy}
+        """Retorna métricas da sessão atual (tempo constante)."""
+        return self.stats.summary()
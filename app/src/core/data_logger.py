@@ -1,35 +1,258 @@
 import csv
+import json
+import os
+import time
+import threading
+import numpy as np
 from datetime import datetime
 from pathlib import Path
+from queue import Queue, Empty, Full
+from src.core.session_file import SessionWriter
+from src.core.segments import COMPRESSORS, SegmentCompressor, segment_path
+from src.core.session_index import IndexWriter, checkpoint_rows, index_path
+from src.core.metrics import METRICS
+
+_STOP = object()
 
 class DataLogger:
-    """Gerencia gravação de dados em CSV para o Energy Monitor."""
+    """
+    Gerencia gravação de dados em CSV para o Energy Monitor.
+
+    No modo assíncrono (async_write=True) as amostras são enfileiradas e um
+    thread de escrita grava em lotes (group commit): o flush ocorre a cada
+    flush_rows linhas ou flush_interval_ms, o que vier primeiro. Com fsync=True
+    cada flush também força os dados ao disco. A fila é limitada a max_pending
+    blocos; quando cheia, overflow="block" faz o chamador esperar e
+    overflow="drop" descarta o bloco e contabiliza em dropped_rows.
+
+    Com file_format="binary" a sessão é gravada no formato colunar .ecm
+    (ver session_file), com calibração e taxa de amostragem no cabeçalho.
+
+    Com rotate_bytes e/ou rotate_seconds a sessão é dividida em segmentos
+    (ver segments); a verificação ocorre a cada flush, então um segmento pode
+    passar um pouco do limite. Com compression="gzip" ou "lzma" os segmentos
+    fechados são comprimidos por um thread de fundo.
 
-    def __init__(self, output_dir="logs"):
+    Em CSV, index_every (padrão 1000) grava ao lado de cada arquivo um índice
+    de tempo (.idx, ver session_index) com um checkpoint a cada index_every
+    linhas, usado para extrair intervalos sem varrer o arquivo.
+    """
+
+    def __init__(self, output_dir="logs", async_write=False, flush_rows=500,
+                 flush_interval_ms=500, fsync=False, max_pending=1000, overflow="block",
+                 file_format="csv", rotate_bytes=None, rotate_seconds=None, compression=None,
+                 index_every=1000):
+        if overflow not in ("block", "drop"):
+            raise ValueError("overflow must be 'block' or 'drop'")
+        if file_format not in ("csv", "binary"):
+            raise ValueError("file_format must be 'csv' or 'binary'")
+        if compression not in (None, *COMPRESSORS):
+            raise ValueError("compression must be None, 'gzip' or 'lzma'")
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.async_write = async_write
+        self.flush_rows = flush_rows
+        self.flush_interval_ms = flush_interval_ms
+        self.fsync = fsync
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.file_format = file_format
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compression = compression
+        self.index_every = index_every
+        self._index = None
+        self._rows = 0
+        self._offset = 0
+        self.segment = 0
+        self._segment_started = 0.0
+        self._compressor = None
+        self._metadata = None
+        self.path = None
         self.file = None
         self.writer = None
+        self._session = None
+        self.dropped_rows = 0
+        self.write_error = None
+        self._queue = None
+        self._thread = None
+
+    @staticmethod
+    def calibration_path(session_path):
+        """Arquivo JSON com a calibração usada em uma sessão."""
+        return Path(session_path).with_suffix(".calibration.json")
 
-    def start(self, device_name="default"):
-        """Inicia um novo arquivo CSV."""
+    def start(self, device_name="default", metadata=None, calibration=None):
+        """
+        Inicia um novo arquivo de sessão.
+        metadata (opcional): sample_rate_hz, offset_mA e scale, usados no formato binário.
+        calibration (opcional): dict de ACS712Calibrator.to_dict(), salvo ao lado da sessão.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{device_name}_{timestamp}.csv"
-        self.file = open(self.output_dir / filename, "w", newline="")
-        self.writer = csv.writer(self.file)
-        self.writer.writerow(["timestamp_ms", "current_mA"])
+        extension = "ecm" if self.file_format == "binary" else "csv"
+        filename = f"{device_name}_{timestamp}.{extension}"
+        self.path = self.output_dir / filename
+        self._metadata = metadata or {}
+        self.segment = 0
+        self._open_segment(self.path)
+        if self.compression:
+            self._compressor = SegmentCompressor(self.compression)
+        if calibration is not None:
+            with open(self.calibration_path(self.path), "w") as f:
+                json.dump(calibration, f, indent=2)
+        self.dropped_rows = 0
+        self.write_error = None
+        if self.async_write:
+            self._queue = Queue(maxsize=self.max_pending)
+            self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._thread.start()
         print(f"[LOGGER] Recording to {filename}")
 
+    def _open_segment(self, path):
+        if self.file_format == "binary":
+            self._session = SessionWriter(path, **self._metadata)
+            self.file = self._session.file
+        else:
+            self.file = open(path, "w", newline="")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(["timestamp_ms", "current_mA"])
+            self._offset = self.file.tell()
+            self._rows = 0
+            if self.index_every:
+                self._index = IndexWriter(index_path(path), self.index_every)
+        self._segment_started = time.monotonic()
+
+    def _maybe_rotate(self):
+        """Fecha o segmento atual e abre o próximo se um limite foi atingido."""
+        size_due = self.rotate_bytes and os.fstat(self.file.fileno()).st_size >= self.rotate_bytes
+        time_due = (self.rotate_seconds
+                    and time.monotonic() - self._segment_started >= self.rotate_seconds)
+        if not (size_due or time_due):
+            return
+        closed = segment_path(self.path, self.segment)
+        self.file.close()
+        self._close_index()
+        self.segment += 1
+        self._open_segment(segment_path(self.path, self.segment))
+        if self._compressor:
+            self._compressor.submit(closed)
+        print(f"[LOGGER] Rotated to segment {self.segment}")
+
+    def _close_index(self):
+        if self._index:
+            self._index.close()
+            self._index = None
+
     def log(self, timestamp_ms: int, current_mA: float):
         """Registra uma linha CSV."""
-        if self.writer:
-            self.writer.writerow([timestamp_ms, f"{current_mA:.3f}"])
-            self.file.flush()
+        if self.async_write:
+            self._enqueue(([timestamp_ms], [current_mA]))
+        elif self.file:
+            self._commit([([timestamp_ms], [current_mA])])
+
+    def log_many(self, timestamps_ms, currents_mA):
+        """Registra um bloco de linhas CSV com um único flush."""
+        if self.async_write:
+            self._enqueue((timestamps_ms, currents_mA))
+        elif self.file:
+            self._commit([(timestamps_ms, currents_mA)])
+
+    def _enqueue(self, block):
+        if self._queue is None:
+            return
+        if self.overflow == "block":
+            self._queue.put(block)
+            return
+        try:
+            self._queue.put_nowait(block)
+        except Full:
+            self.dropped_rows += len(block[0])
+
+    def _write_rows(self, blocks):
+        if self._session:
+            for timestamps_ms, currents_mA in blocks:
+                self._session.append(timestamps_ms, currents_mA)
+            return
+        for timestamps_ms, currents_mA in blocks:
+            timestamps = np.asarray(timestamps_ms)
+            # Mesmo formato do csv.writer; as linhas são montadas aqui para
+            # conhecer o offset em bytes de cada checkpoint do índice
+            lines = [f"{ts},{c:.3f}\r\n" for ts, c in zip(timestamps.tolist(),
+                                                          np.asarray(currents_mA).tolist())]
+            if self._index:
+                rows = checkpoint_rows(self._rows, len(lines), self.index_every)
+                if len(rows):
+                    starts = np.cumsum([0, *map(len, lines)])
+                    local = rows - self._rows
+                    self._index.add(timestamps[local], self._offset + starts[local], rows)
+            text = "".join(lines)
+            self.file.write(text)
+            self._offset += len(text)
+            self._rows += len(lines)
+
+    def _commit(self, blocks):
+        """Grava um lote pendente com um único flush (e fsync, se configurado)."""
+        start = time.perf_counter() if METRICS.enabled else 0.0
+        self._write_rows(blocks)
+        self.file.flush()
+        if self._index:
+            self._index.flush()   # depois dos dados: o índice nunca aponta além do CSV
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self._maybe_rotate()
+        if METRICS.enabled:
+            METRICS.observe("logger.commit", time.perf_counter() - start)
+            METRICS.incr("logger.rows", sum(len(block[0]) for block in blocks))
+
+    def _writer_loop(self):
+        """Thread de escrita em lotes."""
+        interval_s = self.flush_interval_ms / 1000.0
+        pending, pending_rows = [], 0
+        deadline = time.monotonic() + interval_s
+        while True:
+            try:
+                block = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except Empty:
+                block = None
+            if block is not None and block is not _STOP:
+                pending.append(block)
+                pending_rows += len(block[0])
+
+            if block is _STOP or pending_rows >= self.flush_rows or time.monotonic() >= deadline:
+                if pending:
+                    try:
+                        self._commit(pending)
+                    except (OSError, ValueError) as e:
+                        self.write_error = e
+                        print(f"[LOGGER] Write error: {e}")
+                    pending, pending_rows = [], 0
+                deadline = time.monotonic() + interval_s
+            if block is _STOP:
+                break
+
+    def metrics(self):
+        """Estado da fila de escrita (para o snapshot de instrumentação)."""
+        return {
+            "pending_blocks": self._queue.qsize() if self._queue else 0,
+            "dropped_rows": self.dropped_rows,
+            "segment": self.segment,
+            "write_error": str(self.write_error) if self.write_error else None,
+        }
 
     def stop(self):
-        """Fecha o arquivo atual."""
+        """Grava o que estiver pendente e fecha o arquivo atual."""
+        if self._thread:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            self._queue = None
         if self.file:
             print("[LOGGER] Recording stopped.")
             self.file.close()
             self.file = None
             self.writer = None
+            self._session = None
+            self._close_index()
+        if self._compressor:
+            self._compressor.stop()
+            self._compressor = None
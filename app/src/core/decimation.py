@@ -0,0 +1,118 @@
+import numpy as np
+
+class _Level:
+    """
+    Anel de buckets (t, min, max, média) espelhado, como no SampleBuffer:
+    a posição de escrita é sempre total % capacity.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.columns = (np.zeros(2 * capacity, dtype=np.int64),
+                        np.zeros(2 * capacity), np.zeros(2 * capacity), np.zeros(2 * capacity))
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def extend(self, *values):
+        n = len(values[0])
+        values = [v[-self.capacity:] for v in values]
+        m, pos = len(values[0]), 0
+        i = (self.total + n - m) % self.capacity   # buckets além da capacidade são pulados
+        while pos < m:
+            k = min(m - pos, self.capacity - i)
+            for column, v in zip(self.columns, values):
+                column[i:i + k] = column[i + self.capacity:i + self.capacity + k] = v[pos:pos + k]
+            i = (i + k) % self.capacity
+            pos += k
+        self.total += n
+
+    def view(self):
+        end = self.total % self.capacity + self.capacity
+        start = end - len(self)
+        return tuple(column[start:end] for column in self.columns)
+
+    def clear(self):
+        self.total = 0
+
+
+class MinMaxPyramid:
+    """
+    Pirâmide de envelopes min/max/média em várias resoluções.
+
+    O nível 0 guarda as amostras; cada nível seguinte agrega `factor` buckets
+    do anterior, atualizado de forma incremental e vetorizada a cada bloco.
+    Cada nível é um anel de capacidade fixa, então a memória é limitada e o
+    histórico antigo continua disponível nas resoluções mais grossas. Como
+    min e max são preservados, picos curtos nunca somem na decimação.
+    """
+
+    def __init__(self, levels=5, factor=8, capacity=2 ** 16):
+        self.factor = factor
+        self.levels = [_Level(capacity) for _ in range(levels)]
+        self._pending = [None] * levels
+
+    def __len__(self):
+        return self.levels[0].total
+
+    def extend(self, timestamps_ms, currents_mA):
+        """Adiciona um bloco de amostras e propaga os buckets completos."""
+        t = np.asarray(timestamps_ms, dtype=np.int64)
+        v = np.asarray(currents_mA, dtype=np.float64)
+        if not len(t):
+            return
+        block = (t, v, v, v)
+        self.levels[0].extend(*block)
+        f = self.factor
+        for k in range(1, len(self.levels)):
+            if self._pending[k] is not None:
+                block = tuple(np.concatenate(pair) for pair in zip(self._pending[k], block))
+            m = len(block[0]) // f * f
+            self._pending[k] = tuple(col[m:] for col in block)
+            if not m:
+                break
+            t, lo, hi, mean = (col[:m] for col in block)
+            block = (t[::f], lo.reshape(-1, f).min(axis=1),
+                     hi.reshape(-1, f).max(axis=1), mean.reshape(-1, f).mean(axis=1))
+            self.levels[k].extend(*block)
+
+    def query(self, t0_ms, t1_ms, max_points=4000):
+        """
+        Retorna (t, min, max, level) do nível mais fino que cobre [t0, t1]
+        com no máximo max_points // 2 buckets (cada bucket vira 2 pontos).
+        Se nem o nível mais grosso cabe, seus buckets são reagrupados em
+        passos fixos (min dos min, max dos max) e level = len(levels).
+        """
+        budget = max(max_points // 2, 1)
+        chosen = None
+        for k, level in enumerate(self.levels):
+            t, lo, hi, _ = level.view()
+            if not len(t):
+                break
+            i0 = max(int(np.searchsorted(t, t0_ms, side="right")) - 1, 0)
+            i1 = int(np.searchsorted(t, t1_ms, side="right"))
+            chosen = (t[i0:i1], lo[i0:i1], hi[i0:i1], k)
+            if i1 - i0 <= budget and t[0] <= t0_ms:
+                break
+        if chosen is None:
+            empty = np.empty(0)
+            return empty.astype(np.int64), empty, empty, 0
+        t, lo, hi, k = chosen
+        if len(t) > budget:
+            starts = np.arange(0, len(t), -(-len(t) // budget))
+            return (t[starts], np.minimum.reduceat(lo, starts),
+                    np.maximum.reduceat(hi, starts), len(self.levels))
+        return chosen
+
+    def envelope(self, t0_ms, t1_ms, max_points=4000):
+        """Pontos (x, y) prontos para plotar: amostras no nível 0, traços min/max acima."""
+        t, lo, hi, level = self.query(t0_ms, t1_ms, max_points)
+        if level == 0:
+            return t, lo
+        return np.repeat(t, 2), np.column_stack((lo, hi)).ravel()
+
+    def clear(self):
+        for level in self.levels:
+            level.clear()
+        self._pending = [None] * len(self.levels)
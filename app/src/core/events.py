@@ -0,0 +1,154 @@
+import csv
+from pathlib import Path
+from typing import NamedTuple
+import numpy as np
+from src.drivers.calibration import ACS712Calibrator
+
+
+class LoadEvent(NamedTuple):
+    """Mudança de estado da carga detectada no fluxo de corrente."""
+    timestamp_ms: int
+    kind: str            # "step_up", "step_down" ou "spike"
+    magnitude_mA: float  # variação em relação ao patamar anterior (pico, para spikes)
+    duration_ms: int     # duração do patamar encerrado (steps) ou do pico (spikes)
+    level_mA: float      # patamar após o evento
+
+
+EVENT_FIELDS = ["file", *LoadEvent._fields]
+
+
+def events_path(session_path):
+    """
+    Arquivo (conteúdo CSV) com os eventos de carga de uma sessão. O sufixo
+    .events.log mantém o arquivo fora dos globs *.csv das ferramentas offline.
+    """
+    return Path(session_path).with_suffix(".events.log")
+
+
+class LoadEventDetector:
+    """
+    Detector online de eventos de carga com custo O(1) por amostra.
+
+    Degraus são detectados por CUSUM bilateral em torno do patamar atual:
+    desvios acima de step_mA/2 acumulam e, ao passar de threshold
+    (mA·amostra, padrão 4*step_mA), o novo patamar é a média das amostras
+    desde o início do acúmulo. Picos (ex.: inrush) usam limiar com histerese:
+    começam quando o desvio passa de spike_mA e terminam quando volta abaixo
+    de spike_mA*release. Um "pico" que dura mais que spike_max_ms é tratado
+    como degrau. O estado é de tamanho fixo; os eventos vão para o callback.
+    """
+
+    def __init__(self, step_mA=100.0, threshold=None, spike_mA=1000.0, release=0.5,
+                 spike_max_ms=1000, baseline_alpha=0.02, callback=None):
+        self.step_mA = step_mA
+        self.threshold = threshold if threshold is not None else 4 * step_mA
+        self.spike_mA = spike_mA
+        self.release = release
+        self.spike_max_ms = spike_max_ms
+        self.baseline_alpha = baseline_alpha
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        self.level = None
+        self.events_count = 0
+        self._level_since = 0
+        self._up = [0.0, 0, 0.0, 0]     # g, início, soma, n
+        self._down = [0.0, 0, 0.0, 0]
+        self._spike_start = None
+        self._spike_peak = 0.0
+        self._spike_level = 0.0
+
+    def update_block(self, timestamps_ms, currents_mA):
+        """Processa um bloco de amostras (consumidor do AppController)."""
+        for t, x in zip(np.asarray(timestamps_ms).tolist(), np.asarray(currents_mA).tolist()):
+            self.update(t, x)
+
+    def update(self, t, x):
+        if self.level is None:
+            self.level, self._level_since = x, t
+            return
+        dev = x - self.level
+
+        if self._spike_start is not None:
+            if abs(dev) > abs(self._spike_peak - self.level):
+                self._spike_peak = x
+            self._spike_level += 0.2 * (x - self._spike_level)
+            if abs(dev) < self.spike_mA * self.release:
+                self._emit(self._spike_start, "spike", self._spike_peak - self.level,
+                           t - self._spike_start, self.level)
+                self._spike_start = None
+            elif t - self._spike_start > self.spike_max_ms:
+                self._step(self._spike_start, self._spike_level)
+                self._spike_start = None
+            return
+        if abs(dev) > self.spike_mA:
+            self._spike_start, self._spike_peak, self._spike_level = t, x, x
+            self._clear_cusum()
+            return
+
+        k = self.step_mA / 2
+        if self._accumulate(self._up, dev - k, t, x) > self.threshold:
+            self._step(self._up[1], self._up[2] / self._up[3])
+        elif self._accumulate(self._down, -dev - k, t, x) > self.threshold:
+            self._step(self._down[1], self._down[2] / self._down[3])
+        elif self._up[0] == 0.0 and self._down[0] == 0.0:
+            self.level += self.baseline_alpha * dev
+
+    @staticmethod
+    def _accumulate(acc, increment, t, x):
+        g = acc[0] + increment
+        if g <= 0.0:
+            acc[:] = (0.0, 0, 0.0, 0)
+            return 0.0
+        if acc[3] == 0:
+            acc[1] = t
+        acc[0], acc[2], acc[3] = g, acc[2] + x, acc[3] + 1
+        return g
+
+    def _clear_cusum(self):
+        self._up[:] = (0.0, 0, 0.0, 0)
+        self._down[:] = (0.0, 0, 0.0, 0)
+
+    def _step(self, t, new_level):
+        kind = "step_up" if new_level > self.level else "step_down"
+        self._emit(t, kind, new_level - self.level, t - self._level_since, new_level)
+        self.level, self._level_since = new_level, t
+        self._clear_cusum()
+
+    def _emit(self, t, kind, magnitude, duration, level):
+        self.events_count += 1
+        if self.callback:
+            self.callback(LoadEvent(int(t), kind, float(magnitude), int(duration), float(level)))
+
+
+class EventLog:
+    """Grava eventos de carga em CSV (um flush por evento; eventos são raros)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(LoadEvent._fields)
+        self.file.flush()
+
+    def log(self, event):
+        self.writer.writerow([f"{v:.3f}" if isinstance(v, float) else v for v in event])
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def detect_events_file(path, offset_mA=0.0, scale=1.0, chunksize=200_000, **options):
+    """Executa o detector sobre uma sessão do DataLogger (modo batch, memória constante)."""
+    from src.core.segments import SegmentReader
+
+    calibrator = ACS712Calibrator()
+    calibrator.offset_mA = offset_mA
+    calibrator.scale = scale
+    events = []
+    detector = LoadEventDetector(callback=events.append, **options)
+    for timestamps, currents in SegmentReader(path, chunksize).iter_chunks():
+        detector.update_block(timestamps, calibrator.apply(currents))
+    return events
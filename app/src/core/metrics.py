@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+
+class LatencyHistogram:
+    """Histograma de latências em buckets log2 de microssegundos (custo O(1) por registro)."""
+
+    BUCKETS = 32
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, seconds):
+        bucket = min(int(seconds * 1e6).bit_length(), self.BUCKETS - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_s += seconds
+        if seconds > self.max_s:
+            self.max_s = seconds
+
+    def percentile_ms(self, q):
+        """Limite superior (ms) do bucket que contém o percentil q (0-100)."""
+        if not self.count:
+            return 0.0
+        target = self.count * q / 100.0
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return (1 << bucket) / 1000.0
+        return self.max_s * 1000.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total_s * 1000.0 / self.count if self.count else 0.0,
+            "p50_ms": self.percentile_ms(50),
+            "p99_ms": self.percentile_ms(99),
+            "max_ms": self.max_s * 1000.0,
+        }
+
+
+class Metrics:
+    """
+    Registro de instrumentação: contadores, gauges e histogramas de latência.
+
+    Os pontos instrumentados verificam `enabled` antes de medir, então com a
+    instrumentação desligada o custo é só um teste de atributo. Fontes
+    registradas (register_source) são consultadas a cada snapshot().
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._sources = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        self._gauges[name] = value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = LatencyHistogram()
+            hist.record(seconds)
+
+    def register_source(self, name, func):
+        """Registra uma função que devolve um dict incluído em cada snapshot."""
+        self._sources[name] = func
+
+    def unregister_source(self, name):
+        self._sources.pop(name, None)
+
+    def snapshot(self):
+        """Retorna o estado atual de todas as métricas."""
+        with self._lock:
+            snap = {
+                "time": time.time(),
+                "enabled": self.enabled,
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "latency": {name: h.summary() for name, h in self._histograms.items()},
+            }
+        for name, func in list(self._sources.items()):
+            try:
+                snap[name] = func()
+            except Exception as e:  # uma fonte com erro não deve derrubar o snapshot
+                snap[name] = {"error": str(e)}
+        return snap
+
+
+class MetricsDumper:
+    """Grava periodicamente snapshots (uma linha JSON por snapshot) em arquivo."""
+
+    def __init__(self, metrics, path, interval_s=5.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval_s = interval_s
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval_s):
+            self.dump()
+
+    def dump(self):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(self.metrics.snapshot()) + "\n")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.dump()
+
+
+# Registro global usado pelos pontos instrumentados (ECM_METRICS=1 liga no início)
+METRICS = Metrics(enabled=os.environ.get("ECM_METRICS") == "1")
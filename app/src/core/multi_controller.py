@@ -0,0 +1,96 @@
+import re
+import numpy as np
+from threading import Thread, Event
+from src.drivers.multi_reader import MultiSerialReader
+from src.drivers.calibration import ACS712Calibrator
+from src.core.data_logger import DataLogger
+from src.core.analysis import StreamingStats
+from src.core.sample_buffer import SampleBuffer
+
+class DeviceChannel:
+    """Estado de um dispositivo: calibrador, log, buffer e estatísticas próprios."""
+
+    def __init__(self, port, sample_rate_hz=62.5, buffer_capacity=2 ** 16, output_dir="logs"):
+        self.port = port
+        self.sample_rate_hz = sample_rate_hz
+        self.calibrator = ACS712Calibrator()
+        self.logger = DataLogger(output_dir=output_dir, async_write=True)
+        self.samples = SampleBuffer(buffer_capacity)
+        self.stats = StreamingStats(sample_rate_hz=sample_rate_hz)
+
+    @property
+    def device_name(self):
+        return "energy_monitor_" + re.sub(r"[^A-Za-z0-9]+", "_", self.port).strip("_")
+
+    def start(self):
+        self.stats.reset()
+        self.logger.start(device_name=self.device_name, metadata={
+            "sample_rate_hz": self.sample_rate_hz,
+            "offset_mA": self.calibrator.offset_mA,
+            "scale": self.calibrator.scale,
+        }, calibration=self.calibrator.to_dict())
+
+    def process_block(self, timestamps, currents_mA):
+        """Calibra, grava e armazena um bloco de amostras deste dispositivo."""
+        currents_corr = np.array(currents_mA, dtype=np.float64)
+        self.calibrator.apply(currents_corr, out=currents_corr)
+        self.logger.log_many(timestamps, currents_corr)
+        self.samples.extend(timestamps, currents_corr)
+        self.stats.update_batch(currents_corr, timestamps)
+
+    def stop(self):
+        self.logger.stop()
+
+
+class MultiDeviceController:
+    """Coordena a captura de vários dispositivos com um único loop de I/O."""
+
+    def __init__(self, ports, baudrate=9600, sample_rate_hz=62.5, buffer_capacity=2 ** 16,
+                 output_dir="logs"):
+        self.ports = list(ports)
+        self.reader = MultiSerialReader(self.ports, baudrate)
+        self.channels = {
+            port: DeviceChannel(port, sample_rate_hz, buffer_capacity, output_dir)
+            for port in self.ports
+        }
+        self._thread = None
+        self._stop_event = Event()
+
+    def start(self):
+        """Inicia captura e gravação de todos os dispositivos."""
+        self.reader.connect()
+        for channel in self.channels.values():
+            channel.start()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        print(f"[CORE] Acquisition started on {len(self.channels)} devices.")
+
+    def stop(self):
+        """Interrompe a captura."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.reader.disconnect()
+        for channel in self.channels.values():
+            channel.stop()
+        print("[CORE] Acquisition stopped.")
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            blocks = self.reader.read_block(block=True, timeout=0.1)
+            if not blocks:
+                continue
+            for port, (timestamps, currents) in blocks.items():
+                self.channels[port].process_block(timestamps, currents)
+
+    def summarize(self):
+        """Retorna o resumo de cada dispositivo, indexado pela porta."""
+        return {port: channel.stats.summary() for port, channel in self.channels.items()}
+
+    def metrics(self):
+        return {
+            "queue_depth": self.reader.queue.qsize(),
+            "dropped": dict(self.reader.dropped),
+            "invalid_lines": self.reader.invalid_lines,
+        }
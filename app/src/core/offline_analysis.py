@@ -0,0 +1,87 @@
+from functools import partial
+from pathlib import Path
+import numpy as np
+from src.drivers.calibration import ACS712Calibrator
+from src.core.analysis import StreamingStats
+from src.core.timebase import MillisUnwrapper
+from src.core.segments import SegmentReader, session_of, unique_sessions
+
+SUMMARY_FIELDS = ["file", "window_start_s", "count", "avg_mA", "rms_mA",
+                  "min_mA", "max_mA", "energy_Wh"]
+
+
+def _row(path, window_start_s, stats):
+    summary = stats.summary()
+    return {"file": Path(path).name, "window_start_s": window_start_s,
+            **{k: summary[k] for k in SUMMARY_FIELDS[2:]}}
+
+
+def _chunks(path, chunksize, start_ms, end_ms):
+    reader = SegmentReader(path, chunksize)
+    if reader.rotated or (start_ms is None and end_ms is None):
+        # sessão segmentada: a busca é por segmento (primeiro timestamp de cada um)
+        yield from reader.iter_chunks(start_ms, end_ms)
+        return
+    from src.core.session_index import read_range
+
+    yield from read_range(reader.session_path, start_ms, end_ms, chunksize)
+
+
+def analyze_file(path, window_s=None, offset_mA=0.0, scale=1.0, voltage_v=5.0,
+                 sample_rate_hz=62.5, chunksize=200_000, start_ms=None, end_ms=None):
+    """
+    Analisa uma sessão do DataLogger em blocos de tamanho fixo (memória constante);
+    sessões rotacionadas são lidas inteiras, segmento a segmento.
+    Retorna as linhas de resumo por janela (se window_s) seguidas do total do arquivo.
+    Com start_ms/end_ms só o intervalo [start_ms, end_ms) é lido, via índice de tempo.
+    A energia é integrada sobre os timestamps (ver timebase), sem contar lacunas.
+    """
+    path = session_of(path)
+    calibrator = ACS712Calibrator()
+    calibrator.offset_mA = offset_mA
+    calibrator.scale = scale
+    new_stats = partial(StreamingStats, voltage_v=voltage_v, sample_rate_hz=sample_rate_hz)
+    total = new_stats()
+    rows = []
+    window_key, window = None, None
+    unwrapper = MillisUnwrapper()
+
+    for timestamps, currents in _chunks(path, chunksize, start_ms, end_ms):
+        timestamps = unwrapper.unwrap(timestamps)
+        currents = calibrator.apply(currents)
+        total.update_batch(currents, timestamps)
+        if not window_s:
+            continue
+
+        # Timestamps são crescentes: cada janela é um trecho contíguo do bloco
+        keys = timestamps // int(window_s * 1000)
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(keys)]):
+            key = int(keys[start])
+            if key != window_key:
+                if window is not None:
+                    rows.append(_row(path, window_key * window_s, window))
+                # o intervalo que cruza a fronteira entra na nova janela
+                fresh = new_stats()
+                window_key, window = key, fresh if window is None else fresh.continue_from(window)
+            window.update_batch(currents[start:end], timestamps[start:end])
+
+    if window is not None:
+        rows.append(_row(path, window_key * window_s, window))
+    if total.count:
+        rows.append(_row(path, "total", total))
+    return rows
+
+
+def analyze_files(paths, workers=None, **options):
+    """Analisa várias sessões em paralelo (um processo por sessão; segmentos são agrupados)."""
+    paths = [str(p) for p in unique_sessions(paths)]
+    job = partial(analyze_file, **options)
+    if workers == 1 or len(paths) <= 1:
+        results = map(job, paths)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(job, paths))
+    return [row for rows in results for row in rows]
@@ -0,0 +1,152 @@
+import multiprocessing
+import queue
+from src.drivers.calibration import ACS712Calibrator
+from src.core.shared_buffer import SharedSampleBuffer
+from src.core.metrics import METRICS
+
+STATUS_INTERVAL_S = 0.5
+
+
+def _replace_latest(channel, value):
+    """Canal de último valor (fila de tamanho 1): descarta o status anterior não lido."""
+    try:
+        channel.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        channel.put_nowait(value)
+    except queue.Full:   # o anterior ainda não saiu do buffer da fila; o próximo ciclo o substitui
+        pass
+
+
+def _acquisition_main(samples_name, options, calibration, reader_factory, stop_event, status,
+                      latest):
+    """Processo de aquisição: leitura, parsing, calibração e gravação."""
+    from src.core.app_controller import AppController
+
+    samples = SharedSampleBuffer.attach(samples_name, untrack=False)
+    try:
+        reader = reader_factory() if reader_factory else None
+        controller = AppController(reader=reader, samples=samples, **options)
+        controller.calibrator = ACS712Calibrator.from_dict(calibration)
+        controller.start()
+    except Exception as e:
+        status.put(("error", f"{type(e).__name__}: {e}"))
+        samples.close()
+        return
+    status.put(("started", str(controller.logger.path)))
+    while not stop_event.wait(STATUS_INTERVAL_S):
+        _replace_latest(latest, (controller.summarize(), controller.metrics()))
+    controller.stop()
+    status.put(("stopped", controller.summarize(), controller.metrics()))
+    samples.close()
+
+
+class ProcessController:
+    """
+    Executa o AppController em um processo separado, fora do GIL da interface.
+
+    As amostras calibradas são publicadas em um SharedSampleBuffer; `samples`
+    tem a mesma API do SampleBuffer (since/latest), sem pickle nem cópia.
+    Resumo e métricas são publicados a cada STATUS_INTERVAL_S em um canal de
+    último valor (fila de tamanho 1), que não cresce se a interface não o ler;
+    início, erro e fim chegam por uma fila separada. O processo
+    é criado com "spawn" (mesmo comportamento em Windows e Linux).
+    reader_factory (picklable) permite usar outra fonte, ex.: um dispositivo virtual.
+    """
+
+    START_TIMEOUT_S = 30.0
+
+    def __init__(self, port="COM6", baudrate=9600, sample_rate_hz=62.5, buffer_capacity=2 ** 18,
+                 output_dir="logs", rollup_db=None, reader_factory=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.sample_rate_hz = sample_rate_hz
+        self.buffer_capacity = buffer_capacity
+        self.output_dir = output_dir
+        self.rollup_db = rollup_db
+        self.reader_factory = reader_factory
+        self.calibrator = ACS712Calibrator()
+        self.samples = None
+        self.session_path = None
+        self._process = None
+        self._stop_event = None
+        self._status = None
+        self._latest = None
+        self._summary = {}
+        self._metrics = {}
+
+    def start(self):
+        """Cria o buffer compartilhado e inicia o processo de aquisição."""
+        ctx = multiprocessing.get_context("spawn")
+        if self.samples is not None:
+            self.samples.close()
+        self.samples = SharedSampleBuffer(self.buffer_capacity)
+        self._stop_event = ctx.Event()
+        self._status = ctx.Queue()
+        self._latest = ctx.Queue(maxsize=1)
+        options = {"port": self.port, "baudrate": self.baudrate,
+                   "sample_rate_hz": self.sample_rate_hz, "output_dir": str(self.output_dir),
+                   "rollup_db": self.rollup_db}
+        self._process = ctx.Process(
+            target=_acquisition_main, daemon=True, name="acquisition",
+            args=(self.samples.name, options, self.calibrator.to_dict(), self.reader_factory,
+                  self._stop_event, self._status, self._latest))
+        self._process.start()
+        try:
+            message = self._status.get(timeout=self.START_TIMEOUT_S)
+        except queue.Empty:
+            message = ("error", "acquisition process did not start")
+        if message[0] != "started":
+            self._process.join(timeout=2)
+            self._process = None
+            raise RuntimeError(message[1])
+        self.session_path = message[1]
+        METRICS.register_source("controller", self.metrics)
+        print(f"[CORE] Acquisition process started (pid {self._process.pid}).")
+
+    def stop(self):
+        """Encerra o processo; o buffer continua legível até o próximo start/close."""
+        if self._process is None:
+            return
+        self._stop_event.set()
+        try:
+            message = self._status.get(timeout=10)   # só "stopped": o status periódico vai por _latest
+            if message[0] == "stopped":
+                self._summary, self._metrics = message[1], message[2]
+        except queue.Empty:
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+        METRICS.unregister_source("controller")
+        print("[CORE] Acquisition process stopped.")
+
+    def _poll(self):
+        """Lê o último status publicado (após stop vale o resumo final)."""
+        if self._process is None:
+            return
+        try:
+            self._summary, self._metrics = self._latest.get_nowait()
+        except queue.Empty:
+            pass
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.is_alive()
+
+    def summarize(self):
+        """Último resumo publicado pelo processo (final, após stop)."""
+        self._poll()
+        return self._summary
+
+    def metrics(self):
+        self._poll()
+        return self._metrics
+
+    def close(self):
+        self.stop()
+        if self.samples is not None:
+            self.samples.close()
+            self.samples = None
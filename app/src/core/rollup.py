@@ -0,0 +1,280 @@
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from src.core import timebase
+from src.core.segments import SegmentReader, session_of
+
+RESOLUTIONS_S = (1, 60, 3600)
+
+ROLLUP_FIELDS = ["bucket_s", "count", "avg_mA", "rms_mA", "min_mA", "max_mA", "energy_Wh"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    device TEXT NOT NULL,
+    resolution_s INTEGER NOT NULL,
+    bucket_s INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    sum_mA REAL NOT NULL,
+    sumsq_mA2 REAL NOT NULL,
+    min_mA REAL NOT NULL,
+    max_mA REAL NOT NULL,
+    energy_wh REAL NOT NULL,
+    PRIMARY KEY (device, resolution_s, bucket_s)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    device TEXT NOT NULL,
+    start_s REAL NOT NULL
+);
+"""
+
+# Agregados parciais do mesmo bucket (ex.: bucket aberto entre dois flushes) são mesclados
+_UPSERT = """
+INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (device, resolution_s, bucket_s) DO UPDATE SET
+    count = count + excluded.count,
+    sum_mA = sum_mA + excluded.sum_mA,
+    sumsq_mA2 = sumsq_mA2 + excluded.sumsq_mA2,
+    min_mA = min(min_mA, excluded.min_mA),
+    max_mA = max(max_mA, excluded.max_mA),
+    energy_wh = energy_wh + excluded.energy_wh
+"""
+
+_QUERY = """
+SELECT bucket_s, SUM(count), SUM(sum_mA), SUM(sumsq_mA2), MIN(min_mA), MAX(max_mA), SUM(energy_wh)
+FROM rollups
+WHERE resolution_s = ? AND bucket_s >= ? AND bucket_s < ? {device}
+GROUP BY bucket_s ORDER BY bucket_s
+"""
+
+_SESSION_NAME = re.compile(r"^(?P<device>.+)_(?P<start>\d{8}_\d{6})$")
+
+
+def parse_session_name(path):
+    """
+    Extrai (dispositivo, início em epoch s) do nome de arquivo do DataLogger.
+    Segmentos (<nome>.0001.csv, .gz, .xz) são atribuídos à própria sessão.
+    """
+    match = _SESSION_NAME.match(session_of(path).stem)
+    if not match:
+        raise ValueError(f"not a DataLogger session file: {path}")
+    start = datetime.strptime(match["start"], "%Y%m%d_%H%M%S")
+    return match["device"], start.timestamp()
+
+
+class RollupStore:
+    """
+    Agregados por bucket de tempo (1 s, 1 min, 1 h) em SQLite.
+
+    Cada bucket guarda count, soma, soma dos quadrados, mínimo, máximo e
+    energia, de modo que média e RMS saem exatos e buckets parciais podem ser
+    mesclados (upsert). Os blocos são agregados com NumPy e acumulados em
+    memória; a gravação é feita em lote (executemany em uma transação) a cada
+    flush_interval_s. bucket_s é o início do bucket em tempo de parede (epoch),
+    obtido do início da sessão mais o deslocamento do timestamp do dispositivo
+    (com a virada do millis desfeita). A energia de cada intervalo entre
+    amostras (trapézio sobre o tempo real, lacunas excluídas) vai para o
+    bucket da amostra que o encerra.
+    """
+
+    def __init__(self, path, voltage_v=5.0, flush_interval_s=5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.voltage_v = voltage_v
+        self.flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._pending = {}
+        self._pending_sources = []
+        self._last_flush = time.monotonic()
+        self.device = None
+        self.sample_rate_hz = 62.5
+        self._wall0_ms = 0
+        self._ts0 = None
+        self._last = None
+        self._unwrapper = timebase.MillisUnwrapper()
+        self._start_s = None
+        self._importing = False
+
+    def open_session(self, device, start_s=None, sample_rate_hz=62.5, source=None):
+        """
+        Define o dispositivo e a referência de tempo dos próximos blocos.
+        source marca o arquivo como incorporado já na abertura (sessão ao vivo,
+        agregada à medida que é gravada); importações usam mark_source() no fim.
+        """
+        self.device = device
+        self.sample_rate_hz = sample_rate_hz
+        start_s = time.time() if start_s is None else start_s
+        self._start_s = start_s
+        self._wall0_ms = int(round(start_s * 1000))
+        self._ts0 = None
+        self._last = None
+        self._unwrapper.reset()
+        if source is not None:
+            self.mark_source(source)
+
+    def mark_source(self, path):
+        """Registra o arquivo da sessão aberta como incorporado (gravado no próximo flush)."""
+        with self._lock:
+            self._pending_sources.append((str(Path(path).resolve()), self.device, self._start_s))
+
+    @contextmanager
+    def importing(self):
+        """
+        Agrupa uma importação em uma única transação: os flushes periódicos
+        gravam sem commit, e o commit só ocorre no fim do bloco. Uma importação
+        interrompida é desfeita por inteiro e pode ser repetida do zero.
+        """
+        self._importing = True
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._importing = False
+                self._pending.clear()
+                self._pending_sources.clear()
+                self._conn.rollback()
+            raise
+        with self._lock:
+            self._importing = False
+            self._flush_locked()
+
+    def update_block(self, timestamps_ms, currents_mA):
+        """Agrega um bloco da sessão aberta (consumidor do AppController)."""
+        if len(timestamps_ms) == 0:
+            return
+        timestamps_ms = self._unwrapper.unwrap(timestamps_ms)
+        currents = np.asarray(currents_mA, dtype=np.float64)
+        if self._ts0 is None:
+            self._ts0 = int(timestamps_ms[0])
+        t, c = timestamps_ms, currents
+        if self._last is not None:
+            t, c = np.r_[self._last[0], t], np.r_[self._last[1], c]
+        charge, _ = timebase.interval_charge_mAs(t, c, timebase.default_max_gap_ms(self.sample_rate_hz))
+        if self._last is None:
+            charge = np.r_[0.0, charge]
+        self._last = (int(timestamps_ms[-1]), float(currents[-1]))
+        self.add(self.device, self._wall0_ms + (timestamps_ms - self._ts0), currents,
+                 self.sample_rate_hz, charge_mAs=charge)
+        if time.monotonic() - self._last_flush >= self.flush_interval_s:
+            self.flush()
+
+    def add(self, device, wall_ms, currents_mA, sample_rate_hz, charge_mAs=None):
+        """
+        Agrega amostras com tempo de parede em ms (crescente) em todas as resoluções.
+        charge_mAs (opcional) é a carga atribuída a cada amostra; sem ela, corrente / taxa.
+        """
+        wall_ms = np.asarray(wall_ms, dtype=np.int64)
+        currents = np.asarray(currents_mA, dtype=np.float64)
+        if len(currents) == 0:
+            return
+        if charge_mAs is None:
+            charge_mAs = currents / sample_rate_hz
+        energy = np.asarray(charge_mAs, dtype=np.float64) * (self.voltage_v / 1000.0 / 3600.0)
+        squares = currents * currents
+        with self._lock:
+            for resolution in RESOLUTIONS_S:
+                keys = wall_ms // (resolution * 1000)
+                starts = np.r_[0, np.flatnonzero(np.diff(keys)) + 1]
+                counts = np.diff(np.r_[starts, len(keys)])
+                sums = np.add.reduceat(currents, starts)
+                rows = zip((keys[starts] * resolution).tolist(), counts.tolist(), sums.tolist(),
+                           np.add.reduceat(squares, starts).tolist(),
+                           np.minimum.reduceat(currents, starts).tolist(),
+                           np.maximum.reduceat(currents, starts).tolist(),
+                           np.add.reduceat(energy, starts).tolist())
+                for bucket, n, s, sq, lo, hi, wh in rows:
+                    key = (device, resolution, bucket)
+                    acc = self._pending.get(key)
+                    if acc is None:
+                        self._pending[key] = [n, s, sq, lo, hi, wh]
+                    else:
+                        acc[0] += n
+                        acc[1] += s
+                        acc[2] += sq
+                        acc[3] = min(acc[3], lo)
+                        acc[4] = max(acc[4], hi)
+                        acc[5] += wh
+
+    def flush(self):
+        """Grava os agregados pendentes em uma única transação."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if self._pending or self._pending_sources:
+            rows = [(*key, *acc) for key, acc in self._pending.items()]
+            try:
+                self._conn.executemany(_UPSERT, rows)
+                self._conn.executemany("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                                       self._pending_sources)
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+        if not self._importing and self._conn.in_transaction:
+            self._conn.commit()
+        self._pending.clear()
+        self._pending_sources.clear()
+
+    def has_source(self, path):
+        """Indica se o arquivo de sessão já foi incorporado aos agregados."""
+        with self._lock:
+            self._flush_locked()
+            cur = self._conn.execute("SELECT 1 FROM sources WHERE path = ?",
+                                     (str(Path(path).resolve()),))
+            return cur.fetchone() is not None
+
+    def query(self, start_s, end_s, resolution_s=3600, device=None):
+        """
+        Retorna os buckets em [start_s, end_s) (epoch s) na resolução indicada,
+        somando os dispositivos quando device é None.
+        """
+        if resolution_s not in RESOLUTIONS_S:
+            raise ValueError(f"resolution_s must be one of {RESOLUTIONS_S}")
+        start_bucket = int(start_s // resolution_s) * resolution_s
+        params = [resolution_s, start_bucket, end_s]
+        sql = _QUERY.format(device="AND device = ?" if device is not None else "")
+        if device is not None:
+            params.append(device)
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(sql, params).fetchall()
+        return [{"bucket_s": bucket, "count": n, "avg_mA": s / n,
+                 "rms_mA": float(np.sqrt(sq / n)), "min_mA": lo, "max_mA": hi, "energy_Wh": wh}
+                for bucket, n, s, sq, lo, hi, wh in rows]
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+def backfill_file(store, path, sample_rate_hz=62.5, chunksize=200_000):
+    """
+    Incorpora uma sessão do DataLogger (.csv ou .ecm, inteira com todos os
+    segmentos; path pode ser qualquer um deles) aos agregados. Sessões já
+    incorporadas são ignoradas. Retorna o número de amostras lidas.
+    """
+    session = session_of(path)
+    if store.has_source(session):
+        return 0
+    device, start_s = parse_session_name(session)
+    reader = SegmentReader(session, chunksize)
+    if session.suffix == ".ecm":
+        sample_rate_hz = reader.metadata()["sample_rate_hz"]
+    store.open_session(device, start_s, sample_rate_hz)
+    total = 0
+    with store.importing():
+        for timestamps, currents in reader.iter_chunks():
+            store.update_block(timestamps, currents)
+            total += len(timestamps)
+        store.mark_source(session)   # só depois do último bloco, no mesmo commit
+    return total
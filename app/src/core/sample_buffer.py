@@ -0,0 +1,94 @@
+import numpy as np
+
+class SampleBuffer:
+    """
+    Buffer circular pré-alocado de timestamps (ms) e correntes corrigidas (mA).
+
+    Cada amostra é gravada em duas posições (i e i + capacity), de modo que
+    qualquer janela recente é contígua na memória e pode ser devolvida como
+    view, sem cópia. Amostras mais antigas que a capacidade são descartadas;
+    o histórico completo fica no arquivo gravado pelo DataLogger.
+
+    A posição de escrita e as janelas de leitura derivam só de `total`;
+    subclasses podem guardá-lo em outro lugar (ex.: SharedSampleBuffer, no
+    cabeçalho da memória compartilhada) sobrescrevendo o atributo com uma property.
+    """
+
+    def __init__(self, capacity: int = 2 ** 18):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._timestamps = np.zeros(2 * self.capacity, dtype=np.int64)
+        self._currents = np.zeros(2 * self.capacity, dtype=np.float64)
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp_ms: int, current_mA: float):
+        """Adiciona uma amostra em O(1)."""
+        i = self.total % self.capacity
+        self._timestamps[i] = self._timestamps[i + self.capacity] = timestamp_ms
+        self._currents[i] = self._currents[i + self.capacity] = current_mA
+        self.total += 1
+
+    def extend(self, timestamps_ms, currents_mA):
+        """Adiciona um bloco de amostras (arrays de mesmo tamanho)."""
+        n = len(timestamps_ms)
+        if n == 0:
+            return
+        timestamps_ms = np.asarray(timestamps_ms)[-self.capacity:]
+        currents_mA = np.asarray(currents_mA)[-self.capacity:]
+        m = len(timestamps_ms)
+        pos = 0
+        head = (self.total + n - m) % self.capacity   # amostras além da capacidade são puladas
+        while pos < m:
+            k = min(m - pos, self.capacity - head)
+            for offset in (head, head + self.capacity):
+                self._timestamps[offset:offset + k] = timestamps_ms[pos:pos + k]
+                self._currents[offset:offset + k] = currents_mA[pos:pos + k]
+            head = (head + k) % self.capacity
+            pos += k
+        # total só avança depois dos dados: um leitor que o lê uma vez vê blocos completos
+        self.total += n
+
+    def _window(self, total, n):
+        """Últimas n amostras até a sequência total (a posição final sai do próprio total)."""
+        n = max(0, min(n, total, self.capacity))
+        end = total % self.capacity + self.capacity
+        return self._timestamps[end - n:end], self._currents[end - n:end]
+
+    def latest(self, n: int = None):
+        """Retorna views (timestamps, currents) das últimas n amostras."""
+        total = self.total
+        return self._window(total, total if n is None else n)
+
+    def since(self, seq: int):
+        """
+        Retorna views (timestamps, currents) das amostras com índice >= seq
+        (contado desde o reset) e o novo seq a ser usado na próxima chamada.
+        Se o consumidor atrasou mais que a capacidade, recebe só as retidas.
+        Seguro com um escritor concorrente: total é lido uma única vez.
+        """
+        total = self.total
+        timestamps, currents = self._window(total, total - seq)
+        return timestamps, currents, total
+
+    def timestamps(self):
+        """View dos timestamps retidos, do mais antigo ao mais recente."""
+        return self.latest()[0]
+
+    def currents(self):
+        """View das correntes retidas, da mais antiga à mais recente."""
+        return self.latest()[1]
+
+    def last(self):
+        """Retorna a amostra mais recente (timestamp, corrente) ou None."""
+        total = self.total
+        if not total:
+            return None
+        i = (total - 1) % self.capacity + self.capacity
+        return int(self._timestamps[i]), float(self._currents[i])
+
+    def clear(self):
+        self.total = 0
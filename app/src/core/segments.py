@@ -0,0 +1,203 @@
+"""
+Sessões segmentadas do DataLogger.
+
+Com rotação, uma sessão <nome>.csv (ou .ecm) é gravada em segmentos:
+<nome>.csv, <nome>.0001.csv, <nome>.0002.csv, ... Segmentos fechados podem
+ser comprimidos (<segmento>.gz ou .xz) em segundo plano. SegmentReader lê a
+sessão inteira como um fluxo ordenado de blocos, comprimidos ou não, e as
+ferramentas offline usam session_of() para tratar qualquer segmento como a
+sessão a que pertence.
+"""
+import importlib
+import os
+import re
+import shutil
+from pathlib import Path
+import numpy as np
+from src.core.session_file import HEADER_SIZE, RECORD_DTYPE, parse_session_header
+
+# Módulos de compressão importados só quando usados
+COMPRESSORS = {"gzip": ".gz", "lzma": ".xz"}
+_MODULES = {".gz": "gzip", ".xz": "lzma"}
+_SEGMENT_NAME = re.compile(r"^(?P<stem>.+?)(?P<index>\.\d{4})?(?P<ext>\.(?:csv|ecm))(?:\.gz|\.xz)?$")
+
+
+def segment_path(session_path, index):
+    """Caminho do segmento index (o segmento 0 é o próprio arquivo da sessão)."""
+    session_path = Path(session_path)
+    if index == 0:
+        return session_path
+    return session_path.with_suffix(f".{index:04d}{session_path.suffix}")
+
+
+def session_of(path):
+    """Arquivo da sessão a que um segmento pertence (<nome>.0003.csv.gz -> <nome>.csv)."""
+    path = Path(path)
+    match = _SEGMENT_NAME.match(path.name)
+    if not match:
+        return path
+    session = path.with_name(match["stem"] + match["ext"])
+    if match["index"] and not any(session.with_name(session.name + ext).exists()
+                                  for ext in ("", *_MODULES)):
+        # ".NNNN" sem o segmento 0 ao lado faz parte do nome (não é um segmento)
+        return path.with_name(match["stem"] + match["index"] + match["ext"])
+    return session
+
+
+def unique_sessions(paths):
+    """Sessões distintas de uma lista de arquivos (ex.: um glob com vários segmentos), em ordem."""
+    return list(dict.fromkeys(session_of(p) for p in paths))
+
+
+def compress_file(path, method="gzip"):
+    """
+    Comprime um segmento fechado e remove o original.
+    O arquivo comprimido só aparece (rename atômico) depois de completo.
+    """
+    ext = COMPRESSORS[method]
+    path = Path(path)
+    target = path.with_name(path.name + ext)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(path, "rb") as src, importlib.import_module(method).open(tmp, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    os.replace(tmp, target)
+    path.unlink()
+    return target
+
+
+class SegmentCompressor:
+    """Comprime segmentos em um thread de fundo, fora do caminho de gravação."""
+
+    def __init__(self, method="gzip"):
+        if method not in COMPRESSORS:
+            raise ValueError(f"compression must be one of {sorted(COMPRESSORS)}")
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.method = method
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-compressor")
+        self._futures = []
+
+    def submit(self, path):
+        self._futures = [f for f in self._futures if not f.done()]
+        self._futures.append(self._pool.submit(self._compress, path))
+
+    def _compress(self, path):
+        try:
+            return compress_file(path, self.method)
+        except OSError as e:
+            print(f"[LOGGER] Compression failed for {path}: {e}")
+
+    def stop(self):
+        """Aguarda os segmentos pendentes."""
+        self._pool.shutdown(wait=True)
+
+
+def list_segments(session_path):
+    """Segmentos da sessão em ordem; a versão comprimida tem precedência."""
+    session_path = Path(session_path)
+    pattern = re.compile(rf"^{re.escape(session_path.stem)}(?:\.(\d{{4}}))?"
+                         rf"{re.escape(session_path.suffix)}(\.gz|\.xz)?$")
+    found = {}
+    for path in session_path.parent.glob(f"{session_path.stem}*"):
+        match = pattern.match(path.name)
+        if not match:
+            continue
+        index = int(match[1] or 0)
+        if index not in found or match[2]:
+            found[index] = path
+    return [found[i] for i in sorted(found)]
+
+
+def _is_binary(path):
+    return ".ecm" in Path(path).suffixes
+
+
+def open_segment(path):
+    """Abre um segmento para leitura binária, descomprimindo se preciso."""
+    module = _MODULES.get(Path(path).suffix)
+    return importlib.import_module(module).open(path, "rb") if module else open(path, "rb")
+
+
+def read_segment(path, chunk_size=200_000):
+    """Itera (timestamps int64, currents float64) de um segmento, comprimido ou não."""
+    if _is_binary(path):
+        with open_segment(path) as f:
+            f.read(HEADER_SIZE)
+            while True:
+                raw = f.read(chunk_size * RECORD_DTYPE.itemsize)
+                n = len(raw) // RECORD_DTYPE.itemsize
+                if n == 0:
+                    break
+                records = np.frombuffer(raw, dtype=RECORD_DTYPE, count=n)
+                yield (records["timestamp_ms"].astype(np.int64),
+                       records["current_mA"].astype(np.float64))
+        return
+
+    import pandas as pd
+
+    for chunk in pd.read_csv(path, chunksize=chunk_size,
+                             dtype={"timestamp_ms": np.int64, "current_mA": np.float64}):
+        yield chunk["timestamp_ms"].to_numpy(), chunk["current_mA"].to_numpy()
+
+
+class SegmentReader:
+    """
+    Lê uma sessão segmentada como um único fluxo ordenado de blocos.
+    Aceita o caminho da sessão ou de qualquer um de seus segmentos.
+    """
+
+    def __init__(self, session_path, chunk_size=200_000):
+        self.session_path = session_of(session_path)
+        self.chunk_size = chunk_size
+        self.segments = list_segments(self.session_path)
+        self._first_ts = {}
+
+    def __len__(self):
+        return len(self.segments)
+
+    @property
+    def rotated(self):
+        """Sessão com mais de um segmento ou com o primeiro já comprimido."""
+        return len(self.segments) > 1 or any(p.suffix in _MODULES for p in self.segments)
+
+    def metadata(self):
+        """Cabeçalho de uma sessão .ecm, lido do primeiro segmento."""
+        with open_segment(self.segments[0]) as f:
+            return parse_session_header(f.read(HEADER_SIZE), self.segments[0])
+
+    def first_timestamp(self, index):
+        """Primeiro timestamp de um segmento (lido uma vez e memorizado)."""
+        if index not in self._first_ts:
+            first = next(read_segment(self.segments[index], chunk_size=1), None)
+            self._first_ts[index] = int(first[0][0]) if first is not None else None
+        return self._first_ts[index]
+
+    def find_segment(self, timestamp_ms):
+        """Índice do segmento que contém timestamp_ms (busca binária pelos inícios)."""
+        lo, hi = 0, len(self.segments) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            first = self.first_timestamp(mid)
+            if first is not None and first <= timestamp_ms:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def iter_chunks(self, start_ms=None, end_ms=None):
+        """Itera blocos com timestamps em [start_ms, end_ms), a partir do segmento certo."""
+        first = self.find_segment(start_ms) if start_ms is not None and self.segments else 0
+        for path in self.segments[first:]:
+            for timestamps, currents in read_segment(path, self.chunk_size):
+                if end_ms is not None and timestamps[0] >= end_ms:
+                    return
+                if start_ms is not None or end_ms is not None:
+                    mask = np.ones(len(timestamps), dtype=bool)
+                    if start_ms is not None:
+                        mask &= timestamps >= start_ms
+                    if end_ms is not None:
+                        mask &= timestamps < end_ms
+                    if not mask.any():
+                        continue
+                    timestamps, currents = timestamps[mask], currents[mask]
+                yield timestamps, currents
@@ -0,0 +1,120 @@
+"""
+Formato binário de sessão (.ecm).
+
+Layout: cabeçalho fixo de 64 bytes seguido de registros de largura fixa
+(timestamp_ms int64, current_mA float32, little-endian). O arquivo pode ser
+estendido com simples appends e lido como numpy.memmap, sem carregar os
+dados em RAM.
+"""
+import struct
+import numpy as np
+from pathlib import Path
+
+MAGIC = b"ECMSESS1"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sHHddd")
+RECORD_DTYPE = np.dtype([("timestamp_ms", "<i8"), ("current_mA", "<f4")])
+
+
+def read_session_header(path):
+    """Lê e valida o cabeçalho, retornando os metadados da sessão."""
+    with open(path, "rb") as f:
+        return parse_session_header(f.read(HEADER_SIZE), path)
+
+
+def parse_session_header(raw, path="<session>"):
+    """Valida os bytes do cabeçalho (também vindos de um segmento comprimido)."""
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path}: truncated session header")
+    magic, version, header_size, sample_rate_hz, offset_mA, scale = _HEADER.unpack_from(raw)
+    if magic != MAGIC or header_size != HEADER_SIZE:
+        raise ValueError(f"{path}: not an energy monitor session file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported session version {version}")
+    return {"sample_rate_hz": sample_rate_hz, "offset_mA": offset_mA, "scale": scale}
+
+
+class SessionWriter:
+    """Grava amostras em um arquivo de sessão binário (cria ou continua)."""
+
+    def __init__(self, path, sample_rate_hz=62.5, offset_mA=0.0, scale=1.0):
+        self.path = Path(path)
+        if self.path.exists() and self.path.stat().st_size >= HEADER_SIZE:
+            self.metadata = read_session_header(self.path)
+            self.file = open(self.path, "ab")
+            # Descarta um registro parcial deixado por uma gravação interrompida
+            size = self.path.stat().st_size
+            self.file.truncate(size - (size - HEADER_SIZE) % RECORD_DTYPE.itemsize)
+        else:
+            self.metadata = {"sample_rate_hz": float(sample_rate_hz),
+                             "offset_mA": float(offset_mA), "scale": float(scale)}
+            self.file = open(self.path, "wb")
+            header = _HEADER.pack(MAGIC, VERSION, HEADER_SIZE, self.metadata["sample_rate_hz"],
+                                  self.metadata["offset_mA"], self.metadata["scale"])
+            self.file.write(header.ljust(HEADER_SIZE, b"\0"))
+
+    def append(self, timestamps_ms, currents_mA):
+        """Acrescenta um bloco de amostras."""
+        records = np.empty(len(timestamps_ms), dtype=RECORD_DTYPE)
+        records["timestamp_ms"] = timestamps_ms
+        records["current_mA"] = currents_mA
+        self.file.write(records.tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class SessionReader:
+    """Abre uma sessão binária como views numpy.memmap (somente leitura)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.metadata = read_session_header(self.path)
+        n = (self.path.stat().st_size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if n:
+            self.records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r",
+                                     offset=HEADER_SIZE, shape=(n,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp_ms"]
+
+    @property
+    def currents(self):
+        return self.records["current_mA"]
+
+    def iter_chunks(self, chunk_size=1 << 20):
+        """Itera (timestamps, currents) em blocos de tamanho fixo."""
+        for start in range(0, len(self.records), chunk_size):
+            chunk = self.records[start:start + chunk_size]
+            yield chunk["timestamp_ms"], chunk["current_mA"]
+
+
+def csv_to_session(csv_path, out_path=None, sample_rate_hz=62.5, offset_mA=0.0,
+                   scale=1.0, chunksize=1_000_000):
+    """Converte um CSV do DataLogger para o formato binário, em blocos."""
+    import pandas as pd
+
+    csv_path = Path(csv_path)
+    out_path = Path(out_path) if out_path else csv_path.with_suffix(".ecm")
+    if out_path.exists():
+        out_path.unlink()
+    writer = SessionWriter(out_path, sample_rate_hz, offset_mA, scale)
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize,
+                                 dtype={"timestamp_ms": np.int64, "current_mA": np.float32}):
+            writer.append(chunk["timestamp_ms"].to_numpy(), chunk["current_mA"].to_numpy())
+    finally:
+        writer.close()
+    return out_path
@@ -0,0 +1,213 @@
+"""
+Índice de tempo das sessões (<sessão>.idx).
+
+Arquivo binário com cabeçalho de 16 bytes (magic b"ECMIDX01", every_n
+uint32) seguido de checkpoints de largura fixa: timestamp_ms, offset em bytes
+da linha no CSV (sem compressão) e número da linha de dados. Há um checkpoint
+a cada every_n linhas. O DataLogger escreve o índice junto com o CSV e
+build_index() o reconstrói para arquivos antigos. Sessões .ecm têm registros
+de largura fixa e dispensam índice (busca binária direta no memmap).
+
+O índice é por arquivo: em um segmento .gz/.xz o seek ainda descomprime desde
+o início do segmento. Sessões rotacionadas são lidas pelas ferramentas
+offline via SegmentReader, que busca o segmento pelo primeiro timestamp.
+"""
+import io
+import json
+import struct
+from pathlib import Path
+import numpy as np
+
+INDEX_MAGIC = b"ECMIDX01"
+INDEX_HEADER_SIZE = 16
+DEFAULT_EVERY_N = 1000
+_INDEX_HEADER = struct.Struct("<8sI")
+INDEX_DTYPE = np.dtype([("timestamp_ms", "<i8"), ("offset", "<i8"), ("row", "<i8")])
+_READ_BYTES = 1 << 20
+
+
+def index_path(session_path):
+    """Índice de uma sessão ou segmento (o mesmo para a versão comprimida)."""
+    path = Path(session_path)
+    if path.suffix in (".gz", ".xz"):
+        path = path.with_suffix("")
+    return path.with_suffix(".idx")
+
+
+def checkpoint_rows(first_row, n, every_n):
+    """Linhas com checkpoint entre first_row e first_row + n."""
+    start = -(-first_row // every_n) * every_n
+    return np.arange(start, first_row + n, every_n, dtype=np.int64)
+
+
+class IndexWriter:
+    """Acrescenta checkpoints ao arquivo de índice durante a gravação."""
+
+    def __init__(self, path, every_n=DEFAULT_EVERY_N):
+        self.path = Path(path)
+        self.every_n = every_n
+        self.file = open(self.path, "wb")
+        self.file.write(_INDEX_HEADER.pack(INDEX_MAGIC, every_n).ljust(INDEX_HEADER_SIZE, b"\0"))
+
+    def add(self, timestamps_ms, offsets, rows):
+        records = np.empty(len(rows), dtype=INDEX_DTYPE)
+        records["timestamp_ms"] = timestamps_ms
+        records["offset"] = offsets
+        records["row"] = rows
+        self.file.write(records.tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def build_index(session_path, every_n=DEFAULT_EVERY_N):
+    """Reconstrói o índice de um CSV (comprimido ou não) lendo-o uma vez em blocos."""
+    from src.core.segments import open_segment
+
+    writer = IndexWriter(index_path(session_path), every_n)
+    line, base, carry = 0, 0, b""   # line 0 é o cabeçalho
+    with open_segment(session_path) as f:
+        while True:
+            data = f.read(_READ_BYTES)
+            buf = carry + data
+            if not data:
+                # última linha sem quebra de linha no fim do arquivo
+                nl = np.array([len(buf)]) if buf.strip() else np.empty(0, dtype=np.int64)
+            else:
+                nl = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 10)
+            if len(nl):
+                starts = np.r_[0, nl[:-1] + 1]
+                rows = np.arange(line, line + len(nl)) - 1
+                keep = (rows >= 0) & (rows % every_n == 0)
+                if keep.any():
+                    offsets = starts[keep]
+                    timestamps = [int(buf[s:buf.index(b",", s)]) for s in offsets.tolist()]
+                    writer.add(timestamps, base + offsets, rows[keep])
+                line += len(nl)
+                consumed = int(nl[-1]) + 1
+                base += consumed
+                carry = buf[consumed:]
+            else:
+                carry = buf
+            if not data:
+                break
+    writer.close()
+    return writer.path
+
+
+class SessionIndex:
+    """
+    Consulta por intervalo de tempo em uma sessão gravada.
+    A posição inicial é achada por busca binária nos checkpoints (memmap) e
+    só as linhas do intervalo são lidas e convertidas.
+    """
+
+    def __init__(self, session_path, build=True, every_n=DEFAULT_EVERY_N):
+        self.session_path = Path(session_path)
+        self.binary = ".ecm" in self.session_path.suffixes
+        self.path = None if self.binary else index_path(self.session_path)
+        self.every_n = None
+        self.checkpoints = np.empty(0, dtype=INDEX_DTYPE)
+        if self.binary:
+            return
+        if not self.path.exists():
+            if not build:
+                raise FileNotFoundError(self.path)
+            build_index(self.session_path, every_n)
+        with open(self.path, "rb") as f:
+            magic, self.every_n = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{self.path}: not a session index")
+        n = (self.path.stat().st_size - INDEX_HEADER_SIZE) // INDEX_DTYPE.itemsize
+        if n:
+            self.checkpoints = np.memmap(self.path, dtype=INDEX_DTYPE, mode="r",
+                                         offset=INDEX_HEADER_SIZE, shape=(n,))
+
+    @property
+    def metadata(self):
+        """Resumo do índice e, se houver, a calibração salva ao lado da sessão."""
+        meta = {"every_n": self.every_n, "checkpoints": len(self.checkpoints)}
+        if len(self.checkpoints):
+            meta["first_timestamp_ms"] = int(self.checkpoints["timestamp_ms"][0])
+            meta["last_checkpoint_row"] = int(self.checkpoints["row"][-1])
+        calibration = self.session_path.with_suffix(".calibration.json")
+        if self.binary:
+            from src.core.session_file import read_session_header
+
+            meta.update(read_session_header(self.session_path))
+        elif calibration.exists():
+            meta["calibration"] = json.loads(calibration.read_text())
+        return meta
+
+    def locate(self, timestamp_ms):
+        """Offset do último checkpoint anterior a timestamp_ms (ou do início dos dados)."""
+        if not len(self.checkpoints):
+            return None
+        i = int(np.searchsorted(self.checkpoints["timestamp_ms"], timestamp_ms, side="left")) - 1
+        return int(self.checkpoints["offset"][max(i, 0)])
+
+    def read_range(self, start_ms=None, end_ms=None, chunk_size=100_000):
+        """Itera (timestamps, currents) com timestamps em [start_ms, end_ms)."""
+        if self.binary:
+            yield from self._read_binary(start_ms, end_ms, chunk_size)
+            return
+        offset = self.locate(start_ms if start_ms is not None else -2 ** 62)
+        if offset is None:
+            return
+        import pandas as pd
+        from src.core.segments import open_segment
+
+        with open_segment(self.session_path) as f:
+            f.seek(offset)
+            carry = b""
+            while True:
+                data = f.read(_READ_BYTES)
+                buf = carry + data
+                cut = len(buf) if not data else buf.rfind(b"\n") + 1
+                carry = buf[cut:]
+                if cut:
+                    chunk = pd.read_csv(io.BytesIO(buf[:cut]), header=None,
+                                        names=["timestamp_ms", "current_mA"],
+                                        dtype={"timestamp_ms": np.int64, "current_mA": np.float64})
+                    timestamps = chunk["timestamp_ms"].to_numpy()
+                    currents = chunk["current_mA"].to_numpy()
+                    lo = 0 if start_ms is None else np.searchsorted(timestamps, start_ms, "left")
+                    hi = (len(timestamps) if end_ms is None
+                          else np.searchsorted(timestamps, end_ms, "left"))
+                    for i in range(lo, hi, chunk_size):
+                        j = min(i + chunk_size, hi)
+                        yield timestamps[i:j], currents[i:j]
+                    if hi < len(timestamps):
+                        return
+                if not data:
+                    return
+
+    def _read_binary(self, start_ms, end_ms, chunk_size):
+        from src.core.session_file import SessionReader
+
+        reader = SessionReader(self.session_path)
+        timestamps, currents = reader.timestamps, reader.currents
+        lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, "left"))
+        hi = len(timestamps) if end_ms is None else int(np.searchsorted(timestamps, end_ms, "left"))
+        for i in range(lo, hi, chunk_size):
+            j = min(i + chunk_size, hi)
+            yield (np.asarray(timestamps[i:j], dtype=np.int64),
+                   np.asarray(currents[i:j], dtype=np.float64))
+
+
+def read_range(session_path, start_ms=None, end_ms=None, chunk_size=100_000):
+    """Atalho: itera um intervalo de uma sessão, criando o índice se faltar."""
+    yield from SessionIndex(session_path).read_range(start_ms, end_ms, chunk_size)
+
+
+def load_range(session_path, start_ms=None, end_ms=None):
+    """Carrega um intervalo inteiro como dois arrays (timestamps, currents)."""
+    chunks = list(read_range(session_path, start_ms, end_ms))
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    return np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])
@@ -0,0 +1,82 @@
+import sys
+import numpy as np
+from multiprocessing import shared_memory
+from src.core.sample_buffer import SampleBuffer
+
+_HEADER_SLOTS = 8   # [0] total publicado, [1] capacidade; demais reservados
+
+
+class SharedSampleBuffer(SampleBuffer):
+    """
+    SampleBuffer em multiprocessing.shared_memory, para um escritor e vários leitores.
+
+    O layout é o mesmo do SampleBuffer (cópia espelhada, janelas contíguas),
+    precedido de um cabeçalho int64 com o contador de sequência `total`. O
+    escritor grava as amostras e só depois publica o novo total, então um
+    leitor que lê o total uma vez vê sempre um bloco completo. since()/latest()
+    devolvem views da memória compartilhada, sem cópia nem pickle; uma janela
+    de n amostras continua válida até o escritor avançar capacity - n amostras.
+    """
+
+    def __init__(self, capacity: int = 2 ** 18, name: str = None, untrack: bool = True):
+        if name is None:
+            if capacity <= 0:
+                raise ValueError("capacity must be positive")
+            size = 8 * (_HEADER_SLOTS + 4 * int(capacity))
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+            if untrack:
+                _untrack(self._shm)
+        self._header = np.ndarray(_HEADER_SLOTS, dtype=np.int64, buffer=self._shm.buf)
+        if self.owner:
+            self._header[:] = 0
+            self._header[1] = capacity
+        self.capacity = int(self._header[1])
+        offset = 8 * _HEADER_SLOTS
+        self._timestamps = np.ndarray(2 * self.capacity, dtype=np.int64,
+                                      buffer=self._shm.buf, offset=offset)
+        self._currents = np.ndarray(2 * self.capacity, dtype=np.float64, buffer=self._shm.buf,
+                                    offset=offset + 16 * self.capacity)
+
+    @classmethod
+    def attach(cls, name: str, untrack: bool = True):
+        """
+        Abre, em outro processo, um buffer criado pelo dono.
+        Processos filhos do dono (multiprocessing) compartilham o resource_tracker
+        dele e devem usar untrack=False.
+        """
+        return cls(name=name, untrack=untrack)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def total(self):
+        return int(self._header[0])
+
+    @total.setter
+    def total(self, value):
+        # SampleBuffer só publica o total depois de gravar os dados
+        self._header[0] = value
+
+    def close(self):
+        """Libera as views; o dono também remove o segmento de memória."""
+        self._header = self._timestamps = self._currents = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+def _untrack(shm):
+    """
+    Em POSIX (Python < 3.13) quem apenas anexa o segmento também o registra no
+    resource_tracker, que o removeria ao fim do processo leitor/escritor.
+    """
+    if sys.platform != "win32":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
@@ -0,0 +1,119 @@
+import numpy as np
+
+class SpectralAnalyzer:
+    """
+    Análise espectral e de qualidade de energia em janelas deslizantes.
+
+    Mantém um anel pré-alocado com as últimas window_size amostras e, a cada
+    hop amostras novas, calcula sobre a janela (Hann) RMS, pico, fator de
+    crista, frequência dominante, amplitudes harmônicas e THD. Bins fixos
+    (bins_hz) são avaliados por correlação com uma base DFT pré-calculada
+    (equivalente ao Goertzel), sem FFT completa. Os resultados ficam em
+    `latest` e são enviados ao callback, em cadência fixa de hop amostras.
+    No AppController é opcional (spectral=True; --spectral no modo headless).
+    """
+
+    def __init__(self, sample_rate_hz=62.5, window_size=256, hop=64, fundamental_hz=None,
+                 harmonics=5, bins_hz=(), callback=None):
+        if not 0 < hop <= window_size:
+            raise ValueError("hop must be in 1..window_size")
+        self.sample_rate_hz = sample_rate_hz
+        self.window_size = window_size
+        self.hop = hop
+        self.fundamental_hz = fundamental_hz
+        self.harmonics = harmonics
+        self.bins_hz = tuple(bins_hz)
+        self.callback = callback
+        self.latest = None
+        self.published = 0
+
+        n = np.arange(window_size)
+        self._window = np.hanning(window_size)
+        self._amp_norm = 2.0 / self._window.sum()
+        self._freqs = np.fft.rfftfreq(window_size, 1.0 / sample_rate_hz)
+        self._ring = np.zeros(window_size)
+        self._frame = np.empty(window_size)
+        self._head = 0
+        self._filled = 0
+        self._pending = 0
+        # Base DFT (janelada) para os bins fixos: uma linha por frequência
+        freqs = np.asarray(self.bins_hz, dtype=np.float64)
+        self._basis = (np.exp(-2j * np.pi * np.outer(freqs, n) / sample_rate_hz)
+                       * self._window)
+
+    def update_block(self, timestamps_ms, currents_mA):
+        """Consome um bloco do fluxo do AppController."""
+        self.update(currents_mA)
+
+    def update(self, currents_mA):
+        """Adiciona amostras e publica um resultado a cada hop amostras."""
+        data = np.asarray(currents_mA, dtype=np.float64)
+        pos = 0
+        while pos < len(data):
+            k = min(len(data) - pos, self.hop - self._pending)
+            self._write(data[pos:pos + k])
+            pos += k
+            self._pending += k
+            if self._pending == self.hop:
+                self._pending = 0
+                if self._filled == self.window_size:
+                    self._publish(self.analyze())
+
+    def _write(self, values):
+        values = values[-self.window_size:]
+        i = self._head
+        first = min(len(values), self.window_size - i)
+        self._ring[i:i + first] = values[:first]
+        self._ring[:len(values) - first] = values[first:]
+        self._head = (i + len(values)) % self.window_size
+        self._filled = min(self._filled + len(values), self.window_size)
+
+    def analyze(self):
+        """Calcula as métricas da janela atual (da amostra mais antiga à mais recente)."""
+        frame = self._frame
+        tail = self.window_size - self._head
+        frame[:tail] = self._ring[self._head:]
+        frame[tail:] = self._ring[:self._head]
+
+        dc = float(frame.mean())
+        rms = float(np.sqrt(np.dot(frame, frame) / self.window_size))
+        peak = float(np.abs(frame).max())
+        ac = (frame - dc) * self._window
+        spectrum = np.abs(np.fft.rfft(ac)) * self._amp_norm
+
+        dominant = int(np.argmax(spectrum[1:])) + 1
+        fundamental_hz = self.fundamental_hz or float(self._freqs[dominant])
+        resolution = self._freqs[1]
+        harmonics = []
+        for h in range(1, self.harmonics + 1):
+            idx = int(round(h * fundamental_hz / resolution))
+            if idx >= len(spectrum):
+                break
+            harmonics.append(float(spectrum[idx]))
+        thd = (float(np.sqrt(np.sum(np.square(harmonics[1:]))) / harmonics[0])
+               if len(harmonics) > 1 and harmonics[0] > 0 else 0.0)
+        bins = np.abs(self._basis @ (frame - dc)) * self._amp_norm if self.bins_hz else []
+
+        return {
+            "dc_mA": dc,
+            "rms_mA": rms,
+            "peak_mA": peak,
+            "crest_factor": peak / rms if rms else 0.0,
+            "dominant_hz": float(self._freqs[dominant]),
+            "fundamental_hz": fundamental_hz,
+            "harmonics_mA": harmonics,
+            "thd": thd,
+            "bins_mA": dict(zip(self.bins_hz, map(float, bins))),
+        }
+
+    def _publish(self, result):
+        self.latest = result
+        self.published += 1
+        if self.callback:
+            self.callback(result)
+
+    def reset(self):
+        self._ring[:] = 0.0
+        self._head = self._filled = self._pending = 0
+        self.latest = None
+        self.published = 0
@@ -0,0 +1,203 @@
+"""
+Servidor local de streaming das amostras ao vivo.
+
+Protocolo (little-endian): cada mensagem tem um cabeçalho de 7 bytes
+(magic b"EM", tipo uint8, tamanho do payload uint32) seguido do payload.
+  MSG_SAMPLES: registros de 12 bytes (timestamp_ms int64, current_mA float32),
+               o mesmo RECORD_DTYPE do formato de sessão .ecm.
+  MSG_STATS:   JSON UTF-8 com o resumo da sessão (summarize()).
+"""
+import asyncio
+import json
+import socket
+import struct
+import threading
+import numpy as np
+from src.core.session_file import RECORD_DTYPE
+
+MAGIC = b"EM"
+MSG_SAMPLES = 1
+MSG_STATS = 2
+_HEADER = struct.Struct("<2sBI")
+
+
+def encode_message(kind, payload):
+    return _HEADER.pack(MAGIC, kind, len(payload)) + payload
+
+
+def encode_samples(timestamps_ms, currents_mA):
+    records = np.empty(len(timestamps_ms), dtype=RECORD_DTYPE)
+    records["timestamp_ms"] = timestamps_ms
+    records["current_mA"] = currents_mA
+    return encode_message(MSG_SAMPLES, records.tobytes())
+
+
+def decode_payload(kind, payload):
+    """Converte um payload em ("samples", timestamps, currents) ou ("stats", dict)."""
+    if kind == MSG_SAMPLES:
+        records = np.frombuffer(payload, dtype=RECORD_DTYPE)
+        return "samples", records["timestamp_ms"], records["current_mA"]
+    if kind == MSG_STATS:
+        return "stats", json.loads(payload)
+    raise ValueError(f"unknown message type {kind}")
+
+
+class StreamServer:
+    """
+    Publica blocos de amostras e estatísticas periódicas para vários clientes.
+
+    O servidor asyncio (TCP ou socket Unix) roda em um thread próprio; o
+    AppController o alimenta como consumidor (update_block), que apenas
+    codifica o bloco uma vez e o entrega ao loop. Cada cliente tem um limite
+    de bytes pendentes (max_client_bytes): acima dele, slow_policy="skip"
+    descarta blocos só para esse cliente (subamostragem) e slow_policy="drop"
+    desconecta o cliente. A aquisição nunca espera por um cliente lento.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, unix_path=None, stats_source=None,
+                 stats_interval_s=1.0, max_client_bytes=1 << 20, slow_policy="skip"):
+        if slow_policy not in ("skip", "drop"):
+            raise ValueError("slow_policy must be 'skip' or 'drop'")
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.stats_source = stats_source
+        self.stats_interval_s = stats_interval_s
+        self.max_client_bytes = max_client_bytes
+        self.slow_policy = slow_policy
+        self.address = None
+        self.clients = set()
+        self.skipped_blocks = 0
+        self.dropped_clients = 0
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._ready = threading.Event()
+        self._error = None
+
+    def start(self):
+        """Inicia o loop asyncio em segundo plano e aguarda o socket estar aberto."""
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="stream-server")
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+        print(f"[STREAM] Serving on {self.address}")
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._open())
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            self._loop.close()
+            return
+        self._ready.set()
+        stats_task = self._loop.create_task(self._stats_loop())
+        self._loop.run_forever()
+        stats_task.cancel()
+        self._loop.run_until_complete(self._close())
+        self._loop.close()
+
+    async def _open(self):
+        if self.unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.unix_path)
+            self.address = str(self.unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def _handle_client(self, reader, writer):
+        self.clients.add(writer)
+        try:
+            await reader.read()   # clientes só recebem; EOF encerra
+        except ConnectionError:
+            pass
+        finally:
+            self._drop(writer)
+
+    def _drop(self, writer):
+        if writer in self.clients:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def _stats_loop(self):
+        while True:
+            await asyncio.sleep(self.stats_interval_s)
+            if self.stats_source and self.clients:
+                payload = json.dumps(self.stats_source()).encode()
+                self._broadcast(encode_message(MSG_STATS, payload), droppable=False)
+
+    def _broadcast(self, message, droppable=True):
+        for writer in list(self.clients):
+            if writer.transport.get_write_buffer_size() > self.max_client_bytes:
+                if self.slow_policy == "drop":
+                    self.dropped_clients += 1
+                    self._drop(writer)
+                    continue
+                if droppable:
+                    self.skipped_blocks += 1
+                    continue
+            writer.write(message)
+
+    async def _close(self):
+        for writer in list(self.clients):
+            self._drop(writer)
+        self._server.close()
+        await self._server.wait_closed()
+
+    def update_block(self, timestamps_ms, currents_mA):
+        """Publica um bloco (chamado pelo thread de processamento)."""
+        if self._loop is None or not self.clients:
+            return
+        message = encode_samples(timestamps_ms, currents_mA)
+        self._loop.call_soon_threadsafe(self._broadcast, message)
+
+    def metrics(self):
+        return {"clients": len(self.clients), "skipped_blocks": self.skipped_blocks,
+                "dropped_clients": self.dropped_clients}
+
+    def stop(self):
+        if self._loop is None or self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+        self._loop = None
+        print("[STREAM] Server stopped.")
+
+
+class StreamSubscriber:
+    """Cliente síncrono simples (bloqueante) para ferramentas e testes."""
+
+    def __init__(self, address, timeout=5.0):
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(address)
+        self._buf = bytearray()
+
+    def _read_exact(self, n):
+        while len(self._buf) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._buf)))
+            if not chunk:
+                raise ConnectionError("stream closed")
+            self._buf += chunk
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        return data
+
+    def recv(self):
+        """Próxima mensagem: ("samples", timestamps, currents) ou ("stats", dict)."""
+        magic, kind, size = _HEADER.unpack(self._read_exact(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("bad stream header")
+        return decode_payload(kind, self._read_exact(size))
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,133 @@
+"""
+Base de tempo das amostras a partir dos timestamps do dispositivo.
+
+O firmware envia millis() (uint32, volta a zero a cada ~49,7 dias) e amostra
+a cada 16 ms (62,5 Hz). As funções abaixo trabalham sobre arrays inteiros,
+sem laços em Python: desfazem a virada do contador, medem período e jitter,
+localizam lacunas, reamostram em grade uniforme e integram carga/energia
+pela regra dos trapézios sobre o tempo real, ignorando os intervalos de lacuna.
+"""
+import numpy as np
+
+MILLIS_PERIOD = 1 << 32
+GAP_FACTOR = 4   # intervalo maior que GAP_FACTOR períodos nominais é lacuna
+
+
+def unwrap_millis(timestamps_ms, period=MILLIS_PERIOD):
+    """Desfaz as viradas do contador (saltos para trás de mais de meio período)."""
+    t = np.asarray(timestamps_ms, dtype=np.int64)
+    if len(t) < 2:
+        return t.copy()
+    wraps = np.cumsum(np.diff(t) < -(period // 2))
+    return t + period * np.r_[0, wraps]
+
+
+class MillisUnwrapper:
+    """unwrap_millis incremental, para blocos consecutivos de um mesmo fluxo."""
+
+    def __init__(self, period=MILLIS_PERIOD):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self._last = None
+        self._offset = 0
+
+    def unwrap(self, timestamps_ms):
+        t = np.asarray(timestamps_ms, dtype=np.int64)
+        if not len(t):
+            return t
+        prev = t[:1] if self._last is None else [self._last]
+        wraps = self._offset + np.cumsum(np.diff(t, prepend=prev) < -(self.period // 2))
+        self._last = int(t[-1])
+        self._offset = int(wraps[-1])
+        return t + self.period * wraps
+
+
+def default_max_gap_ms(sample_rate_hz):
+    return GAP_FACTOR * 1000.0 / sample_rate_hz
+
+
+def nominal_period_ms(timestamps_ms):
+    """Período típico (mediana dos intervalos positivos)."""
+    dt = np.diff(np.asarray(timestamps_ms, dtype=np.int64))
+    dt = dt[dt > 0]
+    return float(np.median(dt)) if len(dt) else 0.0
+
+
+def find_gaps(timestamps_ms, max_gap_ms):
+    """
+    Índices i em que o intervalo t[i] -> t[i+1] é uma lacuna (maior que
+    max_gap_ms, ou não positivo, como após um reset do dispositivo) e a duração.
+    """
+    dt = np.diff(np.asarray(timestamps_ms, dtype=np.int64))
+    idx = np.flatnonzero((dt > max_gap_ms) | (dt <= 0))
+    return idx, dt[idx]
+
+
+def timing_report(timestamps_ms, max_gap_ms=None):
+    """Período, taxa efetiva, jitter e lacunas de um trecho de timestamps."""
+    t = unwrap_millis(timestamps_ms)
+    period = nominal_period_ms(t)
+    if not period:
+        return {"samples": len(t), "period_ms": 0.0, "rate_hz": 0.0, "jitter_std_ms": 0.0,
+                "jitter_max_ms": 0.0, "gaps": 0, "gap_s": 0.0}
+    max_gap_ms = max_gap_ms or GAP_FACTOR * period
+    dt = np.diff(t)
+    gap_idx, gap_dt = find_gaps(t, max_gap_ms)
+    ok = np.ones(len(dt), dtype=bool)
+    ok[gap_idx] = False
+    dev = dt[ok] - period
+    return {
+        "samples": len(t),
+        "period_ms": period,
+        "rate_hz": 1000.0 / float(dt[ok].mean()) if ok.any() else 0.0,
+        "jitter_std_ms": float(dev.std()) if len(dev) else 0.0,
+        "jitter_max_ms": float(np.abs(dev).max()) if len(dev) else 0.0,
+        "gaps": len(gap_idx),
+        "gap_s": float(gap_dt[gap_dt > 0].sum()) / 1000.0,
+    }
+
+
+def resample_uniform(timestamps_ms, values, period_ms=None, max_gap_ms=None):
+    """
+    Interpola os valores em uma grade uniforme (período nominal por padrão).
+    Pontos da grade que caem dentro de lacunas recebem NaN.
+    """
+    t = unwrap_millis(timestamps_ms)
+    v = np.asarray(values, dtype=np.float64)
+    if len(t) < 2:
+        return t.astype(np.float64), v.copy()
+    period_ms = period_ms or nominal_period_ms(t)
+    max_gap_ms = max_gap_ms or GAP_FACTOR * period_ms
+    grid = np.arange(t[0], t[-1] + period_ms / 2, period_ms, dtype=np.float64)
+    out = np.interp(grid, t, v)
+    gap_idx, _ = find_gaps(t, max_gap_ms)
+    if len(gap_idx):
+        left = np.searchsorted(t, grid, side="right") - 1
+        in_gap = np.zeros(len(t), dtype=bool)
+        in_gap[gap_idx] = True
+        out[in_gap[left] & (grid > t[left])] = np.nan
+    return grid, out
+
+
+def interval_charge_mAs(timestamps_ms, currents_mA, max_gap_ms):
+    """
+    Carga (mA·s) de cada intervalo t[i] -> t[i+1] pela regra dos trapézios;
+    intervalos de lacuna valem zero. Retorna (carga por intervalo, duração em s).
+    """
+    t = np.asarray(timestamps_ms, dtype=np.int64)
+    c = np.asarray(currents_mA, dtype=np.float64)
+    dt_s = np.diff(t) / 1000.0
+    dt_s[(dt_s * 1000.0 > max_gap_ms) | (dt_s <= 0)] = 0.0
+    return 0.5 * (c[:-1] + c[1:]) * dt_s, dt_s
+
+
+def integrate_energy_wh(timestamps_ms, currents_mA, voltage_v=5.0, max_gap_ms=None):
+    """Energia (Wh) integrada sobre a base de tempo real, sem contar as lacunas."""
+    t = unwrap_millis(timestamps_ms)
+    if len(t) < 2:
+        return 0.0
+    max_gap_ms = max_gap_ms or GAP_FACTOR * nominal_period_ms(t)
+    charge, _ = interval_charge_mAs(t, currents_mA, max_gap_ms)
+    return float(charge.sum()) * voltage_v / 1000.0 / 3600.0
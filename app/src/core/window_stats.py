@@ -0,0 +1,146 @@
+import threading
+from collections import deque
+import numpy as np
+from src.core.timebase import MillisUnwrapper
+
+HORIZONS_S = (1, 10, 60, 900)
+
+WINDOW_FIELDS = ["horizon_s", "count", "span_s", "avg_mA", "rms_mA", "min_mA", "max_mA"]
+
+
+class SlidingWindowStats:
+    """
+    Média, RMS, mínimo e máximo dos últimos 1 s / 10 s / 1 min / 15 min.
+
+    Todos os horizontes são mantidos ao mesmo tempo sobre o relógio do
+    dispositivo: a janela de h segundos cobre (t_último - h, t_último].
+    Somas e somas dos quadrados vêm de somas prefixadas guardadas em um anel
+    (soma da janela = total - prefixo no início da janela), e mínimo/máximo de
+    uma deque monotônica por horizonte. Cada amostra custa O(1) amortizado
+    por horizonte, e a consulta (window/snapshot) é O(1), sem varrer o
+    histórico. Um salto para trás nos timestamps (reset do dispositivo)
+    reinicia as janelas.
+    """
+
+    def __init__(self, horizons_s=HORIZONS_S, sample_rate_hz=62.5):
+        self.horizons_s = tuple(sorted(horizons_s))
+        self.sample_rate_hz = sample_rate_hz
+        self._lock = threading.Lock()
+        self._unwrapper = MillisUnwrapper()
+        # capacidade inicial para o maior horizonte; o anel cresce se a taxa real for maior
+        capacity = 1 << int(np.ceil(np.log2(self.horizons_s[-1] * sample_rate_hz * 1.25 + 1)))
+        self._t = np.zeros(capacity, dtype=np.int64)
+        self._cum = np.zeros(capacity, dtype=np.float64)     # soma antes da amostra i
+        self._cumsq = np.zeros(capacity, dtype=np.float64)
+        self._starts = {h: 0 for h in self.horizons_s}     # índice absoluto do início da janela
+        self._max = {h: deque() for h in self.horizons_s}  # (índice, valor) decrescentes
+        self._min = {h: deque() for h in self.horizons_s}  # (índice, valor) crescentes
+        self._restart()
+
+    def reset(self):
+        with self._lock:
+            self._unwrapper.reset()
+            self._restart()
+
+    def update(self, timestamp_ms, current_mA):
+        self.update_block([timestamp_ms], [current_mA])
+
+    def update_block(self, timestamps_ms, currents_mA):
+        """Acrescenta um bloco (consumidor do AppController)."""
+        if len(timestamps_ms) == 0:
+            return
+        with self._lock:
+            t = self._unwrapper.unwrap(timestamps_ms)
+            c = np.asarray(currents_mA, dtype=np.float64)
+            last = self._t[(self.count - 1) & (len(self._t) - 1)] if self.count else t[0]
+            back = np.flatnonzero(np.diff(t, prepend=last) < 0)
+            if len(back):
+                self._restart()
+                t, c = t[back[-1]:], c[back[-1]:]
+            self._append(t, c)
+            self._advance(int(t[-1]))
+
+    def _restart(self):
+        self.count = 0                     # índice absoluto da próxima amostra
+        self._sum = self._sumsq = 0.0
+        for h in self.horizons_s:
+            self._starts[h] = 0
+            self._max[h].clear()
+            self._min[h].clear()
+
+    def _append(self, t, c):
+        n = len(c)
+        needed = self.count - self._starts[self.horizons_s[-1]] + n
+        if needed > len(self._t):
+            self._grow(needed)
+        mask = len(self._t) - 1
+        idx = np.arange(self.count, self.count + n) & mask
+        cum = np.cumsum(c)
+        cumsq = np.cumsum(c * c)
+        self._t[idx] = t
+        self._cum[idx] = self._sum + cum - c
+        self._cumsq[idx] = self._sumsq + cumsq - c * c
+        self._sum += float(cum[-1])
+        self._sumsq += float(cumsq[-1])
+
+        first = self.count
+        self.count += n
+        values = c.tolist()
+        for h in self.horizons_s:
+            highs, lows = self._max[h], self._min[h]
+            for i, v in enumerate(values, first):
+                while highs and highs[-1][1] <= v:
+                    highs.pop()
+                highs.append((i, v))
+                while lows and lows[-1][1] >= v:
+                    lows.pop()
+                lows.append((i, v))
+
+    def _grow(self, needed):
+        old = len(self._t)
+        new = 1 << int(np.ceil(np.log2(needed)))
+        live = np.arange(self._starts[self.horizons_s[-1]], self.count)
+        for name in ("_t", "_cum", "_cumsq"):
+            arr = getattr(self, name)
+            grown = np.zeros(new, dtype=arr.dtype)
+            grown[live & (new - 1)] = arr[live & (old - 1)]
+            setattr(self, name, grown)
+
+    def _advance(self, now_ms):
+        mask = len(self._t) - 1
+        for h in self.horizons_s:
+            cutoff = now_ms - h * 1000
+            start = self._starts[h]
+            while self._t[start & mask] <= cutoff:
+                start += 1
+            self._starts[h] = start
+            for q in (self._max[h], self._min[h]):
+                while q[0][0] < start:
+                    q.popleft()
+
+    def window(self, horizon_s):
+        """Estatísticas do horizonte indicado (um de horizons_s); {} se vazio."""
+        with self._lock:
+            if horizon_s not in self._starts:
+                raise ValueError(f"horizon_s must be one of {self.horizons_s}")
+            start = self._starts[horizon_s]
+            n = self.count - start
+            if n <= 0:
+                return {}
+            mask = len(self._t) - 1
+            total = self._sum - self._cum[start & mask]
+            total_sq = self._sumsq - self._cumsq[start & mask]
+            span_ms = self._t[(self.count - 1) & mask] - self._t[start & mask]
+            return {
+                "horizon_s": horizon_s,
+                "count": n,
+                "span_s": float(span_ms) / 1000.0,
+                "avg_mA": float(total) / n,
+                "rms_mA": float(np.sqrt(max(total_sq, 0.0) / n)),
+                "min_mA": self._min[horizon_s][0][1],
+                "max_mA": self._max[horizon_s][0][1],
+            }
+
+    def snapshot(self):
+        """Todos os horizontes, indexados por horizon_s."""
+        return {h: self.window(h) for h in self.horizons_s}
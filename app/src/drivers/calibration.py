@@ -1,12 +1,34 @@
+import json
 import numpy as np
 
+# Modelo do firmware (ACS712-05B): I_mA = (adc - adc_mid) * VREF_MV * 1000 / (1023 * S)
+VREF_MV = 5000.0
+ADC_FULL_SCALE = 1023
+ADC_MID = 512
+ADC_CODES = 1024
+
 class ACS712Calibrator:
-    """Realiza calibração do sensor ACS712 para offset e ganho."""
+    """
+    Realiza calibração do sensor ACS712 para offset e ganho.
+
+    Opcionalmente usa uma curva de calibração (linear por partes ou
+    polinomial) ajustada a partir de medições de referência e pré-compilada
+    em uma tabela indexada pelos códigos de 10 bits do ADC: converter um
+    bloco passa a custar um único gather. Com curva ativa, offset e escala
+    não são usados.
+    """
 
     def __init__(self, nominal_sensitivity_mV_per_A: float = 185.0):
         self.nominal_sensitivity = nominal_sensitivity_mV_per_A
         self.offset_mA = 0.0
         self.scale = 1.0
+        self.curve = None
+        self.lut = None
+
+    @property
+    def lsb_mA(self) -> float:
+        """Corrente equivalente a um código do ADC."""
+        return VREF_MV * 1000.0 / (ADC_FULL_SCALE * self.nominal_sensitivity)
 
     def calibrate_zero(self, samples):
         """Calcula o offset (corrente em 0 A)."""
@@ -22,6 +44,85 @@ class ACS712Calibrator:
         if sensor_output_mA != 0:
             self.scale = (measured_current_A * 1000.0) / sensor_output_mA
 
-    def apply(self, current_mA: float) -> float:
-        """Aplica calibração ao valor lido."""
-        return (current_mA - self.offset_mA) * self.scale
+    def fit_curve(self, sensor_mA, reference_mA, kind: str = "piecewise", degree: int = 3):
+        """
+        Ajusta a curva leitura do sensor → corrente real a partir de pontos de
+        referência e compila a tabela por código do ADC.
+        kind: "piecewise" (interpolação linear, extrapola pelos segmentos das
+        pontas) ou "poly" (polinômio de grau `degree`, mínimos quadrados).
+        """
+        if kind not in ("piecewise", "poly"):
+            raise ValueError("kind must be 'piecewise' or 'poly'")
+        sensor_mA = np.asarray(sensor_mA, dtype=np.float64)
+        reference_mA = np.asarray(reference_mA, dtype=np.float64)
+        if len(sensor_mA) != len(reference_mA) or len(sensor_mA) < 2:
+            raise ValueError("need at least two matching reference points")
+        order = np.argsort(sensor_mA)
+        self.curve = {"kind": kind, "degree": int(degree),
+                      "sensor_mA": sensor_mA[order].tolist(),
+                      "reference_mA": reference_mA[order].tolist()}
+        self._compile_lut()
+
+    def clear_curve(self):
+        """Volta ao modelo linear (offset e escala)."""
+        self.curve = None
+        self.lut = None
+
+    def _compile_lut(self):
+        x = (np.arange(ADC_CODES) - ADC_MID) * self.lsb_mA
+        xs = np.asarray(self.curve["sensor_mA"])
+        ys = np.asarray(self.curve["reference_mA"])
+        if self.curve["kind"] == "poly":
+            self.lut = np.polyval(np.polyfit(xs, ys, self.curve["degree"]), x)
+            return
+        lut = np.interp(x, xs, ys)
+        lo, hi = x < xs[0], x > xs[-1]
+        lut[lo] = ys[0] + (x[lo] - xs[0]) * (ys[1] - ys[0]) / (xs[1] - xs[0])
+        lut[hi] = ys[-1] + (x[hi] - xs[-1]) * (ys[-1] - ys[-2]) / (xs[-1] - xs[-2])
+        self.lut = lut
+
+    def adc_codes(self, current_mA):
+        """Reconstrói os códigos do ADC (0..1023) a partir das correntes do firmware."""
+        codes = np.rint(np.asarray(current_mA, dtype=np.float64) / self.lsb_mA) + ADC_MID
+        return np.clip(codes, 0, ADC_CODES - 1).astype(np.intp)
+
+    def apply_codes(self, codes, out=None):
+        """Converte códigos brutos do ADC com um único gather na tabela."""
+        return np.take(self.lut, codes, out=out)
+
+    def apply(self, current_mA, out=None):
+        """
+        Aplica calibração ao valor lido ou a um array inteiro.
+        Com out (pode ser o próprio array de entrada) o resultado é escrito in-place.
+        """
+        if np.isscalar(current_mA):
+            if self.lut is not None:
+                return float(self.lut[self.adc_codes(current_mA)])
+            return (current_mA - self.offset_mA) * self.scale
+        if self.lut is not None:
+            return self.apply_codes(self.adc_codes(current_mA), out=out)
+        result = np.subtract(current_mA, self.offset_mA, out=out)
+        return np.multiply(result, self.scale, out=result)
+
+    def to_dict(self):
+        return {"nominal_sensitivity_mV_per_A": self.nominal_sensitivity,
+                "offset_mA": self.offset_mA, "scale": self.scale, "curve": self.curve}
+
+    @classmethod
+    def from_dict(cls, data):
+        calibrator = cls(data.get("nominal_sensitivity_mV_per_A", 185.0))
+        calibrator.offset_mA = data.get("offset_mA", 0.0)
+        calibrator.scale = data.get("scale", 1.0)
+        if data.get("curve"):
+            calibrator.curve = data["curve"]
+            calibrator._compile_lut()
+        return calibrator
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,132 @@
+import selectors
+import threading
+import time
+import numpy as np
+from queue import Queue, Empty, Full
+from .sensor_parser import make_decoder
+
+class MultiSerialReader:
+    """
+    Lê várias portas seriais em um único thread.
+
+    Em sistemas POSIX as portas são multiplexadas com selectors (o thread só
+    acorda quando alguma porta tem bytes); onde as portas não são
+    selecionáveis (ex.: Windows) usa polling de in_waiting. Cada porta tem seu
+    próprio decodificador, e os blocos vão para uma fila única como
+    (port, timestamps, currents).
+    """
+
+    POLL_INTERVAL_S = 0.005
+
+    def __init__(self, ports, baudrate: int = 9600, chunk_size: int = 4096,
+                 max_queue: int = 10000, protocol: str = "auto"):
+        self.ports = list(ports)
+        self.baudrate = baudrate
+        self.chunk_size = chunk_size
+        self._serials = {}
+        self._decoders = {port: make_decoder(protocol) for port in self.ports}
+        self._selector = None
+        self._thread = None
+        self._running = False
+        self.dropped = {port: 0 for port in self.ports}
+        self.queue = Queue(maxsize=max_queue)
+
+    @property
+    def invalid_lines(self):
+        return {port: d.invalid_lines for port, d in self._decoders.items()}
+
+    def connect(self):
+        """Abre todas as portas e inicia o loop de I/O."""
+        import serial
+
+        self._selector = selectors.DefaultSelector()
+        for port in self.ports:
+            # timeout=0: read() devolve apenas o que já estiver disponível
+            ser = serial.Serial(port, self.baudrate, timeout=0)
+            self._serials[port] = ser
+            self._decoders[port].reset()
+            if self._selector is not None:
+                try:
+                    self._selector.register(ser, selectors.EVENT_READ, port)
+                except (AttributeError, ValueError, OSError):
+                    self._selector.close()
+                    self._selector = None
+        self._running = True
+        target = self._select_loop if self._selector else self._poll_loop
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def _select_loop(self):
+        while self._running:
+            for key, _ in self._selector.select(timeout=0.1):
+                self._drain(key.data)
+
+    def _poll_loop(self):
+        while self._running:
+            got_data = False
+            for port, ser in list(self._serials.items()):
+                if ser.in_waiting:
+                    got_data = self._drain(port) or got_data
+            if not got_data:
+                time.sleep(self.POLL_INTERVAL_S)
+
+    def _drain(self, port):
+        """Lê os bytes disponíveis de uma porta e enfileira o bloco decodificado."""
+        import serial
+
+        try:
+            chunk = self._serials[port].read(self.chunk_size)
+        except serial.SerialException:
+            self._close_port(port)
+            return False
+        if not chunk:
+            return False
+        timestamps, currents = self._decoders[port].feed(chunk)
+        if len(timestamps):
+            try:
+                self.queue.put_nowait((port, timestamps, currents))
+            except Full:
+                self.dropped[port] += len(timestamps)
+        return True
+
+    def _close_port(self, port):
+        ser = self._serials.pop(port, None)
+        if ser is None:
+            return
+        if self._selector is not None:
+            self._selector.unregister(ser)
+        if ser.is_open:
+            ser.close()
+        print(f"[READER] Port {port} closed.")
+
+    def read_block(self, block: bool = False, timeout: float = 0.1):
+        """Drena a fila e retorna {port: (timestamps, currents)} ou None."""
+        try:
+            first = self.queue.get(block, timeout)
+        except Empty:
+            return None
+        items = [first]
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except Empty:
+                break
+        per_port = {}
+        for port, timestamps, currents in items:
+            per_port.setdefault(port, []).append((timestamps, currents))
+        return {port: (np.concatenate([ts for ts, _ in parts]),
+                       np.concatenate([cur for _, cur in parts]))
+                for port, parts in per_port.items()}
+
+    def disconnect(self):
+        """Encerra o loop e fecha todas as portas."""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1)
+        for port in list(self._serials):
+            ser = self._serials.pop(port)
+            if ser.is_open:
+                ser.close()
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
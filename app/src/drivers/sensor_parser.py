@@ -1,3 +1,8 @@
+import numpy as np
+
+_INT64 = np.iinfo(np.int64)
+
+
 def parse_csv_line(line: str):
     """
     Recebe uma linha CSV no formato: "<timestamp_ms>,<current_mA>"
@@ -12,3 +17,215 @@ def parse_csv_line(line: str):
         return timestamp, current_mA
     except ValueError:
         return None
+
+
+def parse_csv_block(lines):
+    """
+    Converte uma lista de linhas CSV (bytes) em blocos NumPy.
+    Retorna (timestamps int64, currents float32, invalid_count).
+    """
+    lines = [line for line in map(bytes.strip, lines) if line]
+    if not lines:
+        return np.empty(0, np.int64), np.empty(0, np.float32), 0
+    try:
+        fields = np.array([line.split(b",") for line in lines])
+        if fields.ndim == 2 and fields.shape[1] == 2:
+            return fields[:, 0].astype(np.int64), fields[:, 1].astype(np.float32), 0
+    except (ValueError, OverflowError):
+        pass
+
+    # Caminho lento: ao menos uma linha inválida (ou timestamp fora do int64), valida uma a uma
+    parsed = [parse_csv_line(line.decode("utf-8", errors="ignore")) for line in lines]
+    valid = [p for p in parsed if p is not None and _INT64.min <= p[0] <= _INT64.max]
+    timestamps = np.fromiter((p[0] for p in valid), np.int64, len(valid))
+    currents = np.fromiter((p[1] for p in valid), np.float32, len(valid))
+    return timestamps, currents, len(lines) - len(valid)
+
+
+class CsvBlockDecoder:
+    """Decodifica um fluxo de bytes CSV em blocos, preservando linhas parciais."""
+
+    MAX_LINE_BYTES = 256
+
+    def __init__(self):
+        self._pending = b""
+        self.invalid_lines = 0
+
+    def feed(self, chunk: bytes):
+        """Processa um bloco de bytes e retorna (timestamps, currents)."""
+        data = self._pending + chunk if self._pending else chunk
+        lines = data.split(b"\n")
+        self._pending = lines.pop()
+        if len(self._pending) > self.MAX_LINE_BYTES:
+            # Lixo sem quebra de linha: descarta para não crescer indefinidamente
+            self._pending = b""
+            self.invalid_lines += 1
+        timestamps, currents, invalid = parse_csv_block(lines)
+        self.invalid_lines += invalid
+        return timestamps, currents
+
+    def reset(self):
+        self._pending = b""
+        self.invalid_lines = 0
+
+
+# ---------------------------------------------------------------------------
+# Protocolo binário
+#
+# Frame de 9 bytes (little-endian):
+#   [0xA5 0x5A][timestamp_ms u32][current_mA i16][CRC-8]
+# CRC-8 polinômio 0x07, valor inicial 0, calculado sobre os 6 bytes de dados.
+# ---------------------------------------------------------------------------
+
+FRAME_SYNC = b"\xa5\x5a"
+FRAME_SIZE = 9
+_FRAME_DTYPE = np.dtype([("sync", "<u2"), ("timestamp_ms", "<u4"),
+                         ("current_mA", "<i2"), ("crc", "u1")])
+
+
+def _build_crc8_table(poly=0x07):
+    table = np.zeros(256, dtype=np.uint8)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return table
+
+
+_CRC8_TABLE = _build_crc8_table()
+
+
+def _crc8_rows(payload):
+    """CRC-8 de cada linha de uma matriz (n, 6) de bytes, vetorizado por coluna."""
+    crc = np.zeros(len(payload), dtype=np.uint8)
+    for j in range(payload.shape[1]):
+        crc = _CRC8_TABLE[crc ^ payload[:, j]]
+    return crc
+
+
+def encode_frames(timestamps_ms, currents_mA) -> bytes:
+    """Codifica amostras em frames binários (usado por testes e dispositivos virtuais)."""
+    frames = np.zeros(len(timestamps_ms), dtype=_FRAME_DTYPE)
+    frames["sync"] = np.frombuffer(FRAME_SYNC, dtype="<u2")[0]
+    frames["timestamp_ms"] = np.asarray(timestamps_ms, dtype=np.int64) & 0xFFFFFFFF
+    frames["current_mA"] = np.clip(np.rint(currents_mA), -32768, 32767)
+    raw = frames.view(np.uint8).reshape(-1, FRAME_SIZE)
+    frames["crc"] = _crc8_rows(raw[:, 2:8])
+    return frames.tobytes()
+
+
+def decode_frames(data: bytes, in_gap: bool = False):
+    """
+    Decodifica em bloco todos os frames válidos de um buffer.
+    Retorna (timestamps int64, currents float32, resyncs, consumed, in_gap):
+    resyncs é o número de trechos corrompidos pulados, consumed quantos bytes
+    do início do buffer já foram processados (o resto pode conter um frame
+    incompleto) e in_gap indica que o buffer terminou dentro de um trecho
+    corrompido. Passar in_gap da chamada anterior evita contar duas vezes um
+    trecho que atravessa a fronteira entre blocos.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    n = len(buf)
+    empty = np.empty(0, np.int64), np.empty(0, np.float32)
+    if n < FRAME_SIZE:
+        return (*empty, 0, 0, in_gap)
+
+    last = n - FRAME_SIZE + 1
+    candidates = np.flatnonzero((buf[:last] == FRAME_SYNC[0]) & (buf[1:last + 1] == FRAME_SYNC[1]))
+    frames = buf[candidates[:, None] + np.arange(FRAME_SIZE)]
+    valid = _crc8_rows(frames[:, 2:8]) == frames[:, 8]
+    positions, frames = candidates[valid], frames[valid]
+
+    if len(positions) > 1 and np.any(np.diff(positions) < FRAME_SIZE):
+        # Falso positivo dentro de outro frame (raro): seleção gulosa sem sobreposição
+        keep, end = [], -1
+        for i, p in enumerate(positions.tolist()):
+            if p >= end:
+                keep.append(i)
+                end = p + FRAME_SIZE
+        positions, frames = positions[keep], frames[keep]
+
+    # Bytes antes de 'last' que não iniciam frame válido já podem ser descartados
+    end = int(positions[-1]) + FRAME_SIZE if len(positions) else 0
+    consumed = max(end, last)
+    gaps = np.r_[positions, consumed] > np.r_[0, positions + FRAME_SIZE]
+    if in_gap and gaps[0]:
+        gaps[0] = False  # continuação do trecho já contado na chamada anterior
+    resyncs = int(np.count_nonzero(gaps))
+
+    records = np.ascontiguousarray(frames).view(_FRAME_DTYPE).ravel()
+    return (records["timestamp_ms"].astype(np.int64),
+            records["current_mA"].astype(np.float32), resyncs, consumed, consumed > end)
+
+
+class BinaryFrameDecoder:
+    """Decodifica um fluxo de frames binários, ressincronizando após bytes corrompidos."""
+
+    def __init__(self):
+        self.reset()
+
+    def feed(self, chunk: bytes):
+        data = self._pending + chunk if self._pending else chunk
+        timestamps, currents, resyncs, consumed, self._in_gap = decode_frames(data, self._in_gap)
+        self._pending = data[consumed:]
+        self.invalid_lines += resyncs
+        return timestamps, currents
+
+    def reset(self):
+        self._pending = b""
+        self._in_gap = False
+        self.invalid_lines = 0
+
+
+def detect_format(data: bytes):
+    """
+    Identifica o protocolo de um trecho do fluxo: "binary", "csv" ou None
+    (indeterminado, é preciso mais dados).
+    """
+    timestamps = decode_frames(data)[0]
+    if len(timestamps) >= 2:
+        return "binary"
+    lines = data.split(b"\n")[:-1]
+    _, currents, invalid = parse_csv_block(lines)
+    if len(currents) and len(currents) >= invalid:
+        return "csv"
+    return None
+
+
+class AutoDecoder:
+    """Acumula o início do fluxo até reconhecer o protocolo e então delega ao decodificador certo."""
+
+    DETECT_LIMIT = 512
+
+    def __init__(self):
+        self.reset()
+
+    @property
+    def invalid_lines(self):
+        return self._decoder.invalid_lines if self._decoder else 0
+
+    def feed(self, chunk: bytes):
+        if self._decoder is None:
+            self._buffer += chunk
+            self.format = detect_format(self._buffer)
+            if self.format is None and len(self._buffer) > self.DETECT_LIMIT:
+                self.format = "csv"
+            if self.format is None:
+                return np.empty(0, np.int64), np.empty(0, np.float32)
+            self._decoder = make_decoder(self.format)
+            chunk, self._buffer = self._buffer, b""
+        return self._decoder.feed(chunk)
+
+    def reset(self):
+        self.format = None
+        self._buffer = b""
+        self._decoder = None
+
+
+def make_decoder(protocol: str = "csv"):
+    """Cria o decodificador de fluxo para "csv", "binary" ou "auto"."""
+    decoders = {"csv": CsvBlockDecoder, "binary": BinaryFrameDecoder, "auto": AutoDecoder}
+    if protocol not in decoders:
+        raise ValueError(f"unknown protocol: {protocol}")
+    return decoders[protocol]()
@@ -1,39 +1,98 @@
-import serial
 import threading
-from queue import Queue, Empty
-from .sensor_parser import parse_csv_line
+import time
+import numpy as np
+from queue import Queue, Empty, Full
+from .sensor_parser import parse_csv_line, make_decoder
+from src.core.metrics import METRICS
 
 class SerialReader:
-    """Driver para leitura de dados via UART (Arduino Nano @9600bps)."""
+    """
+    Driver para leitura de dados via UART (Arduino Nano @9600bps).
 
-    def __init__(self, port: str, baudrate: int = 9600, timeout: float = 1.0):
+    protocol escolhe o formato do fluxo: "csv" (texto), "binary" (frames com
+    CRC, ver sensor_parser) ou "auto" (detecta). "binary" e "auto" sempre
+    usam a leitura em blocos (bulk).
+    """
+
+    def __init__(self, port: str, baudrate: int = 9600, timeout: float = 1.0,
+                 bulk: bool = False, chunk_size: int = 4096, max_queue: int = 10000,
+                 protocol: str = "csv"):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.bulk = bulk
+        self.chunk_size = chunk_size
         self._serial = None
         self._thread = None
         self._running = False
-        self.queue = Queue()
+        self.protocol = protocol
+        self._decoder = make_decoder(protocol)
+        self.invalid_lines = 0
+        self.dropped = 0
+        self.queue = Queue(maxsize=max_queue)
 
     def connect(self):
         """Abre a conexão serial."""
-        self._serial = serial.Serial(self.port, self.baudrate, timeout=self.timeout)
+        self._serial = self._open_serial()
         self._running = True
-        self._thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._decoder.reset()
+        target = self._read_bulk_loop if self.bulk or self.protocol != "csv" else self._read_loop
+        self._thread = threading.Thread(target=target, daemon=True)
         self._thread.start()
 
+    def _open_serial(self):
+        """Abre a porta física (sobrescrito por fontes virtuais)."""
+        import serial  # import tardio: fontes virtuais e o modo headless não precisam do pyserial
+
+        return serial.Serial(self.port, self.baudrate, timeout=self.timeout)
+
     def _read_loop(self):
         """Thread para leitura contínua da serial."""
+        import serial
+
         while self._running:
             try:
                 line = self._serial.readline().decode("utf-8", errors="ignore").strip()
                 if line:
                     parsed = parse_csv_line(line)
                     if parsed:
-                        self.queue.put(parsed)
+                        self._enqueue(parsed, 1)
+                    else:
+                        self.invalid_lines += 1
             except serial.SerialException:
                 break
 
+    def _read_bulk_loop(self):
+        """Thread de leitura em blocos: um put por bloco, não por amostra."""
+        import serial
+
+        while self._running:
+            try:
+                waiting = self._serial.in_waiting
+                chunk = self._serial.read(min(max(waiting, 1), self.chunk_size))
+                if not chunk:
+                    continue
+                if METRICS.enabled:
+                    start = time.perf_counter()
+                    timestamps, currents = self._decoder.feed(chunk)
+                    METRICS.observe("serial.parse", time.perf_counter() - start)
+                    METRICS.incr("serial.bytes", len(chunk))
+                    METRICS.incr("serial.samples", len(timestamps))
+                else:
+                    timestamps, currents = self._decoder.feed(chunk)
+                self.invalid_lines = self._decoder.invalid_lines
+                if len(timestamps):
+                    self._enqueue((timestamps, currents), len(timestamps))
+            except serial.SerialException:
+                break
+
+    def _enqueue(self, item, n_samples):
+        """Enfileira sem bloquear a thread de leitura; conta descartes se a fila estiver cheia."""
+        try:
+            self.queue.put_nowait(item)
+        except Full:
+            self.dropped += n_samples
+
     def read(self, block: bool = False, timeout: float = 0.1):
         """Lê o próximo item da fila de dados (ou None se vazio)."""
         try:
@@ -41,6 +100,30 @@ class SerialReader:
         except Empty:
             return None
 
+    def read_block(self, block: bool = False, timeout: float = 0.1):
+        """
+        Drena toda a fila e retorna (timestamps int64, currents float32),
+        ou None se não houver dados.
+        """
+        first = self.read(block, timeout)
+        if first is None:
+            return None
+        items = [first]
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except Empty:
+                break
+
+        if isinstance(first[0], np.ndarray):
+            if len(items) == 1:
+                return items[0]
+            return (np.concatenate([ts for ts, _ in items]),
+                    np.concatenate([cur for _, cur in items]))
+        timestamps = np.fromiter((ts for ts, _ in items), np.int64, len(items))
+        currents = np.fromiter((cur for _, cur in items), np.float32, len(items))
+        return timestamps, currents
+
     def disconnect(self):
         """Encerra a leitura e fecha a porta serial."""
         self._running = False
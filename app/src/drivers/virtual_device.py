@@ -0,0 +1,159 @@
+import time
+import numpy as np
+from .serial_reader import SerialReader
+from .sensor_parser import encode_frames
+
+
+def replay_samples(csv_path, chunksize=50_000):
+    """Gera blocos (timestamps, currents) a partir de um CSV do DataLogger."""
+    import pandas as pd
+
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize,
+                             dtype={"timestamp_ms": np.int64, "current_mA": np.float64}):
+        yield chunk["timestamp_ms"].to_numpy(), chunk["current_mA"].to_numpy()
+
+
+def synthetic_samples(rate_hz=62.5, duration_s=10.0, profile="steps", amplitude_mA=500.0,
+                      block_size=4096, seed=0):
+    """
+    Gera blocos de carga sintética na taxa indicada.
+    Perfis: "constant", "sine" (1 Hz), "steps" (alterna a cada 2 s) e "noise".
+    """
+    if profile not in ("constant", "sine", "steps", "noise"):
+        raise ValueError(f"unknown profile: {profile}")
+    rng = np.random.default_rng(seed)
+    total = int(rate_hz * duration_s)
+    period_ms = 1000.0 / rate_hz
+    for start in range(0, total, block_size):
+        idx = np.arange(start, min(start + block_size, total))
+        t_ms = idx * period_ms
+        if profile == "constant":
+            currents = np.full(len(idx), amplitude_mA)
+        elif profile == "sine":
+            currents = amplitude_mA * np.sin(2 * np.pi * t_ms / 1000.0)
+        elif profile == "steps":
+            currents = np.where((t_ms // 2000) % 2 == 0, 0.1, 1.0) * amplitude_mA
+        else:
+            currents = rng.normal(amplitude_mA, amplitude_mA * 0.05, len(idx))
+        yield t_ms.astype(np.int64), np.rint(currents)
+
+
+class VirtualSerial:
+    """
+    Porta serial virtual (subconjunto da API do pyserial) que emite amostras
+    de um gerador no protocolo CSV ou binário.
+
+    speed controla o ritmo: 1.0 respeita os timestamps (tempo real), N acelera
+    N vezes e None entrega tudo o mais rápido possível.
+    """
+
+    def __init__(self, blocks, speed=1.0, protocol="csv", timeout=1.0):
+        if protocol not in ("csv", "binary"):
+            raise ValueError("protocol must be 'csv' or 'binary'")
+        self._blocks = iter(blocks)
+        self.speed = speed
+        self.protocol = protocol
+        self.timeout = timeout
+        self.is_open = True
+        self.exhausted = False
+        self.samples_sent = 0
+        self._timestamps = np.empty(0, np.int64)
+        self._currents = np.empty(0)
+        self._bytes = bytearray()
+        self._t0_device = None
+        self._t0_host = None
+
+    def due_time(self, timestamp_ms):
+        """Instante (time.monotonic) em que a amostra com esse timestamp é emitida."""
+        if self.speed is None or self._t0_host is None:
+            return self._t0_host
+        return self._t0_host + (timestamp_ms - self._t0_device) / 1000.0 / self.speed
+
+    def _next_block(self):
+        try:
+            self._timestamps, self._currents = next(self._blocks)
+        except StopIteration:
+            self.exhausted = True
+            return
+        if self._t0_device is None and len(self._timestamps):
+            self._t0_device = int(self._timestamps[0])
+            self._t0_host = time.monotonic()
+
+    def _fill(self, size):
+        """Codifica as amostras já devidas até ter pelo menos size bytes prontos."""
+        while len(self._bytes) < size and not self.exhausted:
+            if not len(self._timestamps):
+                self._next_block()
+                continue
+            if self.speed is None:
+                n = len(self._timestamps)
+            else:
+                elapsed_ms = (time.monotonic() - self._t0_host) * 1000.0 * self.speed
+                n = int(np.searchsorted(self._timestamps - self._t0_device, elapsed_ms, side="right"))
+                if not n:
+                    return
+            ts, cur = self._timestamps[:n], self._currents[:n]
+            self._timestamps, self._currents = self._timestamps[n:], self._currents[n:]
+            if self.protocol == "binary":
+                self._bytes += encode_frames(ts, cur)
+            else:
+                self._bytes += b"".join(b"%d,%g\r\n" % row
+                                        for row in zip(ts.tolist(), cur.tolist()))
+            self.samples_sent += n
+
+    @property
+    def in_waiting(self):
+        self._fill(1 << 16)
+        return len(self._bytes)
+
+    def read(self, size=1):
+        deadline = time.monotonic() + (self.timeout or 0)
+        while True:
+            self._fill(size)
+            if self._bytes or self.exhausted or time.monotonic() >= deadline:
+                break
+            time.sleep(0.001)
+        out = bytes(self._bytes[:size])
+        del self._bytes[:size]
+        return out
+
+    def readline(self):
+        line = bytearray()
+        while not line.endswith(b"\n"):
+            chunk = self.read(1)
+            if not chunk:
+                break
+            line += chunk
+        return bytes(line)
+
+    def close(self):
+        self.is_open = False
+
+
+class VirtualSerialReader(SerialReader):
+    """SerialReader alimentado por uma VirtualSerial: mesma interface e mesmo parsing."""
+
+    def __init__(self, blocks, speed=1.0, protocol="csv", **kwargs):
+        kwargs.setdefault("bulk", True)
+        super().__init__(port="VIRTUAL", protocol="auto", **kwargs)
+        self.device = VirtualSerial(blocks, speed=speed, protocol=protocol, timeout=self.timeout)
+
+    @classmethod
+    def replay(cls, csv_path, speed=1.0, protocol="csv", **kwargs):
+        """Reproduz um CSV gravado pelo DataLogger (1x, Nx ou speed=None para máximo)."""
+        return cls(replay_samples(csv_path), speed=speed, protocol=protocol, **kwargs)
+
+    @classmethod
+    def synthetic(cls, rate_hz=62.5, duration_s=10.0, profile="steps", speed=1.0,
+                  protocol="csv", **kwargs):
+        """Gera carga sintética com a taxa e o perfil indicados."""
+        blocks = synthetic_samples(rate_hz, duration_s, profile)
+        return cls(blocks, speed=speed, protocol=protocol, **kwargs)
+
+    @property
+    def exhausted(self):
+        return self.device.exhausted and not self.device._bytes
+
+    def _open_serial(self):
+        self.device.is_open = True
+        return self.device
@@ -0,0 +1,102 @@
+"""
+Energy Consumption Monitor - Headless Acquisition
+-------------------------------------------------
+Runs acquisition, logging and periodic summaries from the command line,
+without importing Qt or Matplotlib (for display-less logging boxes).
+
+Usage:
+    python -m src.main --headless --port /dev/ttyUSB0 --baud 115200 --duration 3600
+    python -m src.main --headless --virtual steps --duration 10 --speed 0
+"""
+
+import time
+from src.core import analysis
+from src.core.app_controller import AppController
+
+
+def add_arguments(parser):
+    """Registers the headless options on the main argument parser."""
+    group = parser.add_argument_group("headless mode")
+    group.add_argument("--port", default="COM6", help="serial port")
+    group.add_argument("--baud", type=int, default=9600, help="serial baudrate")
+    group.add_argument("--rate", type=float, default=62.5, help="sample rate (Hz)")
+    group.add_argument("--output-dir", default="logs", help="directory for session files")
+    group.add_argument("--duration", type=float, default=None,
+                       help="stop after this many seconds (default: until Ctrl+C)")
+    group.add_argument("--interval", type=float, default=5.0, help="summary interval (s)")
+    group.add_argument("--calibration", default=None, help="calibration JSON to apply")
+    group.add_argument("--rollup-db", default=None, help="SQLite rollup database")
+    group.add_argument("--stream-port", type=int, default=None,
+                       help="publish live samples on this localhost TCP port")
+    group.add_argument("--metrics", default=None, help="append metrics snapshots to this file")
+    group.add_argument("--spectral", action="store_true",
+                       help="report dominant frequency, crest factor and THD with each summary")
+    group.add_argument("--virtual", default=None, metavar="PROFILE",
+                       help="use a synthetic device (constant, sine, steps, noise)")
+    group.add_argument("--replay", default=None, metavar="CSV", help="replay a recorded session")
+    group.add_argument("--speed", type=float, default=1.0,
+                       help="virtual device speed (0 = as fast as possible)")
+
+
+def _make_reader(args):
+    if not (args.virtual or args.replay):
+        return None
+    from src.drivers.virtual_device import VirtualSerialReader
+
+    speed = args.speed or None
+    if args.replay:
+        return VirtualSerialReader.replay(args.replay, speed=speed)
+    return VirtualSerialReader.synthetic(rate_hz=args.rate, duration_s=args.duration or 60,
+                                         profile=args.virtual, speed=speed)
+
+
+def format_summary(summary):
+    """One-line text summary for the console (also before the first sample)."""
+    return f"[HEADLESS] {analysis.format_summary(summary)}"
+
+
+def format_spectrum(result):
+    """One-line spectral report for the latest analysis window."""
+    if not result:
+        return "[HEADLESS] spectrum: window not filled yet"
+    return (f"[HEADLESS] spectrum: dominant {result['dominant_hz']:.2f} Hz | "
+            f"crest {result['crest_factor']:.2f} | THD {result['thd'] * 100:.1f}%")
+
+
+def _report(controller):
+    print(format_summary(controller.summarize()), flush=True)
+    if controller.spectral:
+        print(format_spectrum(controller.spectral.latest), flush=True)
+
+
+def run(args):
+    """Runs an acquisition session until --duration, end of a virtual source or Ctrl+C."""
+    reader = _make_reader(args)
+    controller = AppController(port=args.port, baudrate=args.baud, sample_rate_hz=args.rate,
+                               reader=reader, output_dir=args.output_dir,
+                               rollup_db=args.rollup_db, metrics_dump_path=args.metrics,
+                               stream_port=args.stream_port, spectral=args.spectral)
+    if args.calibration:
+        from src.drivers.calibration import ACS712Calibrator
+
+        controller.calibrator = ACS712Calibrator.load(args.calibration)
+
+    controller.start()
+    deadline = time.monotonic() + args.duration if args.duration else None
+    next_report = time.monotonic() + args.interval
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(0.05)
+            if reader is not None and reader.exhausted and reader.queue.empty():
+                time.sleep(0.2)   # deixa o controlador drenar o último bloco
+                break
+            if time.monotonic() >= next_report:
+                _report(controller)
+                next_report += args.interval
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.stop()
+    _report(controller)
+    print(f"[HEADLESS] Session saved to {controller.logger.path}")
+    return 0
@@ -7,17 +7,33 @@ Features:
  - Connects to Arduino Nano (ACS712 current sensor) via serial.
  - Displays real-time current graph using PyQt5 and Matplotlib.
  - Supports CSV logging and energy estimation.
+ - Headless mode (--headless) for logging without a display.
 """
 
+import argparse
 import sys
-from PyQt5.QtWidgets import QApplication
-from src.ui.main_window import MainWindow
 
 
-def main():
+def main(argv=None):
     """Main entry point for the Energy Consumption Monitor."""
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    parser = argparse.ArgumentParser(description="Energy Consumption Monitor")
+    parser.add_argument("--headless", action="store_true",
+                        help="acquire and log without the graphical interface")
+    parser.add_argument("--process", action="store_true",
+                        help="run acquisition in a separate process (GUI mode)")
+    from src import headless
+
+    headless.add_arguments(parser)
+    args, qt_args = parser.parse_known_args(argv)
+    if args.headless:
+        sys.exit(headless.run(args))
+
+    # Qt e Matplotlib só são importados no modo gráfico
+    from PyQt5.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow(out_of_process=args.process)
     window.show()
     sys.exit(app.exec_())
 
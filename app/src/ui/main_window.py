@@ -1,40 +1,67 @@
 from PyQt5.QtWidgets import (
-    QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel
+    QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox
 )
 from PyQt5.QtCore import QTimer
+import time
+from src.core.analysis import format_summary
 from src.core.app_controller import AppController
+from src.core.window_stats import SlidingWindowStats
 from src.ui.plot_widget import PlotWidget
 from src.ui.settings_dialog import SettingsDialog
+from src.core.metrics import METRICS
 
 class MainWindow(QMainWindow):
     """Janela principal do Energy Consumption Monitor."""
 
-    def __init__(self):
+    # Limites do intervalo adaptativo do timer de UI (ms) e fração máxima
+    # do tempo da thread de GUI gasta desenhando.
+    MIN_INTERVAL_MS = 50
+    MAX_INTERVAL_MS = 1000
+    RENDER_BUDGET = 0.25
+
+    def __init__(self, out_of_process=False):
         super().__init__()
         self.setWindowTitle("Energy Consumption Monitor")
+        # out_of_process: aquisição em outro processo (ProcessController), fora do GIL da UI
+        self.out_of_process = out_of_process
         self.controller = None
         self.running = False
+        self._last_seq = 0
+        self.window_stats = None
+        self._feed_window_stats = False
         self.plot = PlotWidget(max_points=300)
         self.status_label = QLabel("Disconnected")
+        self.window_label = QLabel("")
+        self.metrics_label = QLabel("")
+        self.metrics_label.setVisible(METRICS.enabled)
+        self.chk_metrics = QCheckBox("Metrics")
+        self.chk_metrics.setChecked(METRICS.enabled)
+        self.chk_metrics.toggled.connect(self.toggle_metrics)
 
         # Botões
         self.btn_start = QPushButton("Start")
         self.btn_stop = QPushButton("Stop")
         self.btn_settings = QPushButton("Settings")
+        self.btn_live = QPushButton("Live")
         self.btn_start.clicked.connect(self.start_acquisition)
         self.btn_stop.clicked.connect(self.stop_acquisition)
         self.btn_settings.clicked.connect(self.open_settings)
+        self.btn_live.clicked.connect(self.plot.follow_live)
 
         # Layout
         button_layout = QHBoxLayout()
         button_layout.addWidget(self.btn_settings)
         button_layout.addWidget(self.btn_start)
         button_layout.addWidget(self.btn_stop)
+        button_layout.addWidget(self.btn_live)
+        button_layout.addWidget(self.chk_metrics)
 
         layout = QVBoxLayout()
         layout.addWidget(self.plot)
         layout.addLayout(button_layout)
         layout.addWidget(self.status_label)
+        layout.addWidget(self.window_label)
+        layout.addWidget(self.metrics_label)
 
         container = QWidget()
         container.setLayout(layout)
@@ -59,8 +86,20 @@ class MainWindow(QMainWindow):
             return
         try:
             self.plot.reset_plot()
-            
-            self.controller = AppController(port=self.port, baudrate=self.baudrate)
+            self._last_seq = 0
+            self._release_controller()
+
+            if self.out_of_process:
+                from src.core.process_controller import ProcessController
+
+                self.controller = ProcessController(port=self.port, baudrate=self.baudrate)
+            else:
+                self.controller = AppController(port=self.port, baudrate=self.baudrate)
+            # ProcessController não expõe o fluxo: a UI alimenta uma instância própria
+            self.window_stats = getattr(self.controller, "window_stats", None)
+            self._feed_window_stats = self.window_stats is None
+            if self._feed_window_stats:
+                self.window_stats = SlidingWindowStats()
             self.controller.start()
             self.running = True
             self.status_label.setText("Running...")
@@ -71,13 +110,74 @@ class MainWindow(QMainWindow):
         if not self.running:
             return
         self.controller.stop()
-        summary = self.controller.summarize()
-        text = f"Avg: {summary['avg_mA']:.1f} mA | RMS: {summary['rms_mA']:.1f} mA | E: {summary['energy_Wh']:.6f} Wh"
-        self.status_label.setText(f"Stopped. {text}")
+        self.status_label.setText(f"Stopped. {format_summary(self.controller.summarize())}")
         self.running = False
 
+    def _release_controller(self):
+        """Libera o controlador anterior (o ProcessController mantém um segmento de memória compartilhada)."""
+        close = getattr(self.controller, "close", None)
+        if close:
+            close()
+        self.controller = None
+
+    def closeEvent(self, event):
+        self.stop_acquisition()
+        self._release_controller()
+        super().closeEvent(event)
+
+    def toggle_metrics(self, enabled):
+        """Liga/desliga a instrumentação e o painel de métricas."""
+        METRICS.enabled = enabled
+        if enabled:
+            METRICS.reset()
+        self.metrics_label.setVisible(enabled)
+
+    def update_metrics_panel(self):
+        snap = METRICS.snapshot()
+        ctrl = snap.get("controller", {})
+        latency = snap["latency"]
+        parts = [
+            f"Queue: {ctrl.get('queue_depth', 0)}",
+            f"Dropped: {ctrl.get('dropped', 0)}",
+            f"Invalid: {ctrl.get('invalid_lines', 0)}",
+            f"Backlog: {ctrl.get('backlog_age_ms', 0)} ms",
+        ]
+        for name, label in (("serial.parse", "Parse"), ("core.process_block", "Process"),
+                            ("logger.commit", "Write"), ("ui.frame", "Frame")):
+            if name in latency:
+                parts.append(f"{label} p99: {latency[name]['p99_ms']:.2f} ms")
+        self.metrics_label.setText(" | ".join(parts))
+
     def update_ui(self):
-        if self.running and self.controller and self.controller.samples:
-            t_ms = len(self.controller.samples) * (1000 / self.controller.sample_rate_hz)
-            current = self.controller.samples[-1]
-            self.plot.update_plot(t_ms, current)
+        """Plota, em um único bloco, todas as amostras recebidas desde o último tick."""
+        if not (self.running and self.controller):
+            return
+        start = time.perf_counter()
+        timestamps, currents, self._last_seq = self.controller.samples.since(self._last_seq)
+        if len(timestamps):
+            self.plot.append_block(timestamps, currents)
+            if self._feed_window_stats:
+                self.window_stats.update_block(timestamps, currents)
+        self.update_window_panel()
+        cost_ms = (time.perf_counter() - start) * 1000.0 + self.plot.mean_frame_time_ms()
+        self._adapt_interval(cost_ms)
+        if METRICS.enabled:
+            self.update_metrics_panel()
+
+    def update_window_panel(self):
+        """Média, RMS e pico das janelas deslizantes (consulta O(1), sem varrer o histórico)."""
+        parts = []
+        for horizon, window in self.window_stats.snapshot().items():
+            if window:
+                label = f"{horizon // 60} min" if horizon >= 60 else f"{horizon} s"
+                parts.append(f"{label}: {window['avg_mA']:.1f} / {window['rms_mA']:.1f} / "
+                             f"{window['max_mA']:.1f} mA")
+        if parts:
+            self.window_label.setText("Avg / RMS / Peak  " + " | ".join(parts))
+
+    def _adapt_interval(self, cost_ms):
+        """Ajusta o intervalo do timer ao custo de renderização observado."""
+        interval = int(min(max(cost_ms / self.RENDER_BUDGET, self.MIN_INTERVAL_MS),
+                           self.MAX_INTERVAL_MS))
+        if interval != self.timer.interval():
+            self.timer.setInterval(interval)
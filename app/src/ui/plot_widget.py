@@ -1,46 +1,194 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtCore import QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
 import collections
+import time
+from src.core.decimation import MinMaxPyramid
+from src.core.metrics import METRICS
 
 class PlotWidget(QWidget):
-    """Widget de plotagem em tempo real para corrente x tempo."""
+    """
+    Widget de plotagem em tempo real para corrente x tempo.
 
-    def __init__(self, max_points=200, parent=None):
+    Usa uma única linha persistente e blitting: a cada quadro só a área dos
+    eixos é repintada sobre o fundo em cache. O redesenho completo (com
+    reescala dos eixos) ocorre apenas quando os dados saem dos limites atuais.
+    Várias chamadas de update_plot entre dois ciclos do event loop geram um
+    único repaint.
+
+    Todo o histórico da sessão alimenta uma pirâmide min/max (MinMaxPyramid).
+    Ao navegar (pan/zoom pela barra de ferramentas ou show_range) o widget sai
+    do modo ao vivo e desenha no máximo history_points pontos para qualquer
+    nível de zoom; follow_live() volta a acompanhar as últimas amostras.
+    """
+
+    X_HEADROOM = 0.5   # fração da janela reservada à direita ao reescalar
+    Y_MARGIN = 0.1
+
+    def __init__(self, max_points=200, history_points=3000, parent=None):
         super().__init__(parent)
         self.max_points = max_points
+        self.history_points = history_points
+        self.history = MinMaxPyramid()
+        self.live = True
+        self._setting_limits = False
         self.times = collections.deque(maxlen=max_points)
         self.currents = collections.deque(maxlen=max_points)
+        self.frame_times_ms = collections.deque(maxlen=100)
+        self.full_redraws = 0
+        self._background = None
+        self._redraw_pending = False
 
         self.figure = Figure(figsize=(5, 3))
         self.canvas = FigureCanvas(self.figure)
         self.ax = self.figure.add_subplot(111)
+        self._setup_axes()
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.toolbar)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+
+    def _setup_axes(self):
         self.ax.set_title("Current vs Time")
         self.ax.set_xlabel("Time (ms)")
         self.ax.set_ylabel("Current (mA)")
         self.ax.grid(True)
+        self.ax.set_autoscale_on(False)  # limites controlados por _rescale/_draw_history
+        (self.line,) = self.ax.plot([], [], color="tab:blue", animated=True)
+        self.ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
 
-        layout = QVBoxLayout()
-        layout.addWidget(self.canvas)
-        self.setLayout(layout)
+    def _on_draw(self, _event):
+        """Após um redesenho completo, guarda o fundo dos eixos para o blit."""
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
 
     def update_plot(self, t_ms, current_mA):
         self.times.append(t_ms)
         self.currents.append(current_mA)
+        self.history.extend((t_ms,), (current_mA,))
+        if self.live:
+            self._schedule_redraw()
 
-        self.ax.clear()
-        self.ax.plot(self.times, self.currents, color="tab:blue")
-        self.ax.set_xlabel("Time (ms)")
-        self.ax.set_ylabel("Current (mA)")
-        self.ax.grid(True)
+    def append_block(self, times_ms, currents_mA):
+        """Adiciona um bloco de amostras e agenda um único repaint."""
+        self.times.extend(times_ms[-self.max_points:].tolist())
+        self.currents.extend(currents_mA[-self.max_points:].tolist())
+        self.history.extend(times_ms, currents_mA)
+        if self.live:
+            self._schedule_redraw()
+
+    def _on_xlim_changed(self, _ax):
+        """Pan/zoom do usuário: passa ao modo histórico e recarrega a janela."""
+        if self._setting_limits:
+            return
+        self.live = False
+        self._schedule_redraw()
+
+    def show_range(self, t0_ms, t1_ms):
+        """Exibe o intervalo [t0, t1] a partir da pirâmide de histórico."""
+        self.live = False
+        self._set_xlim(t0_ms, t1_ms)
+        self.redraw()
+
+    def load_file_range(self, path, t0_ms, t1_ms):
+        """
+        Carrega [t0, t1) de uma sessão gravada (via índice de tempo) e a exibe.
+        Substitui o histórico atual; usar fora de uma aquisição.
+        """
+        from src.core.session_index import load_range
+
+        timestamps, currents = load_range(path, t0_ms, t1_ms)
+        self.history.clear()
+        self.history.extend(timestamps, currents)
+        self.show_range(t0_ms, t1_ms)
+        return len(timestamps)
+
+    def follow_live(self):
+        """Volta a acompanhar as amostras mais recentes."""
+        self.live = True
+        self._background = None
+        self._schedule_redraw()
+
+    def _set_xlim(self, x0, x1):
+        self._setting_limits = True
+        try:
+            self.ax.set_xlim(x0, x1)
+        finally:
+            self._setting_limits = False
+
+    def _schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            QTimer.singleShot(0, self.redraw)
+
+    def redraw(self):
+        """Atualiza a linha na tela e registra o tempo do quadro."""
+        self._redraw_pending = False
+        start = time.perf_counter()
+        if not self.live:
+            self._draw_history()
+        elif self._background is None or self._out_of_limits():
+            self.line.set_data(self.times, self.currents)
+            self._rescale()
+            self.full_redraws += 1
+            self.canvas.draw()
+        else:
+            self.line.set_data(self.times, self.currents)
+            self.canvas.restore_region(self._background)
+            self.ax.draw_artist(self.line)
+            self.canvas.blit(self.ax.bbox)
+        elapsed = time.perf_counter() - start
+        self.frame_times_ms.append(elapsed * 1000.0)
+        if METRICS.enabled:
+            METRICS.observe("ui.frame", elapsed)
+
+    def _draw_history(self):
+        x0, x1 = self.ax.get_xlim()
+        x, y = self.history.envelope(x0, x1, self.history_points)
+        self.line.set_data(x, y)
+        if len(y):
+            lo, hi = float(y.min()), float(y.max())
+            margin = max((hi - lo) * self.Y_MARGIN, 1.0)
+            self.ax.set_ylim(lo - margin, hi + margin)
+        self.full_redraws += 1
         self.canvas.draw()
 
+    def _out_of_limits(self):
+        if not self.times:
+            return False
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        return (self.times[0] < x0 or self.times[-1] > x1
+                or min(self.currents) < y0 or max(self.currents) > y1)
+
+    def _rescale(self):
+        if not self.times:
+            return
+        t0, t1 = self.times[0], self.times[-1]
+        span = max(t1 - t0, 1.0)
+        self._set_xlim(t0, t1 + span * self.X_HEADROOM)
+        lo, hi = min(self.currents), max(self.currents)
+        margin = max((hi - lo) * self.Y_MARGIN, 1.0)
+        self.ax.set_ylim(lo - margin, hi + margin)
+
+    def mean_frame_time_ms(self):
+        """Tempo médio dos últimos quadros (ms), para medir o custo de renderização."""
+        if not self.frame_times_ms:
+            return 0.0
+        return sum(self.frame_times_ms) / len(self.frame_times_ms)
+
     def reset_plot(self):
         self.times.clear()
         self.currents.clear()
+        self.frame_times_ms.clear()
+        self.history.clear()
         self.ax.clear()
-        self.ax.set_title("Current vs Time")
-        self.ax.set_xlabel("Time (ms)")
-        self.ax.set_ylabel("Current (mA)")
-        self.ax.grid(True)
-        self.canvas.draw()
\ No newline at end of file
+        self._setup_axes()
+        self.live = True
+        self._background = None
+        self.canvas.draw()
@@ -1,5 +1,4 @@
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QComboBox, QDialogButtonBox, QLabel
-import serial.tools.list_ports
 
 class SettingsDialog(QDialog):
     """Diálogo para seleção de porta serial e baudrate."""
@@ -11,7 +10,9 @@ class SettingsDialog(QDialog):
         self.baud_combo = QComboBox()
         self.baud_combo.addItems(["9600", "19200", "38400", "57600", "115200"])
 
-        for port in serial.tools.list_ports.comports():
+        from serial.tools import list_ports
+
+        for port in list_ports.comports():
             self.port_combo.addItem(port.device)
 
         layout = QVBoxLayout()
@@ -1,3 +1,4 @@
+import numpy as np
 from src.drivers.calibration import ACS712Calibrator
 
 def test_zero_calibration():
@@ -16,3 +17,36 @@ def test_apply_calibration():
     c.scale = 2.0
     result = c.apply(20)
     assert abs(result - 20.0) < 1e-6
+
+def test_apply_vectorized_in_place():
+    c = ACS712Calibrator()
+    c.offset_mA = 10
+    c.scale = 2.0
+    data = np.array([20.0, 30.0, 10.0])
+    result = c.apply(data, out=data)
+    assert result is data
+    assert data.tolist() == [20.0, 40.0, 0.0]
+
+def test_piecewise_curve_lut():
+    c = ACS712Calibrator()
+    lsb = c.lsb_mA
+    sensor = np.array([-20, 0, 20, 40]) * lsb        # leituras do sensor em códigos exatos
+    reference = np.array([-500, 0, 540, 1100.0])     # não linear nas pontas
+    c.fit_curve(sensor, reference, kind="piecewise")
+    assert len(c.lut) == 1024
+    readings = np.rint(np.array([0, 10, 40, 60]) * lsb)   # como o firmware envia (mA inteiros)
+    assert np.allclose(c.apply(readings), [0, 270, 1100, 1660])
+    assert abs(c.apply(float(readings[1])) - 270) < 1e-9
+
+def test_poly_curve_and_persistence(tmp_path):
+    c = ACS712Calibrator()
+    sensor = np.linspace(-3000, 3000, 13)
+    c.fit_curve(sensor, 1.02 * sensor + 1e-5 * sensor ** 2, kind="poly", degree=2)
+    codes = np.array([100, 512, 900])
+    expected = c.apply_codes(codes)
+
+    path = tmp_path / "calibration.json"
+    c.save(path)
+    loaded = ACS712Calibrator.load(path)
+    assert np.allclose(loaded.apply_codes(codes), expected)
+    assert abs(expected[1]) < 1.0      # código do meio ≈ 0 mA
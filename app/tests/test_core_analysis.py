@@ -1,4 +1,6 @@
-from src.core.analysis import DataAnalyzer
+import numpy as np
+import pytest
+from src.core.analysis import DataAnalyzer, StreamingStats
 
 def test_average_current():
     data = [100, 200, 300]
@@ -14,3 +16,28 @@ def test_estimate_energy_wh():
     energy = DataAnalyzer.estimate_energy_wh(data, voltage_v=5.0, sample_rate_hz=50)
     # 1A * 5V * (4/50)s = 0.4J = 0.000111Wh
     assert 0.0001 < energy < 0.00012
+
+def test_streaming_stats_matches_batch_metrics():
+    data = np.random.default_rng(1).normal(500.0, 50.0, 1000)
+    stats = StreamingStats(voltage_v=5.0, sample_rate_hz=50)
+    for block in np.array_split(data, 7):
+        stats.update_batch(block)
+    stats.update(data[0])
+    data = np.append(data, data[0])
+
+    summary = stats.summary()
+    assert summary["count"] == len(data)
+    assert abs(summary["avg_mA"] - DataAnalyzer.average_current(data)) < 1e-9
+    assert abs(summary["rms_mA"] - DataAnalyzer.rms_current(data)) < 1e-9
+    assert abs(summary["std_mA"] - np.std(data)) < 1e-9
+    assert summary["min_mA"] == data.min() and summary["max_mA"] == data.max()
+    assert abs(summary["energy_Wh"] - DataAnalyzer.estimate_energy_wh(data, sample_rate_hz=50)) < 1e-12
+
+def test_streaming_stats_merge():
+    a, b, whole = StreamingStats(), StreamingStats(), StreamingStats()
+    a.update_batch([100, 200])
+    b.update_batch([300, 400, 500])
+    whole.update_batch([100, 200, 300, 400, 500])
+    a.merge(b)
+    assert a.summary() == pytest.approx(whole.summary())
+    assert StreamingStats().summary() == {}
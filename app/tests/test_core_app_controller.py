@@ -1,4 +1,6 @@
 import time
+import numpy as np
+from queue import Queue
 from types import SimpleNamespace
 from src.core.app_controller import AppController
 
@@ -7,6 +9,9 @@ class MockSerialReader:
     def __init__(self, *_, **__):
         self.connected = False
         self.counter = 0
+        self.queue = Queue()
+        self.dropped = 0
+        self.invalid_lines = 0
 
     def connect(self): self.connected = True
     def disconnect(self): self.connected = False
@@ -15,16 +20,26 @@ class MockSerialReader:
             return None
         self.counter += 1
         return (self.counter * 1000, 100.0 * self.counter)
+    def read_block(self, block=False, timeout=None):
+        data = self.read(block, timeout)
+        if data is None:
+            time.sleep(timeout or 0)
+            return None
+        return np.array([data[0]]), np.array([data[1]])
 
 class MockLogger:
-    def __init__(self):
+    def __init__(self, *_, **__):
         self.logged = []
+        self.path = None
         self.started = False
         self.stopped = False
 
-    def start(self, device_name="mock"): self.started = True
+    def start(self, device_name="mock", metadata=None, calibration=None): self.started = True
     def log(self, ts, val): self.logged.append((ts, val))
+    def log_many(self, ts, vals):
+        self.logged.extend(zip(ts.tolist(), vals.tolist()))
     def stop(self): self.stopped = True
+    def metrics(self): return {}
 
 def test_app_controller_loop(monkeypatch):
     """Testa ciclo completo com mocks."""
@@ -49,3 +64,72 @@ def test_calibrate_zero(monkeypatch):
     app.calibrate_zero(samples_n=3)
 
     assert abs(app.calibrator.offset_mA) > 0
+
+class BulkSerialPort:
+    """Porta falsa para o SerialReader real em modo bulk: entrega bytes em pedaços."""
+    def __init__(self, data: bytes, chunk: int = 64):
+        self.data, self.chunk, self.is_open = data, chunk, True
+
+    @property
+    def in_waiting(self):
+        return min(self.chunk, len(self.data))
+
+    def read(self, size=1):
+        out, self.data = self.data[:size], self.data[size:]
+        if not out:
+            time.sleep(0.01)
+        return out
+
+    def close(self):
+        self.is_open = False
+
+def test_calibrate_zero_with_bulk_reader(monkeypatch):
+    """calibrate_zero com o SerialReader padrão (bulk), que entrega blocos NumPy."""
+    lines = [f"{i * 16},{10.0 if i < 50 else 1000.0}\r\n" for i in range(80)]
+    port = BulkSerialPort("".join(lines).encode())
+    monkeypatch.setattr("serial.Serial", lambda *a, **kw: port)
+
+    app = AppController(port="COM_FAKE")
+    assert app.reader.bulk
+    app.calibrate_zero(samples_n=50)
+    assert app.calibrator.offset_mA == 10.0
+
+def test_samples_buffer_and_summary(monkeypatch):
+    """Amostras vão para o buffer circular; o resumo cobre a sessão toda."""
+    monkeypatch.setattr("src.core.app_controller.SerialReader", MockSerialReader)
+    monkeypatch.setattr("src.core.app_controller.DataLogger", MockLogger)
+
+    app = AppController(port="COM_FAKE", buffer_capacity=3)
+    app.start()
+    time.sleep(0.3)
+    app.stop()
+
+    assert app.samples.total == 5
+    assert app.samples.timestamps().tolist() == [3000, 4000, 5000]
+    assert abs(app.summarize()["avg_mA"] - 300.0) < 1e-6  # sessão inteira
+
+class BurstReader(MockSerialReader):
+    """Entrega todas as leituras de uma vez, como um burst na serial."""
+    def read_block(self, block=False, timeout=None):
+        if self.counter:
+            time.sleep(timeout or 0)
+            return None
+        self.counter = 50
+        return np.arange(50) * 16, np.full(50, 10.0)
+
+def test_loop_drains_bursts_and_reports_metrics(monkeypatch):
+    monkeypatch.setattr("src.core.app_controller.SerialReader", BurstReader)
+    monkeypatch.setattr("src.core.app_controller.DataLogger", MockLogger)
+
+    app = AppController(port="COM_FAKE")
+    app.start()
+    time.sleep(0.2)
+    app.stop()
+
+    metrics = app.metrics()
+    assert len(app.logger.logged) == 50
+    assert metrics["batches"] == 1
+    assert metrics["processed"] == 50
+    assert metrics["backlog_age_ms"] == 49 * 16
+    assert metrics["queue_depth"] == 0
+    assert metrics["dropped"] == 0
@@ -1,5 +1,9 @@
 import csv
+import threading
+import time
+import numpy as np
 from src.core.data_logger import DataLogger
+from src.drivers.calibration import ACS712Calibrator
 
 def test_data_logger_creates_file(tmp_path):
     logger = DataLogger(output_dir=tmp_path)
@@ -15,3 +19,75 @@ def test_data_logger_creates_file(tmp_path):
         assert rows[0] == ["timestamp_ms", "current_mA"]
         assert rows[1][0] == "1000"
         assert abs(float(rows[1][1]) - 12.345) < 1e-3
+
+def test_data_logger_log_many(tmp_path):
+    logger = DataLogger(output_dir=tmp_path)
+    logger.start(device_name="test_device")
+    logger.log_many(np.array([1000, 1016]), np.array([1.5, -2.25]))
+    logger.stop()
+
+    with open(next(tmp_path.glob("*.csv")), newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[1:] == [["1000", "1.500"], ["1016", "-2.250"]]
+
+def test_async_logger_drains_on_stop(tmp_path):
+    logger = DataLogger(output_dir=tmp_path, async_write=True,
+                        flush_rows=1000, flush_interval_ms=10_000, fsync=True)
+    logger.start(device_name="test_device")
+    for i in range(10):
+        logger.log_many(np.arange(i * 5, i * 5 + 5), np.full(5, 1.0))
+    logger.log(50, 2.0)
+    logger.stop()
+
+    with open(next(tmp_path.glob("*.csv")), newline="") as f:
+        rows = list(csv.reader(f))[1:]
+    assert [int(r[0]) for r in rows] == list(range(51))
+    assert rows[-1] == ["50", "2.000"]
+
+def test_async_logger_flushes_by_row_count(tmp_path):
+    logger = DataLogger(output_dir=tmp_path, async_write=True,
+                        flush_rows=3, flush_interval_ms=10_000)
+    logger.start(device_name="test_device")
+    logger.log_many(np.arange(3), np.zeros(3))
+    time.sleep(0.2)
+    path = next(tmp_path.glob("*.csv"))
+    assert len(path.read_text().splitlines()) == 4  # header + 3 linhas já no disco
+    logger.stop()
+
+def test_async_logger_drop_policy(tmp_path, monkeypatch):
+    logger = DataLogger(output_dir=tmp_path, async_write=True, flush_rows=1,
+                        max_pending=1, overflow="drop")
+    logger.start(device_name="test_device")
+    writing, release = threading.Event(), threading.Event()
+    write = logger.file.write
+
+    def blocked_write(text):  # disco "travado" até o teste liberar
+        writing.set()
+        release.wait(5)
+        return write(text)
+
+    monkeypatch.setattr(logger.file, "write", blocked_write)
+    logger.log_many([1, 2], [0.0, 0.0])          # ocupa a thread de escrita
+    assert writing.wait(5)
+    logger.log_many([3], [0.0])                  # cabe na fila
+    logger.log_many([4, 5, 6], [0.0, 0.0, 0.0])  # fila cheia: descartado
+    logger.log(7, 0.0)
+
+    assert logger.dropped_rows == 4
+    assert logger.metrics()["dropped_rows"] == 4
+    assert logger.metrics()["pending_blocks"] == 1
+    release.set()
+    logger.stop()
+
+    with open(logger.path, newline="") as f:
+        assert [row[0] for row in csv.reader(f)][1:] == ["1", "2", "3"]
+
+def test_data_logger_saves_calibration_with_session(tmp_path):
+    calibrator = ACS712Calibrator()
+    calibrator.fit_curve([-1000, 0, 1000], [-1100, 0, 1050])
+    logger = DataLogger(output_dir=tmp_path)
+    logger.start(device_name="test_device", calibration=calibrator.to_dict())
+    logger.stop()
+
+    loaded = ACS712Calibrator.load(DataLogger.calibration_path(logger.path))
+    assert np.array_equal(loaded.lut, calibrator.lut)
@@ -0,0 +1,61 @@
+import numpy as np
+from src.core.decimation import MinMaxPyramid
+
+def test_levels_aggregate_incrementally():
+    pyr = MinMaxPyramid(levels=3, factor=4, capacity=64)
+    values = np.arange(40, dtype=float)
+    for block in np.array_split(np.arange(40), 7):
+        pyr.extend(block * 10, values[block])
+
+    t1, lo1, hi1, mean1 = pyr.levels[1].view()
+    assert t1.tolist() == list(range(0, 400, 40))
+    assert lo1.tolist() == list(range(0, 40, 4))
+    assert hi1.tolist() == list(range(3, 40, 4))
+    assert mean1[0] == 1.5
+    assert len(pyr.levels[2]) == 2  # 40 amostras = 2 buckets de 16 + restos pendentes
+
+def test_query_respects_point_budget_and_keeps_spikes():
+    pyr = MinMaxPyramid(levels=4, factor=8, capacity=4096)
+    t = np.arange(20_000) * 16
+    v = np.zeros(20_000)
+    v[12_345] = 5000.0                      # pico de uma única amostra
+    pyr.extend(t, v)
+
+    x, y = pyr.envelope(t[0], t[-1], max_points=1000)
+    assert len(x) <= 1000
+    assert y.max() == 5000.0
+
+    x, y = pyr.envelope(t[19_000], t[19_050], max_points=1000)
+    assert x.tolist() == t[19_000:19_051].tolist()  # janela curta: amostras brutas
+
+def test_old_history_served_by_coarse_levels():
+    pyr = MinMaxPyramid(levels=3, factor=4, capacity=16)
+    pyr.extend(np.arange(200), np.arange(200, dtype=float))
+    t, lo, hi, level = pyr.query(0, 199, max_points=4000)
+    assert level == 2            # níveis finos já descartaram o início
+    assert lo[0] == 0.0
+
+def test_long_history_stays_within_point_budget():
+    pyr = MinMaxPyramid(levels=3, factor=4, capacity=1024)
+    t = np.arange(200_000) * 16
+    v = np.zeros(len(t))
+    v[190_001] = -3000.0                    # vale curto dentro do histórico retido
+    pyr.extend(t, v)
+    for max_points in (100, 301, 1000):
+        t_lo, lo, hi, level = pyr.query(t[0], t[-1], max_points)
+        assert len(t_lo) * 2 <= max_points and level == 3
+        assert lo.min() == -3000.0
+        x, y = pyr.envelope(t[0], t[-1], max_points)
+        assert len(x) <= max_points
+
+
+def test_oversized_blocks_and_clear_keep_ring_consistent():
+    pyr = MinMaxPyramid(levels=2, factor=4, capacity=16)
+    pyr.extend(np.arange(50), np.arange(50, dtype=float))   # maior que a capacidade
+    pyr.extend(np.arange(50, 53), np.arange(50, 53, dtype=float))
+    assert pyr.levels[0].view()[0].tolist() == list(range(37, 53))
+    pyr.clear()
+    assert len(pyr) == 0 and len(pyr.levels[1]) == 0
+    pyr.extend(np.arange(8), np.arange(8, dtype=float))
+    assert pyr.levels[0].view()[0].tolist() == list(range(8))
+    assert pyr.levels[1].view()[1].tolist() == [0.0, 4.0]
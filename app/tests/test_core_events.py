@@ -0,0 +1,69 @@
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.app_controller import AppController
+from src.core.events import LoadEventDetector, detect_events_file, events_path
+from src.drivers.virtual_device import VirtualSerialReader
+from src import analyze_logs, backfill_rollups
+
+def profile():
+    """Standby 100 mA -> ativo 600 mA -> partida de motor (inrush) -> standby."""
+    rng = np.random.default_rng(0)
+    cur = np.r_[np.full(200, 100.0), np.full(300, 600.0), np.full(5, 3000.0),
+                np.full(200, 600.0), np.full(300, 100.0)]
+    cur += rng.normal(0, 10, len(cur))
+    ts = np.arange(len(cur), dtype=np.int64) * 16
+    return ts, cur
+
+def test_detects_steps_and_spike_with_constant_state():
+    events = []
+    det = LoadEventDetector(step_mA=100, spike_mA=1000, callback=events.append)
+    ts, cur = profile()
+    for block in np.array_split(np.arange(len(ts)), 17):
+        det.update_block(ts[block], cur[block])
+
+    assert [e.kind for e in events] == ["step_up", "spike", "step_down"]
+    up, spike, down = events
+    assert up.timestamp_ms == pytest.approx(200 * 16, abs=3 * 16)
+    assert up.magnitude_mA == pytest.approx(500, abs=30)
+    assert up.duration_ms == pytest.approx(200 * 16, abs=3 * 16)
+    assert spike.timestamp_ms == 500 * 16
+    assert spike.duration_ms == 5 * 16
+    assert spike.magnitude_mA == pytest.approx(2400, abs=50)
+    assert down.level_mA == pytest.approx(100, abs=30)
+
+def test_long_spike_is_reported_as_step():
+    events = []
+    det = LoadEventDetector(spike_mA=1000, spike_max_ms=500, callback=events.append)
+    det.update_block(np.arange(200) * 10, np.r_[np.zeros(100), np.full(100, 2000.0)])
+    assert [e.kind for e in events] == ["step_up"]
+    assert events[0].timestamp_ms == 1000
+    assert events[0].level_mA == pytest.approx(2000, rel=0.01)
+
+def test_batch_mode_over_file(tmp_path):
+    ts, cur = profile()
+    path = tmp_path / "session.csv"
+    pd.DataFrame({"timestamp_ms": ts, "current_mA": cur}).to_csv(path, index=False)
+    events = detect_events_file(path, chunksize=128)
+    assert [e.kind for e in events] == ["step_up", "spike", "step_down"]
+
+def test_controller_logs_events(tmp_path):
+    reader = VirtualSerialReader.synthetic(rate_hz=62.5, duration_s=10, profile="steps", speed=None)
+    controller = AppController(reader=reader, output_dir=tmp_path, sample_rate_hz=62.5)
+    received = []
+    controller.on_event = received.append
+    controller.start()
+    time.sleep(0.3)
+    controller.stop()
+
+    assert received and list(controller.recent_events) == received
+    logged = pd.read_csv(events_path(controller.logger.path))
+    assert len(logged) == len(received)
+    assert set(logged["kind"]) <= {"step_up", "step_down", "spike"}
+
+    # o arquivo de eventos não entra nos globs de sessão das ferramentas offline
+    sessions = sorted(map(str, tmp_path.glob("*.csv")))
+    assert sessions == [str(controller.logger.path)]
+    analyze_logs.main([*sessions, "-o", str(tmp_path / "summary.out")])
+    backfill_rollups.main([*sessions, "--db", str(tmp_path / "rollups.sqlite")])
@@ -0,0 +1,77 @@
+import json
+import time
+from src.core.metrics import LatencyHistogram, Metrics, MetricsDumper
+from src.core.app_controller import AppController
+from src.drivers.virtual_device import VirtualSerialReader
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram()
+    for _ in range(99):
+        hist.record(0.0005)       # 500 us
+    hist.record(0.1)              # 100 ms
+    summary = hist.summary()
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 0.512
+    assert summary["p99_ms"] == 0.512
+    assert summary["max_ms"] == 100.0
+
+def test_snapshot_and_sources():
+    metrics = Metrics(enabled=True)
+    metrics.incr("a", 3)
+    metrics.gauge("depth", 7)
+    metrics.observe("lat", 0.001)
+    metrics.register_source("ok", lambda: {"x": 1})
+    metrics.register_source("broken", lambda: 1 / 0)
+    snap = metrics.snapshot()
+    assert snap["counters"] == {"a": 3}
+    assert snap["gauges"] == {"depth": 7}
+    assert snap["latency"]["lat"]["count"] == 1
+    assert snap["ok"] == {"x": 1}
+    assert "error" in snap["broken"]
+
+def test_pipeline_instrumentation_and_dump(tmp_path, monkeypatch):
+    metrics = Metrics(enabled=True)
+    for module in ("app_controller", "data_logger"):
+        monkeypatch.setattr(f"src.core.{module}.METRICS", metrics)
+    monkeypatch.setattr("src.drivers.serial_reader.METRICS", metrics)
+
+    dump = tmp_path / "metrics.jsonl"
+    reader = VirtualSerialReader.synthetic(rate_hz=1000, duration_s=1, speed=None)
+    controller = AppController(reader=reader, output_dir=tmp_path, metrics_dump_path=dump,
+                               metrics_dump_interval_s=60)
+    controller.start()
+    time.sleep(0.3)
+    controller.stop()
+
+    snap = metrics.snapshot()
+    assert snap["counters"]["serial.samples"] == 1000
+    assert snap["counters"]["core.samples"] == 1000
+    assert snap["counters"]["logger.rows"] == 1000
+    assert {"serial.parse", "core.process_block", "logger.commit"} <= set(snap["latency"])
+    assert snap["controller"]["dropped"] == 0
+    lines = dump.read_text().splitlines()
+    assert json.loads(lines[-1])["counters"]["core.samples"] == 1000
+
+def test_disabled_metrics_record_nothing(tmp_path, monkeypatch):
+    metrics = Metrics(enabled=False)
+    monkeypatch.setattr("src.core.app_controller.METRICS", metrics)
+    reader = VirtualSerialReader.synthetic(rate_hz=1000, duration_s=0.1, speed=None)
+    controller = AppController(reader=reader, output_dir=tmp_path)
+    controller.start()
+    time.sleep(0.1)
+    controller.stop()
+    assert metrics.snapshot()["counters"] == {}
+
+def test_dumper_writes_periodic_and_final_snapshots(tmp_path):
+    metrics = Metrics(enabled=True)
+    metrics.incr("a")
+    path = tmp_path / "metrics.jsonl"
+    dumper = MetricsDumper(metrics, path, interval_s=0.05)
+    dumper.start()
+    time.sleep(0.3)
+    metrics.incr("a")
+    dumper.stop()
+    snapshots = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(snapshots) >= 3                      # periódicos + o final do stop()
+    assert snapshots[0]["counters"] == {"a": 1}
+    assert snapshots[-1]["counters"] == {"a": 2}
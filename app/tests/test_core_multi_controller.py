@@ -0,0 +1,70 @@
+import io
+import os
+import time
+from src.core.multi_controller import MultiDeviceController
+
+class PipeSerial:
+    """Porta falsa selecionável: lê de um os.pipe não bloqueante."""
+    def __init__(self, data: bytes):
+        self._r, w = os.pipe()
+        os.set_blocking(self._r, False)
+        os.write(w, data)
+        os.close(w)
+        self.is_open = True
+
+    def fileno(self):
+        return self._r
+
+    def read(self, size=1):
+        try:
+            return os.read(self._r, size)
+        except BlockingIOError:
+            return b""
+
+    def close(self):
+        self.is_open = False
+        os.close(self._r)
+
+class PolledSerial:
+    """Porta falsa sem fileno (como no Windows): exige polling."""
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return len(self.data.getbuffer()) - self.data.tell()
+
+    def read(self, size=1):
+        return self.data.read(size)
+
+    def close(self):
+        self.is_open = False
+
+STREAMS = {
+    "/dev/ttyUSB0": b"0,100\r\n16,100\r\n32,1",
+    "/dev/ttyUSB1": b"0,200\r\nxx\r\n16,400\r\n",
+}
+
+def run_controller(monkeypatch, tmp_path, serial_cls):
+    monkeypatch.setattr("serial.Serial", lambda port, *a, **kw: serial_cls(STREAMS[port]))
+    ctrl = MultiDeviceController(list(STREAMS), output_dir=tmp_path)
+    ctrl.channels["/dev/ttyUSB1"].calibrator.offset_mA = 100
+    ctrl.start()
+    time.sleep(0.3)
+    ctrl.stop()
+    return ctrl
+
+def test_multiplexed_ports_with_selector(monkeypatch, tmp_path):
+    ctrl = run_controller(monkeypatch, tmp_path, PipeSerial)
+    summary = ctrl.summarize()
+    assert summary["/dev/ttyUSB0"]["count"] == 2
+    assert summary["/dev/ttyUSB1"]["avg_mA"] == 200.0  # calibrador próprio
+    assert ctrl.metrics()["invalid_lines"] == {"/dev/ttyUSB0": 0, "/dev/ttyUSB1": 1}
+    names = sorted(p.name.rsplit("_", 2)[0] for p in tmp_path.glob("*.csv"))
+    assert names == ["energy_monitor_dev_ttyUSB0", "energy_monitor_dev_ttyUSB1"]
+
+def test_multiplexed_ports_with_polling(monkeypatch, tmp_path):
+    ctrl = run_controller(monkeypatch, tmp_path, PolledSerial)
+    assert ctrl.channels["/dev/ttyUSB0"].samples.timestamps().tolist() == [0, 16]
+    assert ctrl.channels["/dev/ttyUSB1"].samples.currents().tolist() == [100.0, 300.0]
@@ -0,0 +1,37 @@
+import csv
+import pytest
+from src.analyze_logs import main
+from src.core.offline_analysis import analyze_file, analyze_files
+
+def write_log(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp_ms", "current_mA"])
+        writer.writerows(rows)
+    return path
+
+def test_analyze_file_windows_across_chunks(tmp_path):
+    # 0..1980 ms a 100 mA e 2000..3980 ms a 300 mA (janelas de 2 s)
+    rows = [(t, 100 if t < 2000 else 300) for t in range(0, 4000, 20)]
+    path = write_log(tmp_path / "a.csv", rows)
+
+    result = analyze_file(path, window_s=2, offset_mA=50, scale=2.0, chunksize=7)
+    assert [r["window_start_s"] for r in result] == [0, 2, "total"]
+    assert result[0]["avg_mA"] == pytest.approx(100.0)
+    assert result[1]["avg_mA"] == pytest.approx(500.0)
+    assert result[2]["count"] == 200
+    assert result[2]["avg_mA"] == pytest.approx(300.0)
+
+def test_analyze_files_in_parallel(tmp_path):
+    paths = [write_log(tmp_path / f"{i}.csv", [(t, 10 * (i + 1)) for t in range(100)])
+             for i in range(3)]
+    rows = analyze_files(paths, workers=2)
+    assert [r["avg_mA"] for r in rows] == pytest.approx([10.0, 20.0, 30.0])
+
+def test_cli_writes_summary(tmp_path):
+    path = write_log(tmp_path / "a.csv", [(0, 100), (20, 200)])
+    out = tmp_path / "summary.csv"
+    main([str(path), "--workers", "1", "-o", str(out)])
+    rows = list(csv.DictReader(open(out)))
+    assert rows[0]["window_start_s"] == "total"
+    assert float(rows[0]["avg_mA"]) == 150.0
@@ -0,0 +1,50 @@
+import time
+from pathlib import Path
+from functools import partial
+import pytest
+from src.core.process_controller import ProcessController
+from src.drivers.virtual_device import VirtualSerialReader
+
+def test_acquisition_runs_in_child_process(tmp_path):
+    factory = partial(VirtualSerialReader.synthetic, rate_hz=62.5, duration_s=4,
+                      profile="constant", speed=None)
+    controller = ProcessController(sample_rate_hz=62.5, output_dir=tmp_path, reader_factory=factory)
+    controller.calibrator.offset_mA = 100.0
+    controller.start()
+    try:
+        deadline = time.monotonic() + 10
+        while controller.samples.total < 250 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        timestamps, currents, seq = controller.samples.since(0)
+        assert seq == 250
+        assert currents[0] == pytest.approx(500.0 - 100.0)   # calibrado no processo filho
+    finally:
+        controller.stop()
+
+    assert controller.summarize()["count"] == 250
+    assert controller.metrics()["processed"] == 250
+    assert Path(controller.session_path).parent == tmp_path
+    controller.close()
+
+def test_start_error_is_reported(tmp_path):
+    controller = ProcessController(port="/dev/does-not-exist", output_dir=tmp_path)
+    with pytest.raises(RuntimeError):
+        controller.start()
+    controller.close()
+
+def test_status_channel_stays_bounded_without_polling(tmp_path):
+    factory = partial(VirtualSerialReader.synthetic, rate_hz=62.5, duration_s=30,
+                      profile="constant", speed=1.0)
+    controller = ProcessController(sample_rate_hz=62.5, output_dir=tmp_path, reader_factory=factory)
+    controller.start()
+    try:
+        time.sleep(6 * 0.5)                  # vários STATUS_INTERVAL_S sem ler o status
+        assert controller._latest.qsize() <= 1
+        assert controller._status.qsize() == 0
+        assert controller.metrics()["processed"] > 0
+    finally:
+        start = time.monotonic()
+        controller.stop()
+        assert time.monotonic() - start < 5
+    assert controller.summarize()["count"] == controller.samples.total
+    controller.close()
@@ -0,0 +1,92 @@
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.app_controller import AppController
+from src.core.rollup import RollupStore, backfill_file, parse_session_name
+from src.drivers.virtual_device import VirtualSerialReader
+from src.backfill_rollups import main as backfill_main
+
+def test_rollups_match_raw_aggregates(tmp_path):
+    store = RollupStore(tmp_path / "r.sqlite", voltage_v=5.0)
+    rng = np.random.default_rng(1)
+    ts = np.arange(0, 7200 * 1000, 100, dtype=np.int64)      # 2 h a 10 Hz
+    cur = rng.uniform(0, 1000, len(ts))
+    store.open_session("dev", start_s=1_700_000_000 - 1_700_000_000 % 3600, sample_rate_hz=10)
+    for block in np.array_split(np.arange(len(ts)), 37):     # blocos cruzam buckets
+        store.update_block(ts[block], cur[block])
+
+    hours = store.query(0, 2 ** 40, resolution_s=3600)
+    assert len(hours) == 2
+    first = cur[:36000]
+    assert hours[0]["count"] == 36000
+    assert hours[0]["avg_mA"] == pytest.approx(first.mean())
+    assert hours[0]["rms_mA"] == pytest.approx(np.sqrt(np.mean(first ** 2)))
+    assert hours[0]["max_mA"] == pytest.approx(first.max())
+    # trapézios sobre o tempo real: intervalos que terminam na primeira hora
+    charge_mAs = np.sum(0.5 * (cur[:35999] + cur[1:36000]) * 0.1)
+    assert hours[0]["energy_Wh"] == pytest.approx(charge_mAs * 5.0 / 1000 / 3600)
+
+    minutes = store.query(hours[1]["bucket_s"], hours[1]["bucket_s"] + 600, resolution_s=60)
+    assert len(minutes) == 10 and all(m["count"] == 600 for m in minutes)
+    seconds = store.query(hours[0]["bucket_s"] + 59.5, hours[0]["bucket_s"] + 62, resolution_s=1)
+    assert [s["bucket_s"] - hours[0]["bucket_s"] for s in seconds] == [59, 60, 61]
+    store.close()
+
+def test_backfill_is_idempotent(tmp_path):
+    path = tmp_path / "energy_monitor_20240102_030405.csv"
+    ts = np.arange(0, 120_000, 20, dtype=np.int64)
+    pd.DataFrame({"timestamp_ms": ts, "current_mA": np.full(len(ts), 200.0)}).to_csv(path, index=False)
+    device, start_s = parse_session_name(path)
+    assert device == "energy_monitor"
+    assert start_s == datetime(2024, 1, 2, 3, 4, 5).timestamp()
+
+    store = RollupStore(tmp_path / "r.sqlite")
+    assert backfill_file(store, path, sample_rate_hz=50, chunksize=1000) == len(ts)
+    assert backfill_file(store, path, sample_rate_hz=50) == 0
+    minutes = store.query(start_s, start_s + 3600, resolution_s=60, device="energy_monitor")
+    assert sum(m["count"] for m in minutes) == len(ts)
+    assert minutes[0]["bucket_s"] == start_s - 5
+    store.close()
+
+    backfill_main([str(path), "--db", str(tmp_path / "r.sqlite"), "--report", "3600"])
+
+def test_interrupted_backfill_is_not_marked_imported(tmp_path, monkeypatch):
+    path = tmp_path / "energy_monitor_20240102_030405.csv"
+    ts = np.arange(0, 120_000, 20, dtype=np.int64)
+    pd.DataFrame({"timestamp_ms": ts, "current_mA": np.full(len(ts), 200.0)}).to_csv(path, index=False)
+    store = RollupStore(tmp_path / "r.sqlite", flush_interval_s=0)   # flush a cada bloco
+    update_block = store.update_block
+    calls = []
+
+    def failing_update(timestamps, currents):
+        calls.append(len(timestamps))
+        if len(calls) == 3:
+            raise KeyboardInterrupt   # importação interrompida no meio do arquivo
+        update_block(timestamps, currents)
+
+    monkeypatch.setattr(store, "update_block", failing_update)
+    with pytest.raises(KeyboardInterrupt):
+        backfill_file(store, path, sample_rate_hz=50, chunksize=1000)
+    assert not store.has_source(path)
+    assert store.query(0, 2 ** 62, resolution_s=60) == []
+
+    monkeypatch.setattr(store, "update_block", update_block)
+    assert backfill_file(store, path, sample_rate_hz=50, chunksize=1000) == len(ts)
+    assert store.has_source(path)
+    assert sum(m["count"] for m in store.query(0, 2 ** 62, resolution_s=60)) == len(ts)
+    store.close()
+
+def test_controller_feeds_rollups(tmp_path):
+    reader = VirtualSerialReader.synthetic(rate_hz=62.5, duration_s=10, profile="constant", speed=None)
+    controller = AppController(reader=reader, output_dir=tmp_path, sample_rate_hz=62.5,
+                               rollup_db=tmp_path / "rollups.sqlite")
+    controller.start()
+    time.sleep(0.3)
+    controller.stop()
+
+    rows = controller.rollups.query(0, time.time() + 60, resolution_s=60)
+    assert sum(r["count"] for r in rows) == 625
+    assert controller.rollups.has_source(controller.logger.path)
+    controller.rollups.close()
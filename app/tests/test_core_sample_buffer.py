@@ -0,0 +1,101 @@
+import sys
+import threading
+import numpy as np
+from src.core.sample_buffer import SampleBuffer
+
+def test_append_and_latest_views():
+    buf = SampleBuffer(capacity=4)
+    for i in range(6):
+        buf.append(i * 10, float(i))
+    ts, cur = buf.latest()
+    assert len(buf) == 4
+    assert buf.total == 6
+    assert ts.tolist() == [20, 30, 40, 50]
+    assert cur.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert np.shares_memory(cur, buf._currents)  # sem cópia
+    assert buf.last() == (50, 5.0)
+
+def test_extend_wraps_around():
+    buf = SampleBuffer(capacity=5)
+    buf.extend(np.arange(3), np.arange(3, dtype=float))
+    buf.extend(np.arange(3, 10), np.arange(3, 10, dtype=float))
+    ts, cur = buf.latest(3)
+    assert ts.tolist() == [7, 8, 9]
+    assert buf.currents().tolist() == [5.0, 6.0, 7.0, 8.0, 9.0]
+    assert buf.total == 10
+
+def test_empty_buffer():
+    buf = SampleBuffer(capacity=3)
+    assert len(buf) == 0
+    assert buf.last() is None
+    assert len(buf.currents()) == 0
+
+def test_since_returns_only_new_samples():
+    buf = SampleBuffer(capacity=4)
+    buf.extend([0, 1, 2], [0.0, 1.0, 2.0])
+    ts, _, seq = buf.since(0)
+    assert ts.tolist() == [0, 1, 2] and seq == 3
+    ts, _, seq = buf.since(seq)
+    assert len(ts) == 0 and seq == 3
+    buf.extend(np.arange(3, 9), np.zeros(6))   # consumidor atrasado além da capacidade
+    ts, _, seq = buf.since(seq)
+    assert ts.tolist() == [5, 6, 7, 8] and seq == 9
+
+def test_oversized_extend_keeps_sequence_consistent():
+    buf = SampleBuffer(capacity=4)
+    buf.extend(np.arange(7), np.arange(7, dtype=float))
+    buf.append(7, 7.0)
+    ts, _, seq = buf.since(6)
+    assert ts.tolist() == [6, 7] and seq == 8
+    assert buf.timestamps().tolist() == [4, 5, 6, 7]
+
+def test_since_with_concurrent_writer():
+    """Leitor e escritor simultâneos: nenhuma amostra repetida ou perdida."""
+    buf = SampleBuffer(capacity=2 ** 17)
+    data = np.arange(100_000)
+    sizes = np.random.default_rng(0).integers(1, 200, 2000)
+    bounds = np.minimum(np.cumsum(sizes), len(data))
+
+    def writer():
+        start = 0
+        for end in bounds:
+            buf.extend(data[start:end], data[start:end].astype(float))
+            start = end
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)   # troca de thread frequente, inclusive no meio de extend()
+    try:
+        thread = threading.Thread(target=writer)
+        thread.start()
+        received, seq = [], 0
+        while thread.is_alive() or seq < buf.total:
+            ts, cur, seq = buf.since(seq)
+            received.append(ts.copy())
+            assert np.array_equal(ts, cur)
+        thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert np.array_equal(np.concatenate(received), data[:bounds[-1]])
+
+def test_since_during_extend_sees_only_published_samples():
+    """Leitura no instante entre a escrita dos dados e a publicação do total."""
+    class ProbedBuffer(SampleBuffer):
+        probe = None
+
+        @property
+        def total(self):
+            return self._total
+
+        @total.setter
+        def total(self, value):
+            if self.probe:
+                self.probe()
+            self._total = value
+
+    buf = ProbedBuffer(capacity=16)
+    buf.extend(np.arange(5), np.arange(5, dtype=float))
+    seen = []
+    buf.probe = lambda: seen.append(buf.since(3)[0].tolist())
+    buf.extend(np.arange(5, 9), np.arange(5, 9, dtype=float))
+    assert seen == [[3, 4]]
+    assert buf.since(3)[0].tolist() == [3, 4, 5, 6, 7, 8]
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from src.core.data_logger import DataLogger
+from src.core.segments import SegmentReader, compress_file, list_segments, segment_path, session_of
+from src.core.offline_analysis import analyze_file, analyze_files
+from src.core.rollup import RollupStore, backfill_file, parse_session_name
+
+def record(tmp_path, n=20000, block=500, **options):
+    logger = DataLogger(output_dir=tmp_path, async_write=True, flush_rows=block, **options)
+    logger.start(device_name="dev", metadata={"sample_rate_hz": 62.5})
+    ts = np.arange(n, dtype=np.int64) * 16
+    cur = (np.arange(n) % 1000).astype(np.float64)
+    for i in range(0, n, block):
+        logger.log_many(ts[i:i + block], cur[i:i + block])
+    logger.stop()
+    return logger.path, ts, cur
+
+@pytest.mark.parametrize("file_format,compression", [("csv", "gzip"), ("binary", "lzma"), ("csv", None)])
+def test_rotated_session_reads_as_one_stream(tmp_path, file_format, compression):
+    path, ts, cur = record(tmp_path, rotate_bytes=16_000, compression=compression,
+                           file_format=file_format)
+    segments = list_segments(path)
+    assert len(segments) > 3
+    assert segments[0].name.startswith(path.name)
+    if compression:
+        # todos os segmentos fechados por rotação estão comprimidos; o último fica em texto puro
+        assert all(p.suffix in (".gz", ".xz") for p in segments[:-1])
+        assert segments[-1] == segment_path(path, len(segments) - 1)
+
+    reader = SegmentReader(path, chunk_size=777)
+    chunks = list(reader.iter_chunks())
+    np.testing.assert_array_equal(np.concatenate([c[0] for c in chunks]), ts)
+    np.testing.assert_allclose(np.concatenate([c[1] for c in chunks]), cur, atol=1e-3)
+
+def test_seek_by_timestamp(tmp_path):
+    path, ts, _ = record(tmp_path, rotate_bytes=16_000, compression="gzip")
+    reader = SegmentReader(path)
+    target = int(ts[15000])
+    index = reader.find_segment(target)
+    assert reader.first_timestamp(index) <= target
+    assert index == len(reader) - 1 or reader.first_timestamp(index + 1) > target
+
+    got = np.concatenate([c[0] for c in reader.iter_chunks(start_ms=target, end_ms=target + 1600)])
+    np.testing.assert_array_equal(got, ts[15000:15100])
+    # só os segmentos a partir do alvo são abertos
+    assert len(reader._first_ts) < len(reader)
+
+def test_compress_file_replaces_original(tmp_path):
+    path = tmp_path / "s.csv"
+    path.write_text("timestamp_ms,current_mA\n1,2.0\n")
+    target = compress_file(path, "gzip")
+    assert not path.exists() and target.name == "s.csv.gz"
+    assert list_segments(path) == [target]
+
+def test_session_of_maps_segments_to_session(tmp_path):
+    session = tmp_path / "dev_20261018_073724.csv"
+    session.write_text("timestamp_ms,current_mA\n")
+    for name in ("dev_20261018_073724.csv", "dev_20261018_073724.0001.csv",
+                 "dev_20261018_073724.0012.csv.gz", "dev_20261018_073724.csv.xz"):
+        assert session_of(tmp_path / name) == session
+    assert session_of(tmp_path / "data.2024.csv") == tmp_path / "data.2024.csv"
+    assert parse_session_name(tmp_path / "dev_20261018_073724.0001.csv.gz")[0] == "dev"
+
+@pytest.mark.parametrize("file_format", ["csv", "binary"])
+def test_offline_tools_read_rotated_sessions(tmp_path, file_format):
+    path, ts, cur = record(tmp_path, rotate_bytes=16_000, compression="gzip",
+                           file_format=file_format)
+    segments = list_segments(path)
+    assert len(segments) > 3
+
+    store = RollupStore(tmp_path / "rollups.sqlite")
+    assert backfill_file(store, segments[2]) == len(ts)     # qualquer segmento traz a sessão toda
+    assert all(backfill_file(store, p) == 0 for p in segments)
+    assert sum(row["count"] for row in store.query(0, 2 ** 62, 3600)) == len(ts)
+    store.close()
+
+    rows = analyze_files(segments, workers=1)
+    assert len(rows) == 1 and rows[0]["count"] == len(ts)
+    assert rows[0]["avg_mA"] == pytest.approx(cur.mean(), abs=1e-3)
+    start, end = int(ts[7000]), int(ts[12000])
+    ranged = analyze_file(segments[-1], start_ms=start, end_ms=end)
+    assert ranged[-1]["count"] == 5000
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from src.core.analysis import DataAnalyzer
+from src.core.data_logger import DataLogger
+from src.core.session_file import SessionReader, SessionWriter, csv_to_session
+
+def test_write_append_and_memmap(tmp_path):
+    path = tmp_path / "s.ecm"
+    writer = SessionWriter(path, sample_rate_hz=62.5, offset_mA=1.5, scale=1.02)
+    writer.append(np.array([0, 16]), np.array([100.0, 200.0]))
+    writer.close()
+
+    # Reabrir continua a mesma sessão, preservando o cabeçalho original
+    writer = SessionWriter(path, sample_rate_hz=1.0)
+    writer.append(np.array([32]), np.array([300.0]))
+    writer.close()
+
+    session = SessionReader(path)
+    assert isinstance(session.records, np.memmap)
+    assert session.timestamps.tolist() == [0, 16, 32]
+    assert session.currents.tolist() == [100.0, 200.0, 300.0]
+    assert session.metadata == {"sample_rate_hz": 62.5, "offset_mA": 1.5, "scale": 1.02}
+    assert DataAnalyzer.average_current(session.currents) == 200.0
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "x.ecm"
+    path.write_bytes(b"timestamp_ms,current_mA\n" * 4)
+    with pytest.raises(ValueError):
+        SessionReader(path)
+
+def test_csv_conversion_and_binary_logger(tmp_path):
+    logger = DataLogger(output_dir=tmp_path)
+    logger.start(device_name="dev")
+    logger.log_many(np.arange(5) * 16, np.arange(5) * 10.0)
+    logger.stop()
+
+    out = csv_to_session(logger.path, sample_rate_hz=62.5, chunksize=2)
+    session = SessionReader(out)
+    assert session.timestamps.tolist() == [0, 16, 32, 48, 64]
+    assert [ts.tolist() for ts, _ in session.iter_chunks(2)] == [[0, 16], [32, 48], [64]]
+
+    binary = DataLogger(output_dir=tmp_path, file_format="binary", async_write=True)
+    binary.start(device_name="bin", metadata={"sample_rate_hz": 62.5})
+    binary.log_many(np.arange(3), np.ones(3))
+    binary.stop()
+    assert SessionReader(binary.path).currents.tolist() == [1.0, 1.0, 1.0]
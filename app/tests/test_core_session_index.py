@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from src.core.data_logger import DataLogger
+from src.core.offline_analysis import analyze_file
+from src.core.segments import compress_file
+from src.core.session_index import (SessionIndex, build_index, index_path, load_range,
+                                    read_range)
+
+def record(tmp_path, n=25_000, **options):
+    logger = DataLogger(output_dir=tmp_path, async_write=True, flush_rows=700, index_every=100,
+                        **options)
+    logger.start(device_name="dev", metadata={"sample_rate_hz": 62.5})
+    ts = np.cumsum(np.random.default_rng(0).integers(10, 20, n)).astype(np.int64)
+    cur = np.linspace(-500, 2500, n)
+    for i in range(0, n, 333):
+        logger.log_many(ts[i:i + 333], cur[i:i + 333])
+    logger.stop()
+    return logger.path, ts, cur
+
+def test_index_written_while_recording_matches_rebuild(tmp_path):
+    path, ts, _ = record(tmp_path)
+    live = SessionIndex(path).checkpoints.copy()
+    assert len(live) == 250
+    np.testing.assert_array_equal(live["timestamp_ms"], ts[::100])
+
+    index_path(path).unlink()
+    build_index(path, every_n=100)
+    np.testing.assert_array_equal(SessionIndex(path).checkpoints, live)
+
+    # offsets apontam exatamente para o início das linhas
+    with open(path, "rb") as f:
+        f.seek(int(live["offset"][37]))
+        assert f.readline().split(b",")[0] == str(ts[3700]).encode()
+
+@pytest.mark.parametrize("start,end", [(None, None), (0, 1), (5000, 5200), (100_000, 100_001),
+                                       (-10, 50_000), (300_000, 10 ** 9)])
+def test_read_range_equals_full_scan(tmp_path, start, end):
+    path, ts, cur = record(tmp_path)
+    got_ts, got_cur = load_range(path, start, end)
+    mask = np.ones(len(ts), dtype=bool)
+    if start is not None:
+        mask &= ts >= start
+    if end is not None:
+        mask &= ts < end
+    np.testing.assert_array_equal(got_ts, ts[mask])
+    np.testing.assert_allclose(got_cur, cur[mask], atol=5e-4)
+
+def test_range_on_compressed_and_binary_sessions(tmp_path):
+    path, ts, _ = record(tmp_path)
+    gz = compress_file(path, "gzip")
+    got, _ = load_range(gz, ts[1000], ts[1010])
+    np.testing.assert_array_equal(got, ts[1000:1010])
+
+    ecm, ts_b, _ = record(tmp_path / "bin", file_format="binary")
+    assert not index_path(ecm).exists()
+    got = np.concatenate([c[0] for c in read_range(ecm, ts_b[50], ts_b[20_000], chunk_size=999)])
+    np.testing.assert_array_equal(got, ts_b[50:20_000])
+    assert SessionIndex(ecm).metadata["sample_rate_hz"] == 62.5
+
+def test_offline_analysis_uses_range(tmp_path):
+    path, ts, cur = record(tmp_path)
+    rows = analyze_file(path, start_ms=int(ts[5000]), end_ms=int(ts[6000]))
+    assert rows[-1]["count"] == 1000
+    assert rows[-1]["avg_mA"] == pytest.approx(cur[5000:6000].mean(), abs=1e-3)
@@ -0,0 +1,37 @@
+import multiprocessing
+import numpy as np
+from src.core.shared_buffer import SharedSampleBuffer
+
+def _writer(name, blocks):
+    buf = SharedSampleBuffer.attach(name, untrack=False)
+    for start in range(0, blocks * 100, 100):
+        ts = np.arange(start, start + 100)
+        buf.extend(ts, ts * 0.5)
+    buf.close()
+
+def test_same_api_as_sample_buffer():
+    buf = SharedSampleBuffer(capacity=8)
+    buf.extend(np.arange(3), np.arange(3.0))
+    buf.extend(np.arange(3, 14), np.arange(3, 14.0))   # bloco maior que a capacidade
+    ts, cur, seq = buf.since(0)
+    assert seq == 14 and len(buf) == 8
+    np.testing.assert_array_equal(ts, np.arange(6, 14))
+    assert buf.last() == (13, 13.0)
+    ts, _, seq = buf.since(12)
+    np.testing.assert_array_equal(ts, [12, 13])
+    buf.close()
+
+def test_reader_sees_writes_from_another_process():
+    """Escritor em outro processo; o leitor consome por sequência, sem cópia."""
+    buf = SharedSampleBuffer(capacity=4096)
+    proc = multiprocessing.get_context("spawn").Process(target=_writer, args=(buf.name, 20))
+    proc.start()
+    proc.join(timeout=30)
+    assert proc.exitcode == 0
+
+    ts, cur, seq = buf.since(0)
+    assert seq == 2000
+    np.testing.assert_array_equal(ts, np.arange(2000))
+    np.testing.assert_array_equal(cur, np.arange(2000) * 0.5)
+    assert not ts.flags.owndata
+    buf.close()
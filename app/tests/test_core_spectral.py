@@ -0,0 +1,51 @@
+import time
+import numpy as np
+import pytest
+from src.core.app_controller import AppController
+from src.core.spectral import SpectralAnalyzer
+from src.drivers.virtual_device import VirtualSerialReader
+
+FS = 1000.0
+
+def signal(n, f0=50.0):
+    t = np.arange(n) / FS
+    return 100.0 + 1000.0 * np.sin(2 * np.pi * f0 * t) + 100.0 * np.sin(2 * np.pi * 3 * f0 * t)
+
+def test_harmonics_thd_and_crest_factor():
+    results = []
+    spec = SpectralAnalyzer(sample_rate_hz=FS, window_size=1000, hop=250,
+                            harmonics=3, bins_hz=(50.0, 150.0), callback=results.append)
+    for block in np.array_split(signal(2000), 13):
+        spec.update(block)
+
+    assert spec.published == len(results) == 5   # a cada 250 amostras após encher a janela
+    r = spec.latest
+    assert r["dominant_hz"] == pytest.approx(50.0)
+    assert r["dc_mA"] == pytest.approx(100.0, abs=1e-6)
+    assert r["harmonics_mA"][0] == pytest.approx(1000.0, rel=0.01)
+    assert r["harmonics_mA"][2] == pytest.approx(100.0, rel=0.01)
+    assert r["thd"] == pytest.approx(0.1, rel=0.02)
+    assert r["bins_mA"][150.0] == pytest.approx(100.0, rel=0.01)
+    assert r["crest_factor"] > 1.0
+
+def test_analyzer_as_controller_consumer(tmp_path):
+    reader = VirtualSerialReader.synthetic(rate_hz=62.5, duration_s=20, profile="sine", speed=None)
+    assert AppController(reader=reader, output_dir=tmp_path).spectral is None   # opcional
+    controller = AppController(reader=reader, output_dir=tmp_path, sample_rate_hz=62.5,
+                               spectral=True)
+    spec = controller.spectral
+    assert spec in controller.consumers
+    controller.start()
+    time.sleep(0.3)
+    controller.stop()
+    assert spec.published == (1250 - 256) // 64 + 1
+    assert spec.latest["dominant_hz"] == pytest.approx(1.0, abs=62.5 / 256)
+
+def test_reset_clears_published_count():
+    spec = SpectralAnalyzer(sample_rate_hz=FS, window_size=100, hop=50)
+    spec.update(signal(300))
+    assert spec.published == 5
+    spec.reset()
+    assert spec.published == 0 and spec.latest is None
+    spec.update(signal(150))
+    assert spec.published == 2
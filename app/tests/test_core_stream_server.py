@@ -0,0 +1,89 @@
+import sys
+import threading
+import time
+import numpy as np
+import pytest
+from src.core.app_controller import AppController
+from src.core.stream_server import StreamServer, StreamSubscriber
+from src.drivers.virtual_device import VirtualSerialReader
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+def test_fan_out_samples_and_stats():
+    server = StreamServer(stats_source=lambda: {"count": 42}, stats_interval_s=0.1)
+    server.start()
+    subs = [StreamSubscriber(server.address) for _ in range(3)]
+    wait_for(lambda: len(server.clients) == 3)
+
+    server.update_block(np.arange(100), np.arange(100) * 1.5)
+    server.update_block(np.arange(100, 150), np.zeros(50))
+    for sub in subs:
+        received, stats = [], None
+        while sum(len(ts) for ts in received) < 150 or stats is None:
+            message = sub.recv()
+            if message[0] == "samples":
+                received.append(message[1])
+            else:
+                stats = message[1]
+        np.testing.assert_array_equal(np.concatenate(received), np.arange(150))
+        assert stats == {"count": 42}
+        sub.close()
+    server.stop()
+
+@pytest.mark.parametrize("policy", ["skip", "drop"])
+def test_slow_client_does_not_stall_others(policy):
+    server = StreamServer(max_client_bytes=1 << 20, slow_policy=policy, stats_interval_s=60)
+    server.start()
+    slow = StreamSubscriber(server.address)       # nunca lê
+    fast = StreamSubscriber(server.address)
+    wait_for(lambda: len(server.clients) == 2)
+
+    blocks, size = 1000, 2000                     # ~24 MB: enche os buffers do cliente lento
+    got = []
+    reader = threading.Thread(target=lambda: got.extend(
+        fast.recv()[1] for _ in range(blocks)))
+    reader.start()
+    for i in range(blocks):
+        start = time.perf_counter()
+        server.update_block(np.arange(i * size, (i + 1) * size), np.zeros(size))
+        assert time.perf_counter() - start < 0.05  # update_block não bloqueia
+        time.sleep(0.0005)
+    reader.join(timeout=20)
+
+    assert len(got) == blocks and got[-1][-1] == blocks * size - 1
+    if policy == "drop":
+        assert server.dropped_clients == 1
+    else:
+        assert server.skipped_blocks > 0 and server.dropped_clients == 0
+    slow.close()
+    fast.close()
+    server.stop()
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+def test_unix_socket(tmp_path):
+    server = StreamServer(unix_path=str(tmp_path / "stream.sock"))
+    server.start()
+    sub = StreamSubscriber(server.address)
+    wait_for(lambda: len(server.clients) == 1)
+    server.update_block([5], [1.0])
+    kind, ts, cur = sub.recv()
+    assert kind == "samples" and ts.tolist() == [5]
+    sub.close()
+    server.stop()
+
+def test_controller_publishes_stream(tmp_path):
+    reader = VirtualSerialReader.synthetic(rate_hz=62.5, duration_s=10, profile="constant", speed=5.0)
+    controller = AppController(reader=reader, output_dir=tmp_path, sample_rate_hz=62.5, stream_port=0)
+    controller.start()
+    sub = StreamSubscriber(controller.stream.address)
+    kinds = set()
+    deadline = time.monotonic() + 1.5
+    while time.monotonic() < deadline and kinds != {"samples", "stats"}:
+        kinds.add(sub.recv()[0])
+    sub.close()
+    controller.stop()
+    assert kinds == {"samples", "stats"}
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from src.core import timebase
+from src.core.analysis import DataAnalyzer, StreamingStats
+
+
+def test_unwrap_millis_across_counter_wrap():
+    t = (np.arange(100, dtype=np.int64) * 16 + timebase.MILLIS_PERIOD - 800) % timebase.MILLIS_PERIOD
+    unwrapped = timebase.unwrap_millis(t)
+    assert np.all(np.diff(unwrapped) == 16)
+
+    unwrapper = timebase.MillisUnwrapper()
+    blocks = [unwrapper.unwrap(b) for b in np.array_split(t, 7)]
+    assert np.array_equal(np.concatenate(blocks), unwrapped)
+
+
+def test_timing_report_jitter_and_gaps():
+    rng = np.random.default_rng(0)
+    t = np.arange(1000, dtype=np.int64) * 16 + rng.integers(-1, 2, 1000)
+    t[500:] += 2000   # lacuna de 2 s
+    report = timebase.timing_report(t)
+    assert report["period_ms"] == 16
+    assert report["rate_hz"] == pytest.approx(62.5, rel=0.01)
+    assert 0 < report["jitter_max_ms"] <= 2
+    assert report["gaps"] == 1
+    assert report["gap_s"] == pytest.approx(2.016, abs=0.003)
+
+
+def test_resample_uniform_marks_gaps_with_nan():
+    t = np.r_[np.arange(0, 160, 16), np.arange(1000, 1160, 16)]
+    grid, values = timebase.resample_uniform(t, t.astype(float))
+    assert grid[1] - grid[0] == 16
+    inside = (grid > 144) & (grid < 1000)
+    assert np.isnan(values[inside]).all()
+    assert np.allclose(values[~inside], grid[~inside])
+
+
+def test_trapezoid_energy_matches_analytic_and_skips_gaps():
+    t = np.arange(0, 10_001, 16, dtype=np.int64)
+    currents = 100.0 * t / 1000.0   # rampa: 100 mA/s
+    expected = 0.5 * 100.0 * (t[-1] / 1000.0) ** 2 * 5.0 / 1000 / 3600
+    assert timebase.integrate_energy_wh(t, currents) == pytest.approx(expected)
+
+    flat = np.full(len(t), 1000.0)
+    t_gap = t.copy()
+    t_gap[300:] += 60_000   # desconectado por 1 min
+    assert timebase.integrate_energy_wh(t_gap, flat) == pytest.approx(
+        timebase.integrate_energy_wh(t, flat) - 1000.0 * 0.016 * 5.0 / 1000 / 3600)
+
+
+def test_streaming_stats_time_based_across_blocks():
+    rng = np.random.default_rng(2)
+    t = (np.arange(5000, dtype=np.int64) * 16 + timebase.MILLIS_PERIOD - 40_000) % timebase.MILLIS_PERIOD
+    t[3000:] = (t[3000:] + 5000) % timebase.MILLIS_PERIOD   # lacuna de 5 s
+    currents = rng.normal(500.0, 50.0, len(t))
+
+    stats = StreamingStats()
+    for ts, cs in zip(np.array_split(t, 11), np.array_split(currents, 11)):
+        stats.update_batch(cs, ts)
+    summary = stats.summary()
+    assert summary["gaps"] == 1
+    assert summary["gap_s"] == pytest.approx(5.016)
+    assert summary["energy_Wh"] == pytest.approx(
+        DataAnalyzer.estimate_energy_wh(currents, timestamps_ms=t))
+    assert summary["energy_Wh"] == pytest.approx(
+        timebase.integrate_energy_wh(t, currents), rel=1e-12)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from src.core.window_stats import SlidingWindowStats
+from src.core.timebase import MILLIS_PERIOD
+
+
+def brute_force(t, c, horizon_s):
+    sel = c[t > t[-1] - horizon_s * 1000]
+    return {"count": len(sel), "avg_mA": sel.mean(), "rms_mA": np.sqrt(np.mean(sel ** 2)),
+            "min_mA": sel.min(), "max_mA": sel.max()}
+
+
+def test_windows_match_brute_force_at_every_block():
+    rng = np.random.default_rng(3)
+    t = np.cumsum(rng.integers(10, 23, 20_000)).astype(np.int64)
+    c = rng.normal(500.0, 100.0, len(t))
+    stats = SlidingWindowStats(horizons_s=(1, 10, 60))
+    end = 0
+    for block in np.array_split(np.arange(len(t)), 97):
+        stats.update_block(t[block], c[block])
+        end = block[-1] + 1
+        for h in stats.horizons_s:
+            expected = brute_force(t[:end], c[:end], h)
+            window = stats.window(h)
+            assert window["count"] == expected["count"]
+            for key in ("avg_mA", "rms_mA", "min_mA", "max_mA"):
+                assert window[key] == pytest.approx(expected[key], rel=1e-9)
+
+
+def test_ring_grows_when_rate_exceeds_nominal():
+    stats = SlidingWindowStats(horizons_s=(1, 10), sample_rate_hz=10)
+    t = np.arange(0, 30_000, 2, dtype=np.int64)   # 500 Hz
+    c = np.sin(t / 700.0) * 1000
+    stats.update_block(t, c)
+    window = stats.window(10)
+    assert window["count"] == 5000
+    assert window["span_s"] == pytest.approx(9.998)
+    assert window["max_mA"] == pytest.approx(brute_force(t, c, 10)["max_mA"])
+
+
+def test_counter_wrap_and_device_reset():
+    stats = SlidingWindowStats(horizons_s=(1,))
+    t = (np.arange(200, dtype=np.int64) * 16 + MILLIS_PERIOD - 1600) % MILLIS_PERIOD
+    stats.update_block(t, np.full(len(t), 100.0))
+    assert stats.window(1)["count"] == 63
+
+    stats.update_block([5, 21], [300.0, 500.0])   # reset: o relógio volta a zero
+    window = stats.window(1)
+    assert window["count"] == 2 and window["avg_mA"] == 400.0
+
+    stats.reset()
+    assert stats.snapshot() == {1: {}}
+    with pytest.raises(ValueError):
+        stats.window(5)
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+import pytest
+from src.main import main
+
+def test_headless_path_does_not_import_gui_or_serial():
+    """O modo headless não deve carregar Qt, Matplotlib nem pyserial."""
+    code = ("import sys, src.main, src.headless, src.core.app_controller, src.analyze_logs;"
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'PyQt5', 'matplotlib', 'serial'}))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+def test_headless_session_with_virtual_device(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--headless", "--virtual", "constant", "--rate", "62.5", "--duration", "4",
+              "--speed", "0", "--output-dir", str(tmp_path)])
+    assert exit_info.value.code == 0
+
+    out = capsys.readouterr().out
+    assert "[HEADLESS] 250 samples" in out
+    assert len(list(tmp_path.glob("energy_monitor_*_??????.csv"))) == 1
+
+def test_headless_session_with_empty_replay(tmp_path, capsys):
+    replay = tmp_path / "empty.csv"
+    replay.write_text("timestamp_ms,current_mA\n")
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--headless", "--replay", str(replay), "--speed", "0", "--interval", "0.05",
+              "--output-dir", str(tmp_path / "logs")])
+    assert exit_info.value.code == 0
+    assert "[HEADLESS] 0 samples" in capsys.readouterr().out
+
+def test_headless_spectral_report(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--headless", "--virtual", "sine", "--rate", "62.5", "--duration", "20",
+              "--speed", "0", "--spectral", "--output-dir", str(tmp_path)])
+    assert exit_info.value.code == 0
+    assert "[HEADLESS] spectrum: dominant 0.98 Hz" in capsys.readouterr().out
@@ -1,4 +1,14 @@
-from src.drivers.sensor_parser import parse_csv_line
+import numpy as np
+from src.drivers.sensor_parser import (
+    parse_csv_line, parse_csv_block, CsvBlockDecoder, BinaryFrameDecoder, AutoDecoder,
+    decode_frames, detect_format, encode_frames, FRAME_SIZE,
+)
+
+# Fixtures de fluxo binário (sem hardware)
+TIMESTAMPS = np.arange(100, 100 + 16 * 20, 16)
+CURRENTS = np.linspace(-500, 500, 20).round()
+BINARY_STREAM = encode_frames(TIMESTAMPS, CURRENTS)
+CSV_STREAM = b"".join(b"%d,%d\r\n" % (t, c) for t, c in zip(TIMESTAMPS, CURRENTS))
 
 def test_valid_line():
     line = "1234,56.7"
@@ -13,3 +23,59 @@ def test_invalid_line_format():
 def test_invalid_numbers():
     assert parse_csv_line("abc,12") is None
     assert parse_csv_line("12,xyz") is None
+
+def test_parse_csv_block():
+    ts, cur, invalid = parse_csv_block([b"1000,1.5\r", b"1016,-2\r", b"\r"])
+    assert ts.dtype == np.int64 and cur.dtype == np.float32
+    assert ts.tolist() == [1000, 1016]
+    assert cur.tolist() == [1.5, -2.0]
+    assert invalid == 0
+
+def test_parse_csv_block_counts_invalid_lines():
+    ts, cur, invalid = parse_csv_block([b"1000,1.5", b"abc,1", b"1,2,3", b"1032,4"])
+    assert ts.tolist() == [1000, 1032]
+    assert invalid == 2
+
+def test_parse_csv_block_rejects_overflowing_timestamp():
+    ts, cur, invalid = parse_csv_block([b"1000,1.5", b"123456789012345678901234,2", b"1032,4"])
+    assert ts.tolist() == [1000, 1032]
+    assert cur.tolist() == [1.5, 4.0]
+    assert invalid == 1
+    decoder = CsvBlockDecoder()
+    assert decoder.feed(b"99999999999999999999,1\r\n1048,5\r\n")[0].tolist() == [1048]
+    assert decoder.invalid_lines == 1
+
+def test_block_decoder_keeps_partial_lines():
+    decoder = CsvBlockDecoder()
+    ts1, _ = decoder.feed(b"1000,1.0\r\n10")
+    ts2, cur2 = decoder.feed(b"16,2.0\r\nxx\r\n")
+    assert ts1.tolist() == [1000]
+    assert ts2.tolist() == [1016]
+    assert cur2.tolist() == [2.0]
+    assert decoder.invalid_lines == 1
+
+def test_binary_frames_roundtrip():
+    ts, cur, resyncs, consumed, _ = decode_frames(BINARY_STREAM)
+    assert ts.tolist() == TIMESTAMPS.tolist()
+    assert cur.tolist() == CURRENTS.tolist()
+    assert resyncs == 0 and consumed == len(BINARY_STREAM)
+
+def test_binary_decoder_resyncs_after_corruption():
+    corrupted = bytearray(BINARY_STREAM)
+    corrupted[3 * FRAME_SIZE + 4] ^= 0xFF          # CRC inválido no 4º frame
+    stream = b"\x00\xa5" + bytes(corrupted)        # lixo antes do primeiro sync
+    decoder = BinaryFrameDecoder()
+    parts = [decoder.feed(stream[i:i + 7]) for i in range(0, len(stream), 7)]
+    ts = np.concatenate([p[0] for p in parts])
+    assert ts.tolist() == np.delete(TIMESTAMPS, 3).tolist()
+    assert decoder.invalid_lines == 2
+
+def test_protocol_auto_detection():
+    assert detect_format(BINARY_STREAM[:2 * FRAME_SIZE]) == "binary"
+    assert detect_format(CSV_STREAM[:30]) == "csv"
+    assert detect_format(b"12") is None
+    for stream, fmt in ((BINARY_STREAM, "binary"), (CSV_STREAM, "csv")):
+        decoder = AutoDecoder()
+        ts = np.concatenate([decoder.feed(stream[i:i + 5])[0] for i in range(0, len(stream), 5)])
+        assert decoder.format == fmt
+        assert ts.tolist() == TIMESTAMPS.tolist()
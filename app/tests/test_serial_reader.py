@@ -2,6 +2,7 @@ import io
 import time
 import types
 from src.drivers.serial_reader import SerialReader
+from src.drivers.sensor_parser import encode_frames
 
 class MockSerial:
     def __init__(self, data: str):
@@ -27,3 +28,61 @@ def test_read_loop_with_mock(monkeypatch):
     data2 = reader.read(block=True)
     assert data1 == (1000, 250.0)
     assert data2 == (2000, 500.0)
+
+class MockBulkSerial:
+    """Entrega os bytes em blocos de tamanho fixo, quebrando linhas ao meio."""
+    def __init__(self, data: bytes, chunk: int = 7):
+        self.data = io.BytesIO(data)
+        self.chunk = chunk
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return self.chunk
+
+    def read(self, size=1):
+        return self.data.read(min(size, self.chunk))
+
+    def close(self):
+        self.is_open = False
+
+def test_bulk_read_loop_with_mock(monkeypatch):
+    mock = MockBulkSerial(b"1000,250.0\r\n2000,500.0\r\nlixo\r\n3000,-1.5\r\n")
+    monkeypatch.setattr("serial.Serial", lambda *a, **kw: mock)
+
+    reader = SerialReader(port="COM_FAKE", bulk=True)
+    reader.connect()
+    time.sleep(0.1)
+    reader.disconnect()
+
+    timestamps, currents = reader.read_block()
+    assert timestamps.tolist() == [1000, 2000, 3000]
+    assert currents.tolist() == [250.0, 500.0, -1.5]
+    assert reader.invalid_lines == 1
+    assert reader.read_block() is None
+
+def test_full_queue_counts_dropped_samples(monkeypatch):
+    mock = MockSerial("1000,1\n2000,2\n3000,3\n")
+    monkeypatch.setattr("serial.Serial", lambda *a, **kw: mock)
+
+    reader = SerialReader(port="COM_FAKE", max_queue=1)
+    reader.connect()
+    time.sleep(0.1)
+    reader.disconnect()
+
+    assert reader.read() == (1000, 1.0)
+    assert reader.dropped == 2
+
+def test_bulk_read_loop_binary_autodetect(monkeypatch):
+    stream = encode_frames([1000, 1016, 1032], [250, -3, 7])
+    mock = MockBulkSerial(stream, chunk=4)
+    monkeypatch.setattr("serial.Serial", lambda *a, **kw: mock)
+
+    reader = SerialReader(port="COM_FAKE", protocol="auto")
+    reader.connect()
+    time.sleep(0.1)
+    reader.disconnect()
+
+    timestamps, currents = reader.read_block()
+    assert timestamps.tolist() == [1000, 1016, 1032]
+    assert currents.tolist() == [250.0, -3.0, 7.0]
@@ -1,15 +1,17 @@
 import pytest
 from PyQt5.QtWidgets import QApplication
 from src.ui.main_window import MainWindow
+from src.core.sample_buffer import SampleBuffer
 
 class MockController:
     def __init__(self, *_, **__):
-        self.samples = [0.0, 10.0, 20.0]
+        self.samples = SampleBuffer(capacity=8)
+        self.samples.extend([0, 20, 40], [0.0, 10.0, 20.0])
         self.sample_rate_hz = 50
     def start(self): pass
     def stop(self): pass
     def summarize(self):
-        return {"avg_mA": 10.0, "rms_mA": 12.0, "energy_Wh": 0.001}
+        return {"count": 3, "avg_mA": 10.0, "rms_mA": 12.0, "energy_Wh": 0.001}
 
 @pytest.fixture(scope="module")
 def app():
@@ -30,3 +32,57 @@ def test_start_and_stop_flow(app, monkeypatch):
     window.stop_acquisition()
     assert not window.running
     assert "Stopped" in window.status_label.text()
+
+def test_close_without_samples(app, monkeypatch):
+    class SilentController(MockController):
+        def summarize(self):
+            return {}                    # nenhuma amostra recebida
+
+    monkeypatch.setattr("src.ui.main_window.AppController", SilentController)
+    window = MainWindow()
+    window.start_acquisition()
+    window.close()
+    assert not window.running
+    assert window.status_label.text() == "Stopped. 0 samples"
+
+def test_update_ui_reads_buffer(app, monkeypatch):
+    monkeypatch.setattr("src.ui.main_window.AppController", MockController)
+    window = MainWindow()
+    window.start_acquisition()
+    window.update_ui()
+    assert list(window.plot.times) == [0, 20, 40]   # timestamps reais do dispositivo
+    assert list(window.plot.currents) == [0.0, 10.0, 20.0]
+    assert window.window_label.text().startswith("Avg / RMS / Peak  1 s: 10.0 / ")
+
+    window.controller.samples.extend([60, 80], [30.0, 40.0])
+    window.update_ui()
+    assert list(window.plot.currents) == [0.0, 10.0, 20.0, 30.0, 40.0]
+    assert window.MIN_INTERVAL_MS <= window.timer.interval() <= window.MAX_INTERVAL_MS
+
+def test_out_of_process_controllers_are_closed(app, monkeypatch):
+    closed = []
+
+    class ClosingController(MockController):
+        def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr("src.core.process_controller.ProcessController", ClosingController)
+    window = MainWindow(out_of_process=True)
+    window.start_acquisition()
+    first = window.controller
+    window.stop_acquisition()
+    window.start_acquisition()
+    assert closed == [first]             # o anterior é liberado antes do novo start
+    second = window.controller
+    window.close()
+    assert closed == [first, second] and not window.running
+
+def test_metrics_panel_toggle(app, monkeypatch):
+    monkeypatch.setattr("src.ui.main_window.AppController", MockController)
+    window = MainWindow()
+    window.chk_metrics.setChecked(True)
+    try:
+        window.update_metrics_panel()
+        assert "Queue" in window.metrics_label.text()
+    finally:
+        window.chk_metrics.setChecked(False)
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from PyQt5.QtWidgets import QApplication
 from src.ui.plot_widget import PlotWidget
@@ -28,4 +29,56 @@ def test_reset_plot_clears_data(app):
 
     plot.reset_plot()
     assert len(plot.times) == 0
-    assert len(plot.currents) == 0
\ No newline at end of file
+    assert len(plot.currents) == 0
+
+def test_redraw_blits_inside_limits(app):
+    plot = PlotWidget(max_points=50)
+    plot.update_plot(0, 10)
+    plot.update_plot(100, 20)
+    plot.redraw()                     # primeiro quadro: redesenho completo
+    assert plot.full_redraws == 1
+
+    plot.update_plot(110, 15)         # dentro dos limites: só blit
+    plot.redraw()
+    assert plot.full_redraws == 1
+    assert list(plot.line.get_xdata()) == [0, 100, 110]
+
+    plot.update_plot(10_000, 500)     # fora dos limites: reescala
+    plot.redraw()
+    assert plot.full_redraws == 2
+    assert plot.ax.get_xlim()[1] >= 10_000
+    assert len(plot.frame_times_ms) == 3
+    assert plot.mean_frame_time_ms() > 0
+
+def test_history_view_is_bounded_and_returns_to_live(app):
+    plot = PlotWidget(max_points=50, history_points=500)
+    times = np.arange(20_000) * 16
+    currents = np.zeros(20_000)
+    currents[777] = 900.0
+    plot.append_block(times, currents)
+    assert len(plot.times) == 50
+
+    plot.show_range(times[0], times[-1])
+    assert not plot.live
+    assert len(plot.line.get_xdata()) <= 500
+    assert max(plot.line.get_ydata()) == 900.0   # pico preservado
+
+    plot.ax.set_xlim(0, 1000)                     # pan/zoom externo mantém modo histórico
+    assert not plot.live
+    plot.follow_live()
+    plot.redraw()
+    assert plot.live
+    assert list(plot.line.get_xdata()) == list(plot.times)
+
+def test_load_file_range(app, tmp_path):
+    """Carrega só o intervalo pedido de uma sessão gravada."""
+    from src.core.data_logger import DataLogger
+    logger = DataLogger(output_dir=tmp_path, index_every=50)
+    logger.start(device_name="dev")
+    logger.log_many(np.arange(0, 100_000, 10), np.arange(10_000, dtype=float))
+    logger.stop()
+
+    plot = PlotWidget()
+    assert plot.load_file_range(logger.path, 20_000, 30_000) == 1000
+    assert not plot.live
+    assert plot.ax.get_xlim() == (20_000, 30_000)
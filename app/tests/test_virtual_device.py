@@ -0,0 +1,53 @@
+import csv
+import time
+from src.core.app_controller import AppController
+from src.drivers.virtual_device import VirtualSerialReader, synthetic_samples
+from benchmarks.bench_pipeline import compare, run_pipeline
+
+def wait_until_drained(controller, reader, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if reader.exhausted and controller.metrics()["processed"] >= reader.device.samples_sent:
+            return
+        time.sleep(0.01)
+
+def test_replay_csv_through_controller(tmp_path):
+    log = tmp_path / "session.csv"
+    with open(log, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp_ms", "current_mA"])
+        writer.writerows((t, f"{t / 10:.3f}") for t in range(0, 16_000, 16))
+
+    reader = VirtualSerialReader.replay(log, speed=None, protocol="binary")
+    controller = AppController(reader=reader, output_dir=tmp_path / "out")
+    controller.start()
+    wait_until_drained(controller, reader)
+    controller.stop()
+
+    assert controller.samples.total == 1000
+    assert controller.samples.timestamps()[-1] == 15_984
+    assert controller.metrics()["invalid_lines"] == 0
+
+def test_synthetic_source_is_paced():
+    reader = VirtualSerialReader.synthetic(rate_hz=200, duration_s=0.5, profile="sine", speed=1.0)
+    start = time.monotonic()
+    reader.connect()
+    while not reader.exhausted and time.monotonic() - start < 3:
+        time.sleep(0.01)
+    elapsed = time.monotonic() - start
+    reader.disconnect()
+    assert 0.4 < elapsed < 1.5
+    assert len(reader.read_block()[0]) == 100
+
+def test_synthetic_profiles():
+    blocks = list(synthetic_samples(rate_hz=10, duration_s=4, profile="steps", block_size=7))
+    assert sum(len(ts) for ts, _ in blocks) == 40
+    assert {float(c) for _, cur in blocks for c in cur} == {50.0, 500.0}
+
+def test_benchmark_smoke():
+    result = run_pipeline(samples=2000, rate_hz=1000, speed=None)
+    assert result["samples"] == 2000
+    assert result["pipeline_samples_per_s"] > 0
+    baseline = {"scenarios": {"x": {"pipeline_samples_per_s": 1000.0, "latency_p99_ms": 1.0}}}
+    current = {"scenarios": {"x": {"pipeline_samples_per_s": 500.0, "latency_p99_ms": 1.05}}}
+    assert [r[1] for r in compare(current, baseline)] == ["pipeline_samples_per_s"]
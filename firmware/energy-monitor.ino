@@ -25,6 +25,13 @@
 *    onde S_mV_A = 185 mV/A
 *  - Observação: sem calibração fina; para maior precisão, ajustar ADC_MID conforme medição em 0 A.
 *
+* Formato de saída (OUTPUT_BINARY):
+*  - 0: CSV texto "<timestamp_ms>,<current_mA>\r\n" (padrão).
+*  - 1: frame binário de 9 bytes, little-endian:
+*       [0xA5 0x5A][timestamp_ms u32][current_mA i16][CRC-8]
+*    CRC-8 polinômio 0x07, valor inicial 0, sobre os 6 bytes de dados.
+*    O host (sensor_parser.py) detecta o formato automaticamente.
+*
 * Compilação (PlatformIO):
 *  - F_CPU=16000000UL
 *  - mcu=atmega328p
@@ -54,6 +61,14 @@
 #define ADC_FULL_SCALE          1023L
 #define ADC_MID                 512     /* offset nominal VCC/2 → ajuste conforme necessário */
 
+/* Formato de saída: 0 = CSV texto, 1 = frame binário com CRC-8 */
+#ifndef OUTPUT_BINARY
+#define OUTPUT_BINARY           0
+#endif
+#define FRAME_SYNC0             0xA5
+#define FRAME_SYNC1             0x5A
+#define CRC8_POLY               0x07
+
 /*---------------------- Variáveis globais -----------------------------*/
 /* Contador de milissegundos (incrementado no ISR do Timer0 Compare A) */
 static volatile uint32_t g_millis = 0;
@@ -130,6 +145,42 @@ static void uart_put_u16(uint16_t v)
 	uart_put_u32((uint32_t)v);
 }
 
+/*---------------------- Frame binário --------------------------------*/
+/* Atualiza o CRC-8 (polinômio 0x07, MSB primeiro) com 1 byte */
+static uint8_t crc8_update(uint8_t crc, uint8_t data)
+{
+	crc ^= data;
+	for (uint8_t i = 0; i < 8; i++) {
+		crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ CRC8_POLY) : (uint8_t)(crc << 1);
+	}
+	return crc;
+}
+
+/* Transmite um frame: sync, timestamp (u32 LE), corrente (i16 LE, saturada) e CRC-8 */
+static void uart_put_frame(uint32_t timestamp_ms, int32_t current_mA)
+{
+	if (current_mA > INT16_MAX) current_mA = INT16_MAX;
+	if (current_mA < INT16_MIN) current_mA = INT16_MIN;
+	uint16_t current = (uint16_t)(int16_t)current_mA;
+	uint8_t payload[6] = {
+		(uint8_t)(timestamp_ms),
+		(uint8_t)(timestamp_ms >> 8),
+		(uint8_t)(timestamp_ms >> 16),
+		(uint8_t)(timestamp_ms >> 24),
+		(uint8_t)(current),
+		(uint8_t)(current >> 8),
+	};
+	uint8_t crc = 0;
+
+	uart_putc(FRAME_SYNC0);
+	uart_putc(FRAME_SYNC1);
+	for (uint8_t i = 0; i < sizeof(payload); i++) {
+		uart_putc(payload[i]);
+		crc = crc8_update(crc, payload[i]);
+	}
+	uart_putc(crc);
+}
+
 /*---------------------- Timer0 -> base de tempo (1 ms) ---------------*/
 /*
 * Timer0 em CTC para 1 kHz (1 ms por tick):
@@ -245,12 +296,16 @@ int main(void)
 			uint16_t adc_raw    = adc_read_blocking();
 			int32_t  current_mA = adc_to_current_mA(adc_raw);
 
+#if OUTPUT_BINARY
+			uart_put_frame(now, current_mA);
+#else
 			/* CSV: <timestamp_ms>,<current_mA>\r\n */
 			uart_put_u32(now);
 			uart_putc(',');
 			uart_put_i32(current_mA);
 			uart_putc('\r');
 			uart_putc('\n');
+#endif
 
 			g_next_sample_ms += SAMPLE_PERIOD_MS;
 		}